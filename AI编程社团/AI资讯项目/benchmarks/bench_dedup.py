@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Benchmark: near-duplicate title detection
+Compares MinHash/LSH dedup against the pairwise baseline on synthetic titles
+
+Usage:
+    python benchmarks/bench_dedup.py [--sizes 1000,10000,100000]
+"""
+
+import sys
+import time
+import random
+import argparse
+import logging
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'scripts'))
+
+from process import calculate_title_similarity, deduplicate_by_similarity
+
+VOCAB_SIZE = 20000
+BASELINE_LIMIT = 2000  # Pairwise baseline is quadratic, skip beyond this
+
+
+def make_titles(count, seed=42):
+    """Generate synthetic articles, roughly 20% of them near-duplicates"""
+    rng = random.Random(seed)
+    vocab = [f"w{i}" for i in range(VOCAB_SIZE)]
+    articles = []
+
+    for i in range(count):
+        if articles and rng.random() < 0.2:
+            # Near-duplicate: swap one word of an earlier title
+            words = rng.choice(articles)['title'].split()
+            words[rng.randrange(len(words))] = rng.choice(vocab)
+        else:
+            words = rng.sample(vocab, rng.randint(6, 14))
+
+        articles.append({
+            'id': str(i),
+            'title': ' '.join(words),
+            'authority_score': rng.randint(15, 30),
+        })
+
+    return articles
+
+
+def baseline_dedup(articles, threshold=0.7):
+    """Original pairwise implementation, kept here for comparison"""
+    unique_articles = []
+
+    for article in articles:
+        is_duplicate = False
+        for existing in unique_articles:
+            if calculate_title_similarity(article['title'], existing['title']) >= threshold:
+                is_duplicate = True
+                if article['authority_score'] > existing['authority_score']:
+                    unique_articles.remove(existing)
+                    unique_articles.append(article)
+                break
+        if not is_duplicate:
+            unique_articles.append(article)
+
+    return unique_articles
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark title deduplication')
+    parser.add_argument('--sizes', default='1000,2000,10000,50000,100000',
+                        help='Comma-separated article counts')
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)
+
+    print(f"{'articles':>10} {'lsh (s)':>10} {'kept':>8} {'baseline (s)':>13} {'match':>6}")
+    for size in [int(s) for s in args.sizes.split(',')]:
+        articles = make_titles(size)
+
+        start = time.perf_counter()
+        result = deduplicate_by_similarity(articles)
+        lsh_time = time.perf_counter() - start
+
+        if size <= BASELINE_LIMIT:
+            start = time.perf_counter()
+            expected = baseline_dedup(articles)
+            base_time = f"{time.perf_counter() - start:.3f}"
+            match = 'yes' if [a['id'] for a in result] == [a['id'] for a in expected] else 'NO'
+        else:
+            base_time, match = '-', '-'
+
+        print(f"{size:>10} {lsh_time:>10.3f} {len(result):>8} {base_time:>13} {match:>6}")
+
+
+if __name__ == '__main__':
+    main()
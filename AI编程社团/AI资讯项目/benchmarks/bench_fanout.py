@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""
+Benchmark: push to many subscribers
+Stores synthetic articles and subscribers (random category filters and
+top-N) in a temporary database, then compares per-subscriber queries,
+rendering and sequential delivery against push_to_subscribers, with
+every webhook served by a local stub
+
+Usage:
+    python benchmarks/bench_fanout.py [--subscribers 1000] [--latency 0.02]
+"""
+
+import sys
+import json
+import time
+import random
+import argparse
+import logging
+import tempfile
+import threading
+from pathlib import Path
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'scripts'))
+
+from database import ArticleDatabase
+from digest import Digest
+from push import (FANOUT_WORKERS, PushDispatcher, push_to_subscribers, subscriber_view,
+                  subscription_settings, target_messages)
+
+CATEGORIES = ['产品发布', '研究突破', '行业动态', '技术教程', '开源项目', '融资并购', '政策法规', '观点评论']
+CHANNELS = ['feishu', 'wechat_work', 'dingtalk']
+
+
+def start_server(latency):
+    """One stub for every webhook; answers success in every platform's format"""
+    counter = {'requests': 0}
+    lock = threading.Lock()
+
+    class HookHandler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+        disable_nagle_algorithm = True
+
+        def do_POST(self):
+            self.rfile.read(int(self.headers.get('Content-Length', 0)))
+            time.sleep(latency)
+            with lock:
+                counter['requests'] += 1
+            body = json.dumps({'code': 0, 'errcode': 0, 'ok': True}).encode()
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), HookHandler)
+    server.daemon_threads = True
+    server.request_queue_size = 128
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, counter
+
+
+def populate(db, articles, subscribers, base_url, rng):
+    now = datetime.now()
+    db.save_articles([
+        {
+            'id': f"bench-{i}", 'title': f"Article {i} about models and agents",
+            'link': f"https://example.com/a/{i}",
+            'published': now - timedelta(minutes=rng.uniform(0, 23 * 60)),
+            'summary': 'Lorem ipsum dolor sit amet, consectetur adipiscing elit. ' * 3,
+            'source': f"Source {i % 40}", 'source_category': 'tech_media',
+            'category': rng.choice(CATEGORIES), 'authority_score': 20,
+            'score': rng.uniform(10, 100), 'fetch_time': now,
+        }
+        for i in range(articles)
+    ])
+    for i in range(subscribers):
+        categories = rng.sample(CATEGORIES, rng.choice([0, 0, 1, 2, 3])) or None
+        db.add_subscription(rng.choice(CHANNELS), f"{base_url}/hook/{i}", name=f"Group {i}",
+                            categories=categories, top_n=rng.choice([3, 5, 10]))
+
+
+def per_subscriber_views(db, subscriptions):
+    """The naive way: query and render for each subscriber"""
+    views = []
+    for subscription in subscriptions:
+        if subscription['categories']:
+            articles = [article for category in subscription['categories']
+                        for article in db.get_articles_by_category(category, limit=subscription['top_n'])]
+            articles.sort(key=lambda article: (article['score'], article['published']), reverse=True)
+        else:
+            articles = db.get_today_articles(limit=subscription['top_n'])
+        views.append((subscription, Digest(articles[:subscription['top_n']])))
+    return views
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark subscriber fan-out')
+    parser.add_argument('--subscribers', type=int, default=1000,
+                        help='Number of subscribers (default: 1000)')
+    parser.add_argument('--articles', type=int, default=2000,
+                        help='Articles in the last 24 hours (default: 2000)')
+    parser.add_argument('--latency', type=float, default=0.02,
+                        help='Stub webhook latency in seconds (default: 0.02)')
+    args = parser.parse_args()
+
+    logging.disable(logging.WARNING)
+    rng = random.Random(42)
+
+    server, counter = start_server(args.latency)
+    base_url = f"http://127.0.0.1:{server.server_port}"
+    config = {}
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db = ArticleDatabase(str(Path(tmp) / 'bench.db'))
+        populate(db, args.articles, args.subscribers, base_url, rng)
+        subscriptions = db.get_subscriptions()
+        print(f"{len(subscriptions)} subscribers, {args.articles} articles, "
+              f"stub latency {args.latency * 1000:.0f}ms\n")
+
+        # Views: per-subscriber queries vs one shared candidate query
+        start = time.perf_counter()
+        views = per_subscriber_views(db, subscriptions)
+        for subscription, digest in views:
+            digest.parts('Feishu')
+        print(f"{'per-subscriber query + render':<34} {time.perf_counter() - start:>8.3f}s")
+
+        start = time.perf_counter()
+        per_category = max(subscription['top_n'] for subscription in subscriptions)
+        candidates = db.get_category_leaders(hours=24, per_category=per_category)
+        print(f"{'shared candidate query':<34} {time.perf_counter() - start:>8.3f}s  "
+              f"{len(candidates)} candidates")
+
+        # Delivery: one after another vs bounded fan-out
+        dispatcher = PushDispatcher(max_workers=1)
+        start = time.perf_counter()
+        sequential_ok = 0
+        for subscription, digest in views:
+            messages = target_messages(subscription['channel'],
+                                       subscription_settings(subscription, config), digest)
+            sequential_ok += sum(delivery.ok for delivery in dispatcher.dispatch(messages))
+        print(f"{'sequential delivery':<34} {time.perf_counter() - start:>8.3f}s  "
+              f"{sequential_ok} delivered")
+        dispatcher.close()
+
+        counter['requests'] = 0
+        start = time.perf_counter()
+        results = push_to_subscribers(candidates, subscriptions, config)
+        elapsed = time.perf_counter() - start
+        ok = sum(all(delivery.ok for delivery in deliveries) for _, deliveries in results)
+        print(f"{f'push_to_subscribers ({FANOUT_WORKERS} parallel)':<34} {elapsed:>8.3f}s  "
+              f"{ok}/{len(results)} subscribers, {counter['requests']} requests")
+
+        # Views from the candidate set must match the per-subscriber queries
+        matching = sum(
+            [article['id'] for article in digest.articles] == [
+                article['id'] for article in subscriber_view(
+                    candidates, subscription['categories'], subscription['top_n'])
+            ]
+            for subscription, digest in views
+        )
+        print(f"\nviews matching per-subscriber queries: {matching}/{len(views)}")
+        db.close()
+
+    server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Benchmark: fetch_all_sources
+Serves simulated feeds of mixed latency from local HTTP servers and
+fetches them with the thread pool and the asyncio engine
+
+Usage:
+    python benchmarks/bench_fetch.py [--feeds 200] [--hosts 20]
+"""
+
+import sys
+import time
+import random
+import argparse
+import logging
+import threading
+from pathlib import Path
+from email.utils import formatdate
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'scripts'))
+
+import fetch_rss
+from fetch_rss import fetch_all_sources
+
+ITEMS_PER_FEED = 20
+
+
+def make_feed(feed_id):
+    items = ''.join(
+        f"<item><title>Feed {feed_id} item {i}</title>"
+        f"<link>https://example.com/{feed_id}/{i}</link>"
+        f"<description>{'Lorem ipsum dolor sit amet. ' * 20}</description>"
+        f"<pubDate>{formatdate(1700000000 + feed_id * 1000 + i * 60, usegmt=True)}</pubDate></item>"
+        for i in range(ITEMS_PER_FEED)
+    )
+    return (f'<?xml version="1.0"?><rss version="2.0"><channel>'
+            f'<title>Feed {feed_id}</title>{items}</channel></rss>').encode()
+
+
+def start_servers(hosts, latencies):
+    """One threaded HTTP/1.1 server per simulated host"""
+
+    class FeedHandler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+
+        def do_GET(self):
+            feed_id = int(self.path.rsplit('/', 1)[-1])
+            time.sleep(latencies[feed_id])
+            body = make_feed(feed_id)
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/rss+xml')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    servers = []
+    for _ in range(hosts):
+        server = ThreadingHTTPServer(('127.0.0.1', 0), FeedHandler)
+        server.daemon_threads = True
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        servers.append(server)
+    return servers
+
+
+def timed(label, func, expected):
+    start = time.perf_counter()
+    articles = func()
+    elapsed = time.perf_counter() - start
+    status = 'ok' if len(articles) == expected else f'expected {expected}'
+    print(f"{label:<36} {elapsed:>8.3f}s  {len(articles):>6} articles  {status}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark RSS fetching')
+    parser.add_argument('--feeds', type=int, default=200,
+                        help='Number of simulated feeds (default: 200)')
+    parser.add_argument('--hosts', type=int, default=20,
+                        help='Number of simulated hosts (default: 20)')
+    args = parser.parse_args()
+
+    logging.disable(logging.WARNING)
+
+    # Mostly fast feeds, some slow ones, a few very slow
+    rng = random.Random(42)
+    latencies = [
+        rng.choice([0.05] * 6 + [0.3] * 3 + [1.5])
+        for _ in range(args.feeds)
+    ]
+
+    servers = start_servers(args.hosts, latencies)
+    sources = [
+        {
+            'name': f"Feed {i}",
+            'url': f"http://127.0.0.1:{servers[i % args.hosts].server_port}/feed/{i}",
+            'category': 'tech_media',
+            'authority_score': 20,
+        }
+        for i in range(args.feeds)
+    ]
+    expected = args.feeds * ITEMS_PER_FEED
+
+    print(f"{args.feeds} feeds on {args.hosts} hosts, "
+          f"total simulated latency {sum(latencies):.1f}s")
+
+    timed('thread pool (10 workers)',
+          lambda: fetch_all_sources(sources, use_async=False), expected)
+
+    if fetch_rss.httpx is None:
+        print("httpx not installed, skipping asyncio engine")
+    else:
+        timed(f'asyncio (per-host limit {fetch_rss.PER_HOST_LIMIT})',
+              lambda: fetch_all_sources(sources), expected)
+
+    for server in servers:
+        server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Benchmark: keyword classification and excitement scoring
+Compares the compiled keyword matcher against per-keyword substring scans
+
+Usage:
+    python benchmarks/bench_keywords.py [--articles 50000] [--pure-python]
+"""
+
+import sys
+import time
+import random
+import argparse
+import logging
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'scripts'))
+
+import keyword_matcher
+
+if '--pure-python' in sys.argv:
+    # Must happen before process.py compiles its matcher
+    keyword_matcher.ahocorasick = None
+
+from process import (CATEGORIES, EXCITEMENT_KEYWORDS,
+                     classify_article, match_article_keywords)
+
+FILLER = [
+    'the', 'model', 'today', 'company', 'data', 'system', 'users', 'team',
+    'AI', 'Agent', 'training', 'inference', 'open', 'weights', 'update',
+    '这是', '一个', '大模型', '智能体', '用户', '公司', '今天', '数据', '能力',
+]
+
+
+def make_articles(count, seed=42):
+    """Generate mixed Chinese/English articles with sprinkled keywords"""
+    rng = random.Random(seed)
+    keywords = [kw for config in CATEGORIES.values() for kw in config['keywords']]
+    keywords += EXCITEMENT_KEYWORDS
+    articles = []
+
+    for i in range(count):
+        def words(n):
+            return ' '.join(rng.choice(keywords) if rng.random() < 0.08 else rng.choice(FILLER)
+                            for _ in range(n))
+
+        articles.append({
+            'id': str(i),
+            'title': words(rng.randint(6, 16)).title() if rng.random() < 0.3 else words(rng.randint(6, 16)),
+            'summary': words(rng.randint(20, 120)),
+        })
+
+    return articles
+
+
+def baseline_classify(article):
+    """Original per-keyword implementation of classify_article"""
+    text = article.get('title', '').lower() + ' ' + article.get('summary', '').lower()
+    category_scores = {
+        category: sum(1 for kw in config['keywords'] if kw in text) * config['weight']
+        for category, config in CATEGORIES.items()
+    }
+    best_category = max(category_scores.items(), key=lambda x: x[1])
+    return best_category[0] if best_category[1] > 0 else '其他'
+
+
+def baseline_excitement(article):
+    """Original excitement scan from calculate_article_score"""
+    title = article.get('title', '').lower()
+    return min(sum(4 for kw in EXCITEMENT_KEYWORDS if kw in title), 20)
+
+
+def run(label, articles, classify, excitement):
+    start = time.perf_counter()
+    results = [(classify(a), excitement(a)) for a in articles]
+    elapsed = time.perf_counter() - start
+    print(f"{label:<28} {elapsed:>8.3f}s  {len(articles) / elapsed:>10.0f} articles/s")
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark keyword matching')
+    parser.add_argument('--articles', type=int, default=50000,
+                        help='Number of synthetic articles (default: 50000)')
+    parser.add_argument('--pure-python', action='store_true',
+                        help='Benchmark the fallback automaton without pyahocorasick')
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)
+    articles = make_articles(args.articles)
+
+    def matcher_pass(article):
+        hits = match_article_keywords(article)
+        return classify_article(article, hits), min(4 * hits[1], 20)
+
+    backend = 'pyahocorasick' if keyword_matcher.ahocorasick else 'pure python'
+    expected = run('baseline (kw in text)', articles, baseline_classify, baseline_excitement)
+
+    start = time.perf_counter()
+    actual = [matcher_pass(a) for a in articles]
+    elapsed = time.perf_counter() - start
+    print(f"{'matcher (' + backend + ')':<28} {elapsed:>8.3f}s  {len(articles) / elapsed:>10.0f} articles/s")
+
+    mismatches = sum(1 for e, a in zip(expected, actual) if e != a)
+    print(f"mismatches: {mismatches}")
+
+    return 1 if mismatches else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+"""
+Benchmark: push_to_channels
+Serves stub Feishu / WeChatWork / DingTalk / Telegram endpoints (one slow,
+two failing their first request) and pushes to them with the legacy
+sequential loop and the concurrent dispatcher, then checks the token
+bucket against a burst of messages to one webhook and times rendering a
+digest per target against reusing one rendered digest
+
+Usage:
+    python benchmarks/bench_push.py [--slow 2.0] [--burst 10] [--targets 1000]
+"""
+
+import sys
+import json
+import time
+import argparse
+import logging
+import threading
+from pathlib import Path
+from datetime import datetime, timedelta
+from functools import partial
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'scripts'))
+
+from digest import CHANNEL_FORMATS, Digest
+from push import PushDispatcher, PushMessage, channel_messages, send_to_dingtalk, _succeeded
+
+FAST_LATENCY = 0.1
+ARTICLES = 10
+
+
+def make_articles(count):
+    now = datetime.now()
+    return [
+        {'id': str(i), 'title': f"Model release {i}: new results on reasoning benchmarks",
+         'link': f"https://example.com/news/{i}", 'published': now - timedelta(hours=i),
+         'summary': 'Lorem ipsum dolor sit amet, consectetur adipiscing elit. ' * 4,
+         'source': 'Example Blog', 'category': '产品发布', 'score': 90 - i}
+        for i in range(count)
+    ]
+
+
+def start_server(slow_latency):
+    """Stub webhooks; /dingtalk and Telegram fail the first request of each round"""
+    state = {'requests': {}}
+
+    class WebhookHandler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+
+        def send(self, status, body, content_type='application/json'):
+            body = body.encode()
+            self.send_response(status)
+            self.send_header('Content-Type', content_type)
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_POST(self):
+            self.rfile.read(int(self.headers.get('Content-Length', 0)))
+            path = self.path.split('?')[0]
+            seen = state['requests'].get(path, 0)
+            state['requests'][path] = seen + 1
+
+            if path == '/feishu':
+                time.sleep(FAST_LATENCY)
+                self.send(200, json.dumps({'code': 0, 'msg': 'success'}))
+            elif path == '/wechat':
+                time.sleep(slow_latency)
+                self.send(200, json.dumps({'errcode': 0, 'errmsg': 'ok'}))
+            elif path == '/dingtalk':
+                time.sleep(FAST_LATENCY)
+                errcode = 130101 if seen == 0 else 0
+                self.send(200, json.dumps({'errcode': errcode, 'errmsg': 'send too fast' if errcode else 'ok'}))
+            elif path.endswith('/sendMessage'):
+                time.sleep(FAST_LATENCY)
+                if seen == 0:
+                    self.send(502, '<html>Bad Gateway</html>', 'text/html')
+                else:
+                    self.send(200, json.dumps({'ok': True, 'result': {}}))
+            else:
+                self.send(404, json.dumps({'error': 'not found'}))
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), WebhookHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, state
+
+
+def legacy_push(messages):
+    """The pre-dispatcher loop: one channel after another, single attempt"""
+    results = []
+    for message in messages:
+        start = time.perf_counter()
+        result = message.send()
+        results.append((message.channel, time.perf_counter() - start, result))
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark push dispatching')
+    parser.add_argument('--slow', type=float, default=2.0,
+                        help='Latency of the slow webhook in seconds (default: 2.0)')
+    parser.add_argument('--burst', type=int, default=10,
+                        help='Messages for the rate-limit check (default: 10)')
+    parser.add_argument('--targets', type=int, default=1000,
+                        help='Targets for the render check (default: 1000)')
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+
+    server, state = start_server(args.slow)
+    base_url = f"http://127.0.0.1:{server.server_port}"
+    config = {
+        'feishu': {'enabled': True, 'webhook': f"{base_url}/feishu"},
+        'wechat_work': {'enabled': True, 'webhook': f"{base_url}/wechat"},
+        'dingtalk': {'enabled': True, 'webhook': f"{base_url}/dingtalk?access_token=x"},
+        'telegram': {'enabled': True, 'bot_token': 'TOKEN', 'chat_id': '1', 'api_base': base_url},
+    }
+    articles = make_articles(ARTICLES)
+    messages = channel_messages(config, Digest(articles))
+
+    print(f"{len(messages)} channels, slow webhook {args.slow:.1f}s, "
+          f"DingTalk and Telegram fail their first request\n")
+
+    start = time.perf_counter()
+    legacy = legacy_push(messages)
+    print(f"legacy sequential   total {time.perf_counter() - start:>6.2f}s")
+    for channel, latency, result in legacy:
+        print(f"  {channel:<11} {latency:>6.2f}s  {_succeeded(channel, result)}")
+
+    state['requests'].clear()
+    dispatcher = PushDispatcher()
+    start = time.perf_counter()
+    deliveries = dispatcher.dispatch(messages)
+    print(f"\ndispatcher          total {time.perf_counter() - start:>6.2f}s")
+    for delivery in deliveries:
+        print(f"  {delivery.channel:<11} {delivery.elapsed:>6.2f}s  {delivery.ok}  "
+              f"latency {delivery.latency:.2f}s  attempts {delivery.attempts}")
+
+    # Token bucket: a burst of messages to one webhook at 5/s with burst 2
+    state['requests'].clear()
+    state['requests']['/dingtalk'] = 1  # no injected failure
+    limited = PushDispatcher(limits={'DingTalk': {'rate': 5, 'burst': 2}}, session=dispatcher.session)
+    webhook = config['dingtalk']['webhook']
+    burst = [
+        PushMessage('DingTalk', webhook, partial(send_to_dingtalk, webhook, f"msg {i}"))
+        for i in range(args.burst)
+    ]
+    start = time.perf_counter()
+    ok = sum(delivery.ok for delivery in limited.dispatch(burst))
+    expected = (args.burst - 2) / 5
+    print(f"\nrate limit: {args.burst} messages at 5/s (burst 2) took "
+          f"{time.perf_counter() - start:.2f}s (expected >= {expected:.2f}s), {ok} delivered")
+
+    # Rendering: per target vs one digest shared by all targets
+    channels = list(CHANNEL_FORMATS)
+    start = time.perf_counter()
+    for i in range(args.targets):
+        Digest(articles).parts(channels[i % len(channels)])
+    per_target = time.perf_counter() - start
+
+    start = time.perf_counter()
+    digest = Digest(articles)
+    for i in range(args.targets):
+        digest.parts(channels[i % len(channels)])
+    shared = time.perf_counter() - start
+    print(f"\nrender for {args.targets} targets: per target {per_target * 1000:.1f}ms, "
+          f"shared digest {shared * 1000:.1f}ms")
+
+    dispatcher.close()
+    server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Benchmark: ArticleDatabase.save_articles
+Writes synthetic articles with the bulk upsert path and the legacy
+per-row INSERT OR REPLACE loop
+
+Usage:
+    python benchmarks/bench_save.py [--articles 100000]
+"""
+
+import sys
+import time
+import random
+import argparse
+import logging
+import tempfile
+from pathlib import Path
+from datetime import datetime, timedelta
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'scripts'))
+
+from database import ArticleDatabase
+
+
+def make_articles(count, seed=42):
+    rng = random.Random(seed)
+    now = datetime.now()
+    return [
+        {
+            'id': f"id{i}",
+            'title': f"Synthetic article {i}",
+            'link': f"https://example.com/{i}",
+            'published': now - timedelta(minutes=rng.randint(0, 60 * 24 * 30)),
+            'summary': 'x' * rng.randint(50, 500),
+            'source': f"Source {i % 40}",
+            'source_category': 'tech_media',
+            'category': rng.choice(['技术突破', '产品发布', '研究论文', '其他']),
+            'authority_score': rng.randint(15, 30),
+            'score': round(rng.uniform(20, 100), 2),
+            'fetch_time': now,
+        }
+        for i in range(count)
+    ]
+
+
+def legacy_save(db, articles):
+    """Original per-row implementation"""
+    cursor = db.conn.cursor()
+    for article in articles:
+        cursor.execute('''
+            INSERT OR REPLACE INTO articles
+            (id, title, link, published, summary, source, source_category,
+             category, authority_score, score, fetch_time)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        ''', db._article_row(article))
+    db.conn.commit()
+
+
+def timed(label, func):
+    start = time.perf_counter()
+    result = func()
+    print(f"{label:<36} {time.perf_counter() - start:>8.3f}s  {result if result else ''}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark article saving')
+    parser.add_argument('--articles', type=int, default=100000,
+                        help='Number of synthetic articles (default: 100000)')
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)
+    articles = make_articles(args.articles)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db = ArticleDatabase(str(Path(tmp) / 'bulk.db'))
+        timed('bulk: insert all', lambda: db.save_articles(articles))
+        timed('bulk: re-save unchanged', lambda: db.save_articles(articles))
+        for article in articles[::10]:
+            article['score'] += 1
+        timed('bulk: re-save with 10% changed', lambda: db.save_articles(articles))
+        db.close()
+
+        db = ArticleDatabase(str(Path(tmp) / 'legacy.db'))
+        timed('legacy: insert all', lambda: legacy_save(db, articles))
+        timed('legacy: re-save all', lambda: legacy_save(db, articles))
+        db.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+"""
+Benchmark: Twitter scraping
+Serves simulated timelines (lazy-loaded on scroll, with slow images and
+fonts) from a local HTTP server and scrapes them with the legacy
+sequential scraper, the pooled scraper and an incremental rerun of the
+pooled scraper
+
+Requires playwright with Chromium installed.
+
+Usage:
+    python benchmarks/bench_twitter.py [--accounts 10] [--concurrency 4]
+"""
+
+import sys
+import json
+import time
+import tempfile
+import argparse
+import logging
+import threading
+from datetime import datetime, timezone
+from pathlib import Path
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'scripts'))
+
+import fetch_twitter
+from fetch_twitter import TimelineState, scrape_twitter_accounts, _tweet_article
+
+TWEETS_PER_PAGE = 5
+PAGES = 3
+ASSET_LATENCY = 0.3      # images and fonts
+TIMELINE_LATENCY = 0.15  # first page and each scroll request
+MAX_TWEETS = 10
+NEWEST_STATUS_ID = 1000
+
+
+def make_tweets(username, page):
+    """One timeline page, newest first (status IDs count down)"""
+    now = datetime.now(timezone.utc).isoformat()
+    return [
+        {'id': NEWEST_STATUS_ID - page * TWEETS_PER_PAGE - i,
+         'text': f"{username} tweet {page}-{i} " + 'lorem ipsum ' * 10,
+         'time': now}
+        for i in range(TWEETS_PER_PAGE)
+    ]
+
+
+PAGE_TEMPLATE = '''<!doctype html><html><head>
+<style>@font-face {{ font-family: Chirp; src: url(/font/chirp.woff2); }} body {{ font-family: Chirp; }}
+article {{ height: 400px; }}</style></head><body><main id="timeline"></main>
+<script>
+const user = {user};
+let page = 0, loading = false;
+function render(tweets) {{
+  const timeline = document.getElementById('timeline');
+  for (const t of tweets) {{
+    const el = document.createElement('article');
+    el.innerHTML = `<img src="/img/${{user}}/${{t.id}}.png" width="48" height="48">
+      <div data-testid="tweetText">${{t.text}}</div>
+      <a href="/${{user}}/status/${{t.id}}"><time datetime="${{t.time}}">now</time></a>`;
+    timeline.appendChild(el);
+  }}
+}}
+async function more() {{
+  if (loading || page >= {pages}) return;
+  loading = true;
+  const response = await fetch(`/api/${{user}}?page=${{page}}`);
+  render(await response.json());
+  page += 1;
+  loading = false;
+}}
+window.addEventListener('wheel', more);
+more();
+</script></body></html>'''
+
+
+def start_server():
+    class TimelineHandler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+
+        def send(self, body, content_type):
+            self.send_response(200)
+            self.send_header('Content-Type', content_type)
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self):
+            url = urlparse(self.path)
+            parts = url.path.strip('/').split('/')
+
+            if parts[0] in ('img', 'font'):
+                time.sleep(ASSET_LATENCY)
+                self.send(b'\0' * 2048, 'application/octet-stream')
+            elif parts[0] == 'api':
+                time.sleep(TIMELINE_LATENCY)
+                page = int(parse_qs(url.query).get('page', ['0'])[0])
+                self.send(json.dumps(make_tweets(parts[1], page)).encode(), 'application/json')
+            else:
+                body = PAGE_TEMPLATE.format(user=json.dumps(parts[0]), pages=PAGES)
+                self.send(body.encode(), 'text/html; charset=utf-8')
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), TimelineHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def legacy_scrape(accounts, base_url):
+    """The pre-pool scraper: a browser per account, fixed sleeps, all resources loaded"""
+    from playwright.sync_api import sync_playwright
+
+    articles = []
+    for account in accounts:
+        with sync_playwright() as p:
+            browser = p.chromium.launch(headless=True)
+            page = browser.new_page()
+            page.goto(f"{base_url}/{account['username']}", wait_until='domcontentloaded')
+            page.wait_for_selector('article', timeout=10000)
+            for _ in range(2):
+                page.mouse.wheel(0, 300)
+                page.wait_for_timeout(800)
+
+            for tweet in page.query_selector_all('article')[:MAX_TWEETS]:
+                text_elem = tweet.query_selector('div[data-testid="tweetText"]')
+                link_elem = tweet.query_selector('a[href*="/status/"]')
+                time_elem = tweet.query_selector('time')
+                article = _tweet_article(
+                    account['username'], account['authority_score'],
+                    text_elem.inner_text() if text_elem else None,
+                    link_elem.get_attribute('href') if link_elem else None,
+                    time_elem.get_attribute('datetime') if time_elem else None,
+                    48, base_url
+                )
+                if article:
+                    articles.append(article)
+            browser.close()
+    return articles
+
+
+def timed(label, func, expected):
+    start = time.perf_counter()
+    articles = func()
+    elapsed = time.perf_counter() - start
+    status = 'ok' if len(articles) == expected else f'expected {expected}'
+    print(f"{label:<36} {elapsed:>8.3f}s  {len(articles):>6} tweets  {status}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark Twitter scraping')
+    parser.add_argument('--accounts', type=int, default=10,
+                        help='Number of simulated accounts (default: 10)')
+    parser.add_argument('--concurrency', type=int, default=fetch_twitter.DEFAULT_CONCURRENCY,
+                        help=f'Pool contexts (default: {fetch_twitter.DEFAULT_CONCURRENCY})')
+    args = parser.parse_args()
+
+    if fetch_twitter.async_playwright is None:
+        print("playwright not installed, nothing to benchmark")
+        return
+
+    logging.disable(logging.WARNING)
+
+    server = start_server()
+    base_url = f"http://127.0.0.1:{server.server_port}"
+    accounts = [
+        {'username': f"user{i}", 'authority_score': 20}
+        for i in range(args.accounts)
+    ]
+    expected = args.accounts * MAX_TWEETS
+
+    print(f"{args.accounts} accounts, {TWEETS_PER_PAGE} tweets per timeline page")
+
+    try:
+        timed('legacy (browser per account)', lambda: legacy_scrape(accounts, base_url), expected)
+    except Exception as e:
+        print(f"Cannot launch Chromium ({e.__class__.__name__}); run: playwright install chromium")
+        server.shutdown()
+        return
+
+    def pooled(state=None):
+        return scrape_twitter_accounts(accounts, max_tweets=MAX_TWEETS,
+                                       concurrency=args.concurrency,
+                                       base_url=base_url, stagger=0, state=state)
+
+    timed(f'pool ({args.concurrency} contexts)', pooled, expected)
+
+    # Second scrape of unchanged timelines stops at the high-water marks
+    with tempfile.TemporaryDirectory() as tmp:
+        state = TimelineState(str(Path(tmp) / 'twitter_state.json'))
+        pooled(state)
+        timed('pool, incremental rerun', lambda: pooled(state), 0)
+
+    server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
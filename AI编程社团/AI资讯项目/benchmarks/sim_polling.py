@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+Simulation: fixed hourly refresh vs adaptive per-source polling
+Replays stored publish times (or a synthetic history) and reports total
+requests and freshness lag (time from publish to first fetch)
+
+Usage:
+    python benchmarks/sim_polling.py [--db data/ai_news.db] [--days 14]
+    python benchmarks/sim_polling.py --synthetic 40 [--days 14]
+"""
+
+import sys
+import random
+import sqlite3
+import argparse
+from bisect import bisect_left, bisect_right
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'scripts'))
+
+from database import to_epoch
+from poll_planner import PollPlanner, DAY_SECONDS
+
+TICK_SECONDS = 900
+RATE_WINDOW_DAYS = 14
+
+
+def load_history(db_path, days):
+    """Publish times per source over the last `days` of stored history"""
+    conn = sqlite3.connect(f'file:{db_path}?mode=ro', uri=True)
+    rows = conn.execute('SELECT source, published FROM articles WHERE published IS NOT NULL')
+
+    history = {}
+    for source, published in rows:
+        history.setdefault(source, []).append(to_epoch(published))
+    conn.close()
+
+    end = max(max(times) for times in history.values())
+    start = end - (days + RATE_WINDOW_DAYS) * DAY_SECONDS
+    return {
+        source: sorted(t for t in times if start <= t <= end)
+        for source, times in history.items()
+    }, end
+
+
+def synthetic_history(sources, days, seed=42):
+    """Poisson publish times with rates from one post a week to 30 a day"""
+    rng = random.Random(seed)
+    end = 1_700_000_000
+    start = end - (days + RATE_WINDOW_DAYS) * DAY_SECONDS
+    history = {}
+
+    for i in range(sources):
+        rate = 10 ** rng.uniform(-0.85, 1.5) / DAY_SECONDS  # posts per second
+        t, times = start, []
+        while True:
+            t += rng.expovariate(rate)
+            if t > end:
+                break
+            times.append(int(t))
+        history[f"Source {i}"] = times
+
+    return history, end
+
+
+def simulate(history, start, end, next_poll, seed=7):
+    """
+    Poll sources between start and end
+
+    Each source starts at a random phase within the first hour (the same
+    for every policy), so on-the-hour posts don't favour one policy.
+
+    Args:
+        history (dict): Source -> sorted publish times
+        next_poll (callable): (source, now, last_poll, new_posts) -> next poll time
+
+    Returns:
+        tuple: (requests, list of lags in seconds)
+    """
+    rng = random.Random(seed)
+    requests = 0
+    lags = []
+
+    for source, times in history.items():
+        first = start + rng.uniform(0, 3600)
+        last_poll = start
+        t = next_poll(source, first, None, 0)
+        while t <= end:
+            lo = bisect_right(times, last_poll)
+            hi = bisect_right(times, t)
+            lags.extend(t - published for published in times[lo:hi])
+            requests += 1
+            last_poll, t = t, next_poll(source, t, last_poll, hi - lo)
+
+    return requests, lags
+
+
+def adaptive_policy(history):
+    planner = PollPlanner()
+    window = RATE_WINDOW_DAYS * DAY_SECONDS
+
+    def next_poll(source, now, last_poll, new_posts):
+        times = history[source]
+        lo = bisect_left(times, now - window)
+        hi = bisect_right(times, now)
+        planner.learn_rates({source: (hi - lo, times[lo])} if hi > lo else {}, now)
+
+        if last_poll is None:
+            return now
+        due = planner.record_poll(source, new_posts, now=now)
+        # The scheduler only checks for due sources once per tick
+        return now + -(-(due - now) // TICK_SECONDS) * TICK_SECONDS
+
+    return next_poll
+
+
+def hourly_policy(source, now, last_poll, new_posts):
+    return now if last_poll is None else now + 3600
+
+
+def report(label, requests, lags):
+    lags = sorted(lags)
+    mean = sum(lags) / len(lags) / 60 if lags else 0
+    p90 = lags[int(len(lags) * 0.9)] / 60 if lags else 0
+    print(f"{label:<18} {requests:>8} requests  mean lag {mean:>6.1f} min  p90 lag {p90:>6.1f} min")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Simulate polling policies')
+    parser.add_argument('--db', default=str(Path(__file__).parent.parent / 'data' / 'ai_news.db'),
+                        help='Database to replay (opened read-only)')
+    parser.add_argument('--synthetic', type=int, metavar='SOURCES',
+                        help='Replay a synthetic history with this many sources instead')
+    parser.add_argument('--days', type=int, default=14,
+                        help='Simulated days (default: 14)')
+    args = parser.parse_args()
+
+    if args.synthetic:
+        history, end = synthetic_history(args.synthetic, args.days)
+    else:
+        history, end = load_history(args.db, args.days)
+
+    start = end - args.days * DAY_SECONDS
+    posts = sum(1 for times in history.values() for t in times if t > start)
+    print(f"{len(history)} sources, {posts} posts over {args.days} days")
+
+    report('hourly refresh', *simulate(history, start, end, hourly_policy))
+    report('adaptive', *simulate(history, start, end, adaptive_policy(history)))
+
+
+if __name__ == '__main__':
+    main()
@@ -7,10 +7,13 @@ Aggregates and delivers top AI news daily
 import sys
 import os
 import argparse
+import time
+import threading
 import yaml
 import logging
 from pathlib import Path
-from datetime import datetime
+from datetime import datetime, timedelta
+from collections import Counter
 
 # Fix Windows console encoding
 if sys.platform == 'win32':
@@ -21,11 +24,16 @@ if sys.platform == 'win32':
 # Add scripts directory to path
 sys.path.insert(0, str(Path(__file__).parent))
 
-from fetch_rss import fetch_all_sources, fetch_arxiv_papers
-from fetch_twitter import scrape_twitter_with_context
+from fetch_rss import FeedCache, AsyncFetcher, fetch_all_sources, fetch_arxiv_papers
+import fetch_rss
+from fetch_twitter import TWITTER_ACCOUNTS, TimelineState, scrape_twitter_with_context
 from process import process_articles
-from push import push_to_channels, format_for_markdown
+from push import FANOUT_WORKERS, CHANNEL_NAMES, push_to_channels, push_to_subscribers, format_for_markdown
 from database import ArticleDatabase
+from fingerprint_index import FingerprintIndex
+from poll_planner import PollPlanner
+from checkpoint import Checkpoint
+import instrument
 
 # Configure logging
 logging.basicConfig(
@@ -40,9 +48,13 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
+DATA_DIR = Path(__file__).parent.parent / 'data'
+CONFIG_DIR = Path(__file__).parent.parent / 'config'
+
+
 def load_config(config_name):
     """Load configuration from YAML file"""
-    config_path = Path(__file__).parent.parent / 'config' / f'{config_name}.yaml'
+    config_path = CONFIG_DIR / f'{config_name}.yaml'
 
     if not config_path.exists():
         logger.warning(f"Config file not found: {config_path}")
@@ -52,22 +64,131 @@ def load_config(config_name):
         return yaml.safe_load(f)
 
 
-def fetch_articles():
-    """Fetch articles from all sources"""
+class JobCancelled(Exception):
+    """Raised inside a pipeline run when its AppContext is cancelled"""
+
+
+class AppContext:
+    """
+    Resources shared by pipeline runs
+
+    The CLI creates one per command. The scheduler daemon keeps one open,
+    so the database and fingerprint connections, parsed configs and the
+    HTTP connection pool stay warm between jobs. SQLite connections are
+    bound to the creating thread: create, use and close the context on
+    the same thread.
+    """
+
+    def __init__(self, data_dir=DATA_DIR, persistent_http=False):
+        """
+        Open databases
+
+        Args:
+            data_dir (Path): Directory holding databases and state files
+            persistent_http (bool): Keep an AsyncFetcher (event loop and
+                pooled client) open across fetches
+        """
+        self.data_dir = Path(data_dir)
+        self.cancel_event = threading.Event()
+        self._configs = {}  # name -> (mtime, config)
+
+        self.db = ArticleDatabase(str(self.data_dir / 'ai_news.db'))
+
+        # Fingerprints of stored articles, seeded from the database on first use
+        self.index = FingerprintIndex(str(self.data_dir / 'fingerprints.db'))
+        if len(self.index) == 0:
+            self.index.add_articles(self.db.get_stored_titles())
+
+        self.fetcher = AsyncFetcher() if persistent_http and fetch_rss.httpx is not None else None
+
+    def config(self, name):
+        """Load a YAML config, re-reading it only when the file changed"""
+        config_path = CONFIG_DIR / f'{name}.yaml'
+        mtime = config_path.stat().st_mtime if config_path.exists() else None
+
+        cached = self._configs.get(name)
+        if cached is None or cached[0] != mtime:
+            cached = (mtime, load_config(name) or {})
+            self._configs[name] = cached
+
+        return cached[1]
+
+    def check_cancelled(self):
+        """Raise JobCancelled if cancellation was requested"""
+        if self.cancel_event.is_set():
+            raise JobCancelled()
+
+    def close(self):
+        """Close connections"""
+        if self.fetcher:
+            self.fetcher.close()
+        self.index.close()
+        self.db.close()
+
+
+def pollable_sources(sources_config):
+    """
+    Sources the adaptive poller schedules individually
+
+    Returns:
+        dict: Source name (as stored in articles) -> feed URL (None for
+            arXiv categories and Twitter accounts)
+    """
+    sources = {
+        feed['name']: feed['url']
+        for feed in sources_config.get('rss_feeds', [])
+        if feed.get('enabled', True)
+    }
+
+    arxiv_config = sources_config.get('api_sources', {}).get('arxiv', {})
+    if arxiv_config.get('enabled'):
+        for category in arxiv_config.get('categories', ['cs.AI']):
+            sources[f'arXiv {category}'] = None
+
+    # Each account is polled on its own schedule; due ones share one browser
+    twitter_config = sources_config.get('api_sources', {}).get('twitter', {})
+    if twitter_config.get('enabled', False):
+        for account in TWITTER_ACCOUNTS:
+            sources[f"Twitter @{account['username']}"] = None
+
+    return sources
+
+
+def fetch_articles(feed_cache=None, only=None, context=None, on_batch=None,
+                   timeline_state=None):
+    """
+    Fetch articles from all sources
+
+    Args:
+        feed_cache (FeedCache): Optional HTTP validator cache for RSS feeds
+        only (set): Fetch only these source names (as in pollable_sources);
+            None fetches everything
+        context (AppContext): Shared configs and HTTP fetcher (optional)
+        on_batch (callable): Called with each source's articles as soon as
+            they arrive (streaming update)
+        timeline_state (TimelineState): Optional per-account Twitter
+            high-water marks (only newer tweets are scraped)
+    """
     logger.info("Starting article fetch...")
 
     # Load sources config
-    sources_config = load_config('sources')
+    sources_config = context.config('sources') if context else load_config('sources')
 
     all_articles = []
 
     # Fetch from RSS feeds
     rss_feeds = sources_config.get('rss_feeds', [])
     enabled_feeds = [feed for feed in rss_feeds if feed.get('enabled', True)]
+    if only is not None:
+        enabled_feeds = [feed for feed in enabled_feeds if feed['name'] in only]
 
     if enabled_feeds:
         logger.info(f"Fetching from {len(enabled_feeds)} RSS sources...")
-        rss_articles = fetch_all_sources(enabled_feeds)
+        with instrument.stage('fetch.rss', sources=len(enabled_feeds)) as counts:
+            rss_articles = fetch_all_sources(enabled_feeds, cache=feed_cache,
+                                             fetcher=context.fetcher if context else None,
+                                             on_batch=on_batch)
+            counts['items'] = len(rss_articles)
         all_articles.extend(rss_articles)
 
     # Fetch from arXiv if enabled
@@ -77,55 +198,288 @@ def fetch_articles():
     if arxiv_config.get('enabled'):
         logger.info("Fetching from arXiv...")
         for category in arxiv_config.get('categories', ['cs.AI']):
+            if only is not None and f'arXiv {category}' not in only:
+                continue
             max_results = arxiv_config.get('max_results', 20)
-            arxiv_articles = fetch_arxiv_papers(category, max_results)
+            start = time.perf_counter()
+            with instrument.stage('fetch.arxiv', sources=1) as counts:
+                arxiv_articles = fetch_arxiv_papers(category, max_results)
+                counts['items'] = len(arxiv_articles)
+            # feedparser downloads and parses in one call
+            instrument.record('sources', f'arXiv {category}', fetch=time.perf_counter() - start,
+                              items=len(arxiv_articles))
             all_articles.extend(arxiv_articles)
+            if on_batch and arxiv_articles:
+                on_batch(arxiv_articles)
 
     # Fetch from Twitter if enabled (in api_sources.twitter)
     twitter_config = api_sources.get('twitter', {})
-    if twitter_config.get('enabled', False):
-        logger.info("Fetching from Twitter...")
+    accounts = TWITTER_ACCOUNTS if twitter_config.get('enabled', False) else []
+    if only is not None:
+        accounts = [account for account in accounts
+                    if f"Twitter @{account['username']}" in only]
+
+    if accounts:
+        logger.info(f"Fetching from {len(accounts)} Twitter accounts...")
         max_tweets = twitter_config.get('max_tweets_per_account', 10)
-        twitter_articles = scrape_twitter_with_context()
+        with instrument.stage('fetch.twitter', sources=len(accounts)) as counts:
+            twitter_articles = scrape_twitter_with_context(
+                max_tweets, twitter_config.get('concurrency', 4), timeline_state, accounts
+            )
+            counts['items'] = len(twitter_articles)
         all_articles.extend(twitter_articles)
+        if on_batch and twitter_articles:
+            on_batch(twitter_articles)
 
     logger.info(f"Total raw articles fetched: {len(all_articles)}")
     return all_articles
 
 
-def update_database():
-    """Fetch new articles and update database"""
-    logger.info("=== Starting Update ===")
+def record_polls(planner, sources, polled, new_articles, feed_cache):
+    """
+    Feed per-source fetch outcomes back into the poll planner
 
-    # Initialize database
-    db_path = Path(__file__).parent.parent / 'data' / 'ai_news.db'
-    db = ArticleDatabase(str(db_path))
+    Args:
+        planner (PollPlanner): Adaptive poll planner
+        sources (dict): Source name -> feed URL (from pollable_sources)
+        polled (iterable): Source names fetched in this run
+        new_articles (list): Articles not stored by previous runs
+        feed_cache (FeedCache): Cache holding per-feed fetch errors
+    """
+    new_counts = Counter(article['source'] for article in new_articles)
 
-    # Fetch articles
-    articles = fetch_articles()
+    for name in polled:
+        url = sources.get(name)
+        error = bool(url and feed_cache.get(url).get('last_error'))
+        planner.record_poll(name, new_counts.get(name, 0), error=error)
 
-    if not articles:
-        logger.warning("No articles fetched")
-        return
+    planner.save()
 
-    # Process articles
-    processed = process_articles(articles)
 
-    # Save to database
-    inserted, updated = db.save_articles(processed)
+def save_processed(context, processed):
+    """
+    Store processed articles and index their fingerprints
 
-    logger.info(f"Database updated: {inserted} new, {updated} updated")
+    Returns:
+        tuple: (inserted, updated, unchanged) counts
+    """
+    with instrument.stage('db.save', items=len(processed)) as stage_counts:
+        counts = context.db.save_articles(processed)
+        stage_counts.update(zip(('inserted', 'updated', 'unchanged'), counts))
+    with instrument.stage('index.add', items=len(processed)):
+        context.index.add_articles(processed)
+    return counts
 
-    # Cleanup old articles
-    settings = load_config('sources').get('settings', {})
+
+def cleanup_and_report(context, settings):
+    """Final update stage: retention cleanup and statistics"""
     retention_days = settings.get('retention_days', 30)
-    deleted = db.cleanup_old_articles(retention_days)
+    archive_dir = context.data_dir / 'archive' if settings.get('archive_expired', False) else None
+    with instrument.stage('db.cleanup') as counts:
+        counts['deleted'] = context.db.cleanup_old_articles(
+            retention_days,
+            chunk_size=settings.get('retention_chunk_size', 500),
+            max_chunks=settings.get('retention_max_chunks', 20),
+            vacuum_pages=settings.get('vacuum_pages', 1000),
+            archive_dir=archive_dir
+        )
+        context.index.cleanup_old_fingerprints(retention_days)
 
     # Show stats
-    stats = db.get_stats()
+    with instrument.stage('db.stats'):
+        stats = context.db.get_stats()
     logger.info(f"Database stats: {stats}")
 
-    db.close()
+
+def stream_update(context, settings, feed_cache, only, timeline_state=None):
+    """
+    Fetch with each source's articles deduplicated, classified, scored and
+    saved as soon as that source finishes
+
+    Duplicates across sources are caught by the fingerprint index, which
+    is updated after every batch; the first copy to arrive is kept. A
+    batch that fails to process or save does not stop the other sources;
+    its sources are returned so their fetch state can be discarded.
+
+    Returns:
+        tuple: (all newly stored articles, set of source names whose
+            batch was not stored)
+    """
+    stored = []
+    failed = set()
+
+    def on_batch(articles):
+        try:
+            with instrument.stage('process', items=len(articles)) as counts:
+                processed = process_articles(articles, fingerprint_index=context.index,
+                                             batch_scoring=settings.get('batch_scoring', False))
+                counts['kept'] = len(processed)
+            if processed:
+                inserted, updated, unchanged = save_processed(context, processed)
+                logger.info(f"Stored batch from {articles[0]['source']}: {inserted} new, "
+                            f"{updated} updated, {unchanged} unchanged")
+                stored.extend(processed)
+        except Exception as e:
+            sources = {article['source'] for article in articles}
+            logger.error(f"Error storing batch from {', '.join(sorted(sources))}: {e}", exc_info=True)
+            failed.update(sources)
+
+    fetch_articles(feed_cache, only, context, on_batch=on_batch, timeline_state=timeline_state)
+    return stored, failed
+
+
+def discard_fetch_state(failed, sources, feed_cache, timeline_state):
+    """
+    Roll back fetch state of sources whose articles were not stored
+
+    Their feed validators and high-water marks (or Twitter timeline marks)
+    are dropped, so the next run fetches their entries again instead of
+    getting a 304 or skipping them.
+
+    Args:
+        failed (set): Source names whose batch was not stored
+        sources (dict): Source name -> feed URL (from pollable_sources)
+        feed_cache (FeedCache): HTTP validator cache
+        timeline_state (TimelineState): Twitter high-water marks
+    """
+    for name in failed:
+        if sources.get(name):
+            feed_cache.discard(sources[name], 'articles not stored')
+        elif name.startswith('Twitter @'):
+            timeline_state.discard(name[len('Twitter @'):])
+
+
+@instrument.reported('update')
+def update_database(due_only=False, context=None, streaming=None):
+    """
+    Fetch new articles and update database
+
+    Runs in stages (fetch, process, save, cleanup). After each stage its
+    output is checkpointed under data/checkpoint, and a run that crashed
+    or was cancelled resumes from the last completed stage. In streaming
+    mode articles are stored source by source instead. Stage and per-source
+    timings are written to a run report under logs/runs.
+
+    Args:
+        due_only (bool): Fetch only the sources the adaptive poll planner
+            reports as due, instead of every source
+        context (AppContext): Shared resources; a temporary one is opened
+            and closed when omitted
+        streaming (bool): Store each source's articles as they arrive
+            (default: settings.streaming_update)
+    """
+    if context is None:
+        context = AppContext()
+        try:
+            return update_database(due_only, context, streaming)
+        finally:
+            context.close()
+
+    logger.info("=== Starting Update ===")
+
+    data_dir = context.data_dir
+    feed_cache_path = data_dir / 'feed_cache.json'
+    timeline_state_path = data_dir / 'twitter_state.json'
+    sources_config = context.config('sources')
+    settings = sources_config.get('settings', {})
+    if streaming is None:
+        streaming = settings.get('streaming_update', False)
+
+    # Per-source poll intervals learned from recent publish rates
+    planner = PollPlanner(
+        str(data_dir / 'poll_state.json'),
+        min_interval=settings.get('min_poll_minutes', 15) * 60,
+        max_interval=settings.get('max_poll_hours', 24) * 3600
+    )
+    planner.learn_rates(context.db.get_source_activity(settings.get('rate_window_days', 14)))
+    sources = pollable_sources(sources_config)
+
+    checkpoint = Checkpoint(data_dir / 'checkpoint',
+                            max_age_hours=settings.get('checkpoint_max_age_hours', 6))
+    state = checkpoint.load()
+    articles = None
+
+    if state:
+        logger.info(f"Resuming interrupted update from stage '{state['stage']}' "
+                    f"(started {state['started']})")
+        feed_cache = FeedCache(str(checkpoint.feed_cache_path))
+        timeline_state = TimelineState(str(checkpoint.timeline_state_path))
+        polled = state['polled']
+    else:
+        only = None
+        if due_only:
+            only = set(planner.due(list(sources)))
+            if not only:
+                logger.info("No sources due for polling")
+                return
+            logger.info(f"{len(only)}/{len(sources)} sources due: {', '.join(sorted(only))}")
+        polled = sorted(only) if only is not None else list(sources)
+
+        # Conditional-GET validators and Twitter high-water marks; written
+        # only once the articles are stored, so a failed run refetches
+        # instead of losing entries
+        feed_cache = FeedCache(str(feed_cache_path))
+        timeline_state = TimelineState(str(timeline_state_path))
+
+        if streaming:
+            stored, failed = stream_update(context, settings, feed_cache, only, timeline_state)
+            discard_fetch_state(failed, sources, feed_cache, timeline_state)
+            feed_cache.save()
+            timeline_state.save()
+            record_polls(planner, sources, [name for name in polled if name not in failed],
+                         stored, feed_cache)
+            logger.info(f"Streaming update stored {len(stored)} new articles")
+            if failed:
+                logger.warning(f"Articles from {len(failed)} sources not stored, "
+                               f"they will be refetched: {', '.join(sorted(failed))}")
+            context.check_cancelled()
+            cleanup_and_report(context, settings)
+            logger.info("=== Update Complete ===")
+            return
+
+        articles = fetch_articles(feed_cache, only, context, timeline_state=timeline_state)
+
+        if not articles:
+            logger.warning("No articles fetched")
+            feed_cache.save()
+            timeline_state.save()
+            record_polls(planner, sources, polled, [], feed_cache)
+            return
+
+        with instrument.stage('checkpoint', items=len(articles)):
+            feed_cache.save(checkpoint.feed_cache_path)
+            timeline_state.save(checkpoint.timeline_state_path)
+            checkpoint.save_articles(articles)
+            state = checkpoint.mark('fetched', polled=polled, due_only=due_only)
+        context.check_cancelled()
+
+    if state['stage'] == 'fetched':
+        # Process only articles not stored by previous runs
+        if articles is None:
+            articles = checkpoint.load_articles()
+        with instrument.stage('process', items=len(articles)) as counts:
+            processed = process_articles(articles, fingerprint_index=context.index,
+                                         batch_scoring=settings.get('batch_scoring', False))
+            counts['kept'] = len(processed)
+        with instrument.stage('checkpoint', items=len(processed)):
+            checkpoint.save_articles(processed)
+            state = checkpoint.mark('processed')
+        context.check_cancelled()
+    else:
+        processed = checkpoint.load_articles()
+
+    if state['stage'] == 'processed':
+        # Save to database (idempotent upsert, safe to repeat on resume)
+        inserted, updated, unchanged = save_processed(context, processed)
+        feed_cache.save(feed_cache_path)
+        timeline_state.save(timeline_state_path)
+        record_polls(planner, sources, polled, processed, feed_cache)
+        logger.info(f"Database updated: {inserted} new, {updated} updated, {unchanged} unchanged")
+        state = checkpoint.mark('saved')
+        context.check_cancelled()
+
+    cleanup_and_report(context, settings)
+    checkpoint.clear()
     logger.info("=== Update Complete ===")
 
 
@@ -167,39 +521,165 @@ def show_today(count=10, category=None, format_type='markdown'):
         print(content)
 
 
-def push_news(count=10):
-    """Push news to configured channels"""
+def parse_since(value):
+    """
+    Parse a --since value: relative ('24h', '7d', '2w') or a date ('2026-03-01')
+
+    Returns:
+        datetime: Lower bound for published time
+    """
+    units = {'h': 'hours', 'd': 'days', 'w': 'weeks'}
+    if value[-1:].lower() in units and value[:-1].isdigit():
+        return datetime.now() - timedelta(**{units[value[-1].lower()]: int(value[:-1])})
+
+    try:
+        return datetime.fromisoformat(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Invalid --since value: {value} (use 24h, 7d, 2w or YYYY-MM-DD)")
+
+
+def search_news(query, since=None, category=None, count=10, format_type='markdown'):
+    """Full-text search over stored articles"""
+    db_path = Path(__file__).parent.parent / 'data' / 'ai_news.db'
+    db = ArticleDatabase(str(db_path))
+
+    articles = db.search_articles(query, since=since, category=category, limit=count)
+    db.close()
+
+    if not articles:
+        print(f"No articles found for: {query}")
+        return
+
+    if format_type == 'json':
+        import json
+        print(json.dumps([
+            {
+                'title': a['title'],
+                'link': a['link'],
+                'source': a['source'],
+                'category': a['category'],
+                'score': a['score'],
+                'rank': a['rank'],
+                'published': a['published'].isoformat()
+            }
+            for a in articles
+        ], indent=2, ensure_ascii=False))
+    else:
+        print(f"# 🔍 Search: {query}\n")
+        for i, article in enumerate(articles, 1):
+            print(f"{i}. **{article['title']}**")
+            print(f"   {article['source']} | {article['category']} | "
+                  f"{article['published'].strftime('%Y-%m-%d %H:%M')}")
+            print(f"   {article['link']}\n")
+
+
+@instrument.reported('push')
+def push_news(count=10, context=None):
+    """
+    Push news to configured channels
+
+    Args:
+        count (int): Number of articles to push
+        context (AppContext): Shared resources (optional)
+    """
     logger.info("=== Starting Push ===")
 
     # Load push config
-    push_config = load_config('push')
+    push_config = context.config('push') if context else load_config('push')
 
     if not push_config:
         logger.error("Push configuration not found")
         return
 
-    # Get articles from database
-    db_path = Path(__file__).parent.parent / 'data' / 'ai_news.db'
-    db = ArticleDatabase(str(db_path))
-
-    articles = db.get_today_articles(limit=count)
-    db.close()
+    db = context.db if context else ArticleDatabase(str(DATA_DIR / 'ai_news.db'))
+    try:
+        with instrument.stage('push.query') as counts:
+            articles = db.get_today_articles(limit=count)
+            subscriptions = db.get_subscriptions()
+
+            # One candidate query covers every subscriber's category filter and top-N
+            candidates = []
+            if subscriptions:
+                per_category = max(subscription['top_n'] for subscription in subscriptions)
+                candidates = db.get_category_leaders(hours=24, per_category=per_category)
+            counts.update(items=len(articles), candidates=len(candidates))
+    finally:
+        if not context:
+            db.close()
 
     if not articles:
         logger.warning("No articles to push")
         return
 
-    # Push to channels
-    results = push_to_channels(articles, push_config, count)
+    # Push to all channels concurrently
+    with instrument.stage('push.channels') as counts:
+        deliveries = push_to_channels(articles, push_config, count)
+        counts['messages'] = len(deliveries)
 
     # Log results
-    for channel, result in results:
-        status = "Success" if result.get('code') == 0 or result.get('ok') or result.get('status') == 'success' else "Failed"
-        logger.info(f"[{channel}] {status}: {result}")
+    for delivery in deliveries:
+        instrument.record('deliveries', delivery.channel, messages=1, failed=int(not delivery.ok),
+                          attempts=delivery.attempts, latency=delivery.latency,
+                          elapsed=delivery.elapsed)
+        status = "Success" if delivery.ok else "Failed"
+        logger.info(f"[{delivery.channel}] {status} in {delivery.elapsed:.2f}s "
+                    f"(latency {delivery.latency:.2f}s, {delivery.attempts} attempt(s)): "
+                    f"{delivery.result}")
+
+    if subscriptions:
+        fanout = push_config.get('fanout', {})
+        with instrument.stage('push.subscribers', subscribers=len(subscriptions)) as counts:
+            results = push_to_subscribers(candidates, subscriptions, push_config,
+                                          max_parallel=fanout.get('max_parallel', FANOUT_WORKERS))
+            counts['messages'] = sum(len(deliveries) for _, deliveries in results)
+        failed = [subscription for subscription, deliveries in results
+                  if not all(delivery.ok for delivery in deliveries)]
+        for subscription in failed:
+            logger.warning(f"[subscriber {subscription['id']}] delivery failed: "
+                           f"{subscription['name'] or subscription['target']}")
+        logger.info(f"Subscribers: {len(results) - len(failed)}/{len(results)} delivered "
+                    f"({len(subscriptions) - len(results)} had no matching articles)")
 
     logger.info("=== Push Complete ===")
 
 
+def subscribe(target, channel, categories=None, top_n=10, name=None, secret=None):
+    """Add or update a push subscriber"""
+    db = ArticleDatabase(str(DATA_DIR / 'ai_news.db'))
+    subscription_id = db.add_subscription(channel, target, name=name, categories=categories,
+                                          top_n=top_n, secret=secret)
+    db.close()
+    scope = ', '.join(categories) if categories else 'all categories'
+    print(f"Subscription {subscription_id}: {channel} {name or target} (top {top_n}, {scope})")
+
+
+def unsubscribe(subscription_id):
+    """Remove a push subscriber"""
+    db = ArticleDatabase(str(DATA_DIR / 'ai_news.db'))
+    removed = db.remove_subscription(subscription_id)
+    db.close()
+    print(f"Removed subscription {subscription_id}" if removed
+          else f"No subscription {subscription_id}")
+
+
+def show_subscriptions():
+    """List push subscribers"""
+    db = ArticleDatabase(str(DATA_DIR / 'ai_news.db'))
+    subscriptions = db.get_subscriptions(enabled_only=False)
+    db.close()
+
+    if not subscriptions:
+        print("No subscriptions. Add one with 'subscribe <target> --channel feishu'.")
+        return
+
+    for subscription in subscriptions:
+        scope = ', '.join(subscription['categories']) if subscription['categories'] else 'all'
+        state = '' if subscription['enabled'] else ' (disabled)'
+        print(f"{subscription['id']:>5}  {subscription['channel']:<12} "
+              f"top {subscription['top_n']:<3} {scope:<20} "
+              f"{subscription['name'] or subscription['target']}{state}")
+
+
 def show_stats():
     """Show database statistics"""
     db_path = Path(__file__).parent.parent / 'data' / 'ai_news.db'
@@ -222,6 +702,46 @@ def show_stats():
     print()
 
 
+def check_stats():
+    """Verify the statistics rollup against the articles table and rebuild it"""
+    db_path = Path(__file__).parent.parent / 'data' / 'ai_news.db'
+    db = ArticleDatabase(str(db_path))
+
+    mismatched = db.rebuild_rollup()
+    db.close()
+
+    if mismatched:
+        print(f"Statistics rollup was inconsistent: {mismatched} rows rebuilt")
+    else:
+        print("Statistics rollup is consistent")
+
+
+def profile_pipeline(target='update', due_only=False, streaming=None, count=10, top=25):
+    """
+    Run the update or push pipeline under cProfile
+
+    Prints the functions with the highest cumulative time and writes the
+    profile (.prof) and collapsed stacks (.folded, for flamegraph.pl or
+    speedscope) under logs/profiles; the run report is written as usual.
+
+    Args:
+        target (str): 'update' or 'push'
+        due_only (bool): Update only sources due for polling
+        streaming (bool): Streaming update (default: settings.streaming_update)
+        count (int): Number of articles to push
+        top (int): Functions to print
+    """
+    if target == 'push':
+        func = lambda: push_news(count)
+    else:
+        func = lambda: update_database(due_only=due_only, streaming=streaming)
+
+    stats, prof_path, folded_path = instrument.profile_call(func, target)
+    stats.sort_stats('cumulative').print_stats(top)
+    print(f"Profile: {prof_path}")
+    print(f"Collapsed stacks: {folded_path}")
+
+
 def main():
     """Main entry point"""
     parser = argparse.ArgumentParser(
@@ -230,23 +750,54 @@ def main():
         epilog='''
 Examples:
   %(prog)s update              # Fetch and update articles
+  %(prog)s update --due        # Fetch only sources due for polling
+  %(prog)s update --stream     # Store each source's articles as they arrive
   %(prog)s today               # Show today's top 10 news
   %(prog)s today --count 20    # Show top 20 news
   %(prog)s today --category 技术突破  # Filter by category
-  %(prog)s push                # Push to configured channels
+  %(prog)s search GPT-5 --since 7d   # Full-text search of stored articles
+  %(prog)s push                # Push to configured channels and subscribers
+  %(prog)s subscribe URL --channel feishu --category 产品发布,研究突破 --count 5
+  %(prog)s subscriptions       # List subscribers
+  %(prog)s unsubscribe 3       # Remove subscriber 3
   %(prog)s stats               # Show statistics
+  %(prog)s check-stats         # Verify and rebuild statistics rollup
+  %(prog)s profile             # Profile an update run (profile push: a push run)
         '''
     )
 
     parser.add_argument('command',
-                       choices=['update', 'today', 'push', 'stats'],
+                       choices=['update', 'today', 'search', 'push', 'subscribe', 'unsubscribe',
+                                'subscriptions', 'stats', 'check-stats', 'profile'],
                        help='Command to execute')
 
+    parser.add_argument('query', nargs='?',
+                       help='Search query, subscriber target (webhook URL, chat ID, email), '
+                            'subscription ID or pipeline to profile (update, push)')
+
     parser.add_argument('--count', type=int, default=10,
                        help='Number of articles to show (default: 10)')
 
     parser.add_argument('--category', type=str,
-                       help='Filter by category')
+                       help='Filter by category (subscribe: comma-separated list)')
+
+    parser.add_argument('--channel', choices=list(CHANNEL_NAMES),
+                       help='Push channel of a subscriber')
+
+    parser.add_argument('--name', type=str,
+                       help='Display name of a subscriber')
+
+    parser.add_argument('--secret', type=str,
+                       help='DingTalk signing secret or Telegram bot token of a subscriber')
+
+    parser.add_argument('--since', type=parse_since,
+                       help='Search only articles published since 24h/7d/2w or YYYY-MM-DD')
+
+    parser.add_argument('--due', action='store_true',
+                       help='Update only sources due under adaptive polling')
+
+    parser.add_argument('--stream', action='store_true', default=None,
+                       help='Store each source\'s articles as soon as they arrive')
 
     parser.add_argument('--format', choices=['markdown', 'json'],
                        default='markdown',
@@ -256,17 +807,45 @@ Examples:
 
     try:
         if args.command == 'update':
-            update_database()
+            update_database(due_only=args.due, streaming=args.stream)
 
         elif args.command == 'today':
             show_today(args.count, args.category, args.format)
 
+        elif args.command == 'search':
+            if not args.query:
+                parser.error('search requires a query')
+            search_news(args.query, args.since, args.category, args.count, args.format)
+
         elif args.command == 'push':
             push_news(args.count)
 
+        elif args.command == 'subscribe':
+            if not args.query or not args.channel:
+                parser.error('subscribe requires a target and --channel')
+            categories = [c.strip() for c in args.category.split(',') if c.strip()] if args.category else None
+            subscribe(args.query, args.channel, categories, args.count, args.name, args.secret)
+
+        elif args.command == 'unsubscribe':
+            if not args.query or not args.query.isdigit():
+                parser.error('unsubscribe requires a subscription ID')
+            unsubscribe(int(args.query))
+
+        elif args.command == 'subscriptions':
+            show_subscriptions()
+
         elif args.command == 'stats':
             show_stats()
 
+        elif args.command == 'check-stats':
+            check_stats()
+
+        elif args.command == 'profile':
+            target = args.query or 'update'
+            if target not in ('update', 'push'):
+                parser.error('profile takes update or push')
+            profile_pipeline(target, args.due, args.stream, args.count)
+
     except KeyboardInterrupt:
         print("\nInterrupted by user")
         sys.exit(1)
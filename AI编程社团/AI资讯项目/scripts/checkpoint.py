@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+Update Checkpoint Module
+Persists the intermediate article batches of an update run, so a run that
+crashed or timed out resumes from its last completed stage
+"""
+
+import gzip
+import json
+import shutil
+import logging
+from datetime import datetime, timedelta
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+# Stages in order; each is recorded once its output is on disk
+STAGES = ('fetched', 'processed', 'saved')
+
+DATETIME_FIELDS = ('published', 'fetch_time')
+
+
+def _encode(article):
+    return {
+        key: value.isoformat() if key in DATETIME_FIELDS and isinstance(value, datetime) else value
+        for key, value in article.items()
+    }
+
+
+def _decode(record):
+    for key in DATETIME_FIELDS:
+        if isinstance(record.get(key), str):
+            record[key] = datetime.fromisoformat(record[key])
+    return record
+
+
+class Checkpoint:
+    """
+    Checkpoint directory of one update run
+
+    Holds state.json (last completed stage and run metadata), the article
+    batch produced by that stage, and the feed cache and Twitter timeline
+    state captured at fetch time.
+    """
+
+    def __init__(self, directory, max_age_hours=6):
+        """
+        Args:
+            directory (str): Checkpoint directory
+            max_age_hours (float): Checkpoints older than this are discarded
+        """
+        self.directory = Path(directory)
+        self.max_age = timedelta(hours=max_age_hours)
+        self.state_path = self.directory / 'state.json'
+        self.articles_path = self.directory / 'articles.jsonl.gz'
+        self.feed_cache_path = self.directory / 'feed_cache.json'
+        self.timeline_state_path = self.directory / 'twitter_state.json'
+
+    def load(self):
+        """
+        State of an interrupted run, if one can be resumed
+
+        Returns:
+            dict: State with 'stage', 'started' and run fields, or None
+        """
+        if not self.state_path.exists():
+            return None
+
+        try:
+            with open(self.state_path, 'r', encoding='utf-8') as f:
+                state = json.load(f)
+            started = datetime.fromisoformat(state['started'])
+        except (OSError, ValueError, KeyError) as e:
+            logger.warning(f"Discarding unreadable checkpoint: {e}")
+            self.clear()
+            return None
+
+        if state.get('stage') not in STAGES:
+            self.clear()
+            return None
+
+        if datetime.now() - started > self.max_age:
+            logger.warning(f"Discarding stale checkpoint from {state['started']} "
+                           f"(stage '{state['stage']}')")
+            self.clear()
+            return None
+
+        return state
+
+    def mark(self, stage, **fields):
+        """
+        Record a completed stage
+
+        Args:
+            stage (str): One of STAGES
+            **fields: Run metadata to store (JSON-serializable)
+
+        Returns:
+            dict: Updated state
+        """
+        state = {}
+        if self.state_path.exists():
+            with open(self.state_path, 'r', encoding='utf-8') as f:
+                state = json.load(f)
+
+        state.setdefault('started', datetime.now().isoformat())
+        state.update(fields)
+        state['stage'] = stage
+
+        self.directory.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.state_path.with_suffix('.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(state, f, ensure_ascii=False, indent=2)
+        tmp_path.replace(self.state_path)
+
+        logger.info(f"Checkpoint: stage '{stage}' complete")
+        return state
+
+    def save_articles(self, articles):
+        """Write the article batch of the current stage (atomically)"""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.articles_path.with_suffix('.tmp')
+        with gzip.open(tmp_path, 'wt', encoding='utf-8') as f:
+            for article in articles:
+                f.write(json.dumps(_encode(article), ensure_ascii=False) + '\n')
+        tmp_path.replace(self.articles_path)
+
+    def load_articles(self):
+        """Read the article batch of the last completed stage"""
+        if not self.articles_path.exists():
+            return []
+
+        with gzip.open(self.articles_path, 'rt', encoding='utf-8') as f:
+            return [_decode(json.loads(line)) for line in f if line.strip()]
+
+    def clear(self):
+        """Remove the checkpoint (run finished or discarded)"""
+        if self.directory.exists():
+            shutil.rmtree(self.directory)
@@ -4,13 +4,168 @@ Database Module
 SQLite database operations for article storage
 """
 
+import re
 import sqlite3
+import gzip
+import json
 import logging
+from collections.abc import Mapping
 from datetime import datetime, timedelta
 from pathlib import Path
 
 logger = logging.getLogger(__name__)
 
+# Columns written by save_articles, in statement order
+ARTICLE_COLUMNS = (
+    'id', 'title', 'link', 'published', 'summary', 'source', 'source_category',
+    'category', 'authority_score', 'score', 'fetch_time'
+)
+
+# Columns compared to decide whether a stored article changed
+# (fetch_time alone does not count as a change)
+CONTENT_COLUMNS = (
+    'title', 'published', 'summary', 'source', 'source_category',
+    'category', 'authority_score', 'score'
+)
+
+UPSERT_SQL = f'''
+    INSERT INTO articles ({', '.join(ARTICLE_COLUMNS)})
+    VALUES ({', '.join('?' * len(ARTICLE_COLUMNS))})
+    ON CONFLICT(link) DO UPDATE SET
+        {', '.join(f'{col} = excluded.{col}' for col in ARTICLE_COLUMNS if col not in ('id', 'link'))}
+'''
+
+# SQLite limits the number of host parameters per statement
+QUERY_CHUNK_SIZE = 500
+
+# Bumped whenever init_database needs to migrate an existing file
+# (stored in PRAGMA user_version)
+SCHEMA_VERSION = 5
+
+# Width of a statistics rollup bucket (by published time)
+ROLLUP_BUCKET_SECONDS = 3600
+
+# Columns stored as integer Unix epoch seconds
+TIMESTAMP_COLUMNS = frozenset(('published', 'fetch_time', 'created_at'))
+
+
+def to_epoch(value):
+    """
+    Convert a datetime (or ISO string) to integer epoch seconds
+
+    Naive datetimes are taken as local time, like datetime.now().
+
+    Args:
+        value: datetime, ISO 8601 string, number or None
+
+    Returns:
+        int: Epoch seconds (None if value is None)
+    """
+    if value is None:
+        return None
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    if isinstance(value, datetime):
+        return int(value.timestamp())
+    return int(value)
+
+
+_CJK_RUN = re.compile(r'[\u3400-\u4dbf\u4e00-\u9fff\uf900-\ufaff]+')
+_HTML_TAG = re.compile(r'<[^>]+>')
+# Token characters of the unicode61 tokenizer (underscore separates)
+_SEARCH_TOKEN = re.compile(r'[^\W_]+')
+
+
+def segment_for_search(text):
+    """
+    Prepare text for the full-text index
+
+    unicode61 treats a whole run of Chinese characters as one token, so
+    CJK runs are split into overlapping bigrams ("大模型" -> "大模 模型").
+    HTML tags from RSS summaries are dropped. Must stay deterministic:
+    index deletes replay it on the old values.
+
+    Args:
+        text (str): Title or summary
+
+    Returns:
+        str: Segmented text
+    """
+    if not text:
+        return ''
+
+    def bigrams(match):
+        run = match.group(0)
+        if len(run) == 1:
+            return f' {run} '
+        return ' ' + ' '.join(run[i:i + 2] for i in range(len(run) - 1)) + ' '
+
+    return _CJK_RUN.sub(bigrams, _HTML_TAG.sub(' ', text))
+
+
+def build_search_query(query):
+    """
+    Convert a user query into an FTS5 MATCH expression
+
+    Each whitespace-separated term becomes a quoted phrase of its
+    segmented tokens; terms are combined with AND. A single Chinese
+    character becomes a prefix query since only bigrams are indexed.
+
+    Args:
+        query (str): User search query
+
+    Returns:
+        str: MATCH expression (empty if the query has no tokens)
+    """
+    terms = []
+    for term in query.split():
+        tokens = _SEARCH_TOKEN.findall(segment_for_search(term))
+        if not tokens:
+            continue
+        if len(tokens) == 1 and len(tokens[0]) == 1 and _CJK_RUN.fullmatch(tokens[0]):
+            terms.append(f'"{tokens[0]}"*')
+        else:
+            terms.append('"' + ' '.join(tokens) + '"')
+
+    return ' AND '.join(terms)
+
+
+class ArticleRow(Mapping):
+    """
+    Read-only article view over a sqlite3.Row
+
+    Epoch columns are converted to naive local datetimes only when the
+    field is accessed, so callers that never touch them pay nothing.
+    """
+
+    __slots__ = ('_row', '_columns', '_converted')
+
+    def __init__(self, row, columns):
+        self._row = row
+        self._columns = columns
+        self._converted = {}
+
+    def __getitem__(self, key):
+        if key not in self._columns:
+            raise KeyError(key)
+
+        if key in TIMESTAMP_COLUMNS:
+            if key not in self._converted:
+                value = self._row[key]
+                self._converted[key] = datetime.fromtimestamp(value) if value is not None else None
+            return self._converted[key]
+
+        return self._row[key]
+
+    def __iter__(self):
+        return iter(self._row.keys())
+
+    def __len__(self):
+        return len(self._columns)
+
+    def __repr__(self):
+        return f"ArticleRow({dict(self)!r})"
+
 
 class ArticleDatabase:
     """SQLite database for article storage"""
@@ -34,104 +189,354 @@ class ArticleDatabase:
         self.conn = sqlite3.connect(self.db_path)
         self.conn.row_factory = sqlite3.Row  # Return rows as dictionaries
 
+        # Used by the full-text index triggers, so every connection that
+        # writes articles must register it
+        self.conn.create_function('fts_segment', 1, segment_for_search, deterministic=True)
+
+        # WAL lets readers run during writes; NORMAL sync is safe with WAL
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('PRAGMA synchronous=NORMAL')
+
         cursor = self.conn.cursor()
 
-        # Create articles table
+        cursor.execute("SELECT name FROM sqlite_master WHERE type = 'table' AND name = 'articles'")
+        table_exists = cursor.fetchone() is not None
+        version = cursor.execute('PRAGMA user_version').fetchone()[0]
+
+        # Incremental auto-vacuum lets cleanup return free pages to the OS
+        # in bounded steps. It only takes effect on a new file or after a
+        # full VACUUM, which existing files get once here.
+        if cursor.execute('PRAGMA auto_vacuum').fetchone()[0] != 2:
+            cursor.execute('PRAGMA auto_vacuum=INCREMENTAL')
+            if table_exists:
+                logger.info("Enabling incremental auto-vacuum (one-time VACUUM)...")
+                cursor.execute('VACUUM')
+
+        if table_exists and version < 1:
+            self._migrate_to_epoch_timestamps()
+
+        # Create articles table (timestamps are Unix epoch seconds)
         cursor.execute('''
             CREATE TABLE IF NOT EXISTS articles (
                 id TEXT PRIMARY KEY,
                 title TEXT NOT NULL,
                 link TEXT UNIQUE NOT NULL,
-                published TIMESTAMP,
+                published INTEGER,
                 summary TEXT,
                 source TEXT,
                 source_category TEXT,
                 category TEXT,
                 authority_score REAL,
                 score REAL,
-                fetch_time TIMESTAMP,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                fetch_time INTEGER,
+                created_at INTEGER DEFAULT (CAST(strftime('%s', 'now') AS INTEGER))
             )
         ''')
 
-        # Create indexes for better query performance
+        # Composite indexes cover the filter and sort columns of the
+        # recent/category queries, so those only scan the time window
         cursor.execute('''
-            CREATE INDEX IF NOT EXISTS idx_published
-            ON articles(published DESC)
+            CREATE INDEX IF NOT EXISTS idx_published_score
+            ON articles(published, score)
         ''')
 
         cursor.execute('''
-            CREATE INDEX IF NOT EXISTS idx_score
-            ON articles(score DESC)
+            CREATE INDEX IF NOT EXISTS idx_category_published_score
+            ON articles(category, published, score)
         ''')
 
         cursor.execute('''
-            CREATE INDEX IF NOT EXISTS idx_category
-            ON articles(category)
+            CREATE INDEX IF NOT EXISTS idx_created_at
+            ON articles(created_at DESC)
         ''')
 
+        # Article counts per published hour, category and source, kept in
+        # sync by triggers so every write path maintains it transactionally
         cursor.execute('''
-            CREATE INDEX IF NOT EXISTS idx_created_at
-            ON articles(created_at DESC)
+            CREATE TABLE IF NOT EXISTS article_rollup (
+                bucket INTEGER NOT NULL,
+                category TEXT NOT NULL,
+                source TEXT NOT NULL,
+                count INTEGER NOT NULL,
+                PRIMARY KEY (bucket, category, source)
+            ) WITHOUT ROWID
+        ''')
+
+        bucket_new = f"COALESCE(NEW.published, 0) - COALESCE(NEW.published, 0) % {ROLLUP_BUCKET_SECONDS}"
+        bucket_old = f"COALESCE(OLD.published, 0) - COALESCE(OLD.published, 0) % {ROLLUP_BUCKET_SECONDS}"
+        increment = f'''
+            INSERT INTO article_rollup (bucket, category, source, count)
+            VALUES ({bucket_new}, COALESCE(NEW.category, ''), COALESCE(NEW.source, ''), 1)
+            ON CONFLICT(bucket, category, source) DO UPDATE SET count = count + 1;
+        '''
+        decrement = f'''
+            UPDATE article_rollup SET count = count - 1
+            WHERE bucket = {bucket_old}
+              AND category = COALESCE(OLD.category, '')
+              AND source = COALESCE(OLD.source, '');
+            DELETE FROM article_rollup
+            WHERE bucket = {bucket_old}
+              AND category = COALESCE(OLD.category, '')
+              AND source = COALESCE(OLD.source, '')
+              AND count <= 0;
+        '''
+
+        cursor.execute(f'''
+            CREATE TRIGGER IF NOT EXISTS trg_rollup_insert AFTER INSERT ON articles
+            BEGIN {increment} END
+        ''')
+
+        cursor.execute(f'''
+            CREATE TRIGGER IF NOT EXISTS trg_rollup_delete AFTER DELETE ON articles
+            BEGIN {decrement} END
+        ''')
+
+        cursor.execute(f'''
+            CREATE TRIGGER IF NOT EXISTS trg_rollup_update
+            AFTER UPDATE OF published, category, source ON articles
+            BEGIN {decrement} {increment} END
+        ''')
+
+        # Running article total, so the overall count is a single row read
+        # instead of a sum over every rollup bucket
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS article_totals (
+                id INTEGER PRIMARY KEY CHECK (id = 1),
+                count INTEGER NOT NULL
+            )
+        ''')
+        cursor.execute('INSERT OR IGNORE INTO article_totals (id, count) VALUES (1, 0)')
+
+        cursor.execute('''
+            CREATE TRIGGER IF NOT EXISTS trg_total_insert AFTER INSERT ON articles
+            BEGIN UPDATE article_totals SET count = count + 1 WHERE id = 1; END
+        ''')
+
+        cursor.execute('''
+            CREATE TRIGGER IF NOT EXISTS trg_total_delete AFTER DELETE ON articles
+            BEGIN UPDATE article_totals SET count = count - 1 WHERE id = 1; END
         ''')
 
+        # Full-text index over title and summary. Contentless: it stores
+        # only the segmented tokens, keyed by articles.rowid
+        cursor.execute('''
+            CREATE VIRTUAL TABLE IF NOT EXISTS articles_fts USING fts5(
+                title, summary,
+                content='',
+                tokenize='unicode61 remove_diacritics 2'
+            )
+        ''')
+
+        fts_insert = '''
+            INSERT INTO articles_fts (rowid, title, summary)
+            VALUES (NEW.rowid, fts_segment(NEW.title), fts_segment(NEW.summary));
+        '''
+        fts_delete = '''
+            INSERT INTO articles_fts (articles_fts, rowid, title, summary)
+            VALUES ('delete', OLD.rowid, fts_segment(OLD.title), fts_segment(OLD.summary));
+        '''
+
+        cursor.execute(f'''
+            CREATE TRIGGER IF NOT EXISTS trg_fts_insert AFTER INSERT ON articles
+            BEGIN {fts_insert} END
+        ''')
+
+        cursor.execute(f'''
+            CREATE TRIGGER IF NOT EXISTS trg_fts_delete AFTER DELETE ON articles
+            BEGIN {fts_delete} END
+        ''')
+
+        cursor.execute(f'''
+            CREATE TRIGGER IF NOT EXISTS trg_fts_update AFTER UPDATE OF title, summary ON articles
+            BEGIN {fts_delete} {fts_insert} END
+        ''')
+
+        # Push subscribers: one row per group/chat/mailbox, with its own
+        # category filter (JSON list, NULL for all) and digest size
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS subscriptions (
+                id INTEGER PRIMARY KEY,
+                name TEXT,
+                channel TEXT NOT NULL,
+                target TEXT NOT NULL,
+                secret TEXT,
+                categories TEXT,
+                top_n INTEGER NOT NULL DEFAULT 10,
+                enabled INTEGER NOT NULL DEFAULT 1,
+                created_at INTEGER DEFAULT (CAST(strftime('%s', 'now') AS INTEGER)),
+                UNIQUE (channel, target)
+            )
+        ''')
+
+        if table_exists and version < 5:
+            self.rebuild_rollup()
+
+        if table_exists and version < 4:
+            self.rebuild_search_index()
+
+        cursor.execute(f'PRAGMA user_version = {SCHEMA_VERSION}')
         self.conn.commit()
         logger.info(f"Database initialized at {self.db_path}")
 
+    def _migrate_to_epoch_timestamps(self):
+        """Rebuild a legacy articles table with ISO string timestamps as epoch integers"""
+        logger.info("Migrating articles table to epoch timestamps...")
+
+        def iso_to_epoch(value):
+            try:
+                return to_epoch(value)
+            except (TypeError, ValueError):
+                return None
+
+        self.conn.create_function('iso_to_epoch', 1, iso_to_epoch, deterministic=True)
+
+        with self.conn:
+            self.conn.execute('ALTER TABLE articles RENAME TO articles_legacy')
+            self.conn.execute('''
+                CREATE TABLE articles (
+                    id TEXT PRIMARY KEY,
+                    title TEXT NOT NULL,
+                    link TEXT UNIQUE NOT NULL,
+                    published INTEGER,
+                    summary TEXT,
+                    source TEXT,
+                    source_category TEXT,
+                    category TEXT,
+                    authority_score REAL,
+                    score REAL,
+                    fetch_time INTEGER,
+                    created_at INTEGER DEFAULT (CAST(strftime('%s', 'now') AS INTEGER))
+                )
+            ''')
+            # created_at came from CURRENT_TIMESTAMP, which is UTC
+            self.conn.execute('''
+                INSERT INTO articles
+                (id, title, link, published, summary, source, source_category,
+                 category, authority_score, score, fetch_time, created_at)
+                SELECT id, title, link, iso_to_epoch(published), summary, source,
+                       source_category, category, authority_score, score,
+                       iso_to_epoch(fetch_time),
+                       CAST(strftime('%s', created_at) AS INTEGER)
+                FROM articles_legacy
+            ''')
+            migrated = self.conn.execute('SELECT COUNT(*) FROM articles').fetchone()[0]
+            self.conn.execute('DROP TABLE articles_legacy')
+
+        logger.info(f"Migrated {migrated} articles to epoch timestamps")
+
+    def _query_articles(self, sql, params):
+        """Run a SELECT and wrap each row in a lazy ArticleRow"""
+        cursor = self.conn.cursor()
+        cursor.execute(sql, params)
+        columns = frozenset(column[0] for column in cursor.description)
+        return [ArticleRow(row, columns) for row in cursor.fetchall()]
+
+    @staticmethod
+    def _article_row(article):
+        """Convert an article dictionary to a row tuple in ARTICLE_COLUMNS order"""
+        return (
+            article['id'],
+            article['title'],
+            article['link'],
+            to_epoch(article['published']),
+            article.get('summary', ''),
+            article['source'],
+            article.get('source_category', 'unknown'),
+            article.get('category', '其他'),
+            article.get('authority_score', 20),
+            article.get('score', 0),
+            to_epoch(article['fetch_time'])
+        )
+
+    def _stored_content(self, links):
+        """Map link -> CONTENT_COLUMNS tuple for links already stored"""
+        cursor = self.conn.cursor()
+        stored = {}
+        links = list(links)
+
+        for start in range(0, len(links), QUERY_CHUNK_SIZE):
+            chunk = links[start:start + QUERY_CHUNK_SIZE]
+            placeholders = ','.join('?' * len(chunk))
+            cursor.execute(f'''
+                SELECT link, {', '.join(CONTENT_COLUMNS)} FROM articles
+                WHERE link IN ({placeholders})
+            ''', chunk)
+            for row in cursor.fetchall():
+                stored[row['link']] = tuple(row[col] for col in CONTENT_COLUMNS)
+
+        return stored
+
     def save_articles(self, articles):
         """
-        Save articles to database (insert or update)
+        Save articles to database with a bulk upsert
+
+        All rows are written with one prepared INSERT ... ON CONFLICT(link)
+        DO UPDATE statement in a single transaction. Rows whose content is
+        identical to the stored one are not rewritten.
 
         Args:
             articles (list): List of article dictionaries
 
         Returns:
-            tuple: (inserted_count, updated_count)
+            tuple: (inserted_count, updated_count, unchanged_count)
         """
-        cursor = self.conn.cursor()
-        inserted = 0
-        updated = 0
-
+        rows = {}
         for article in articles:
             try:
-                # Convert datetime to string
-                published_str = article['published'].isoformat() if isinstance(
-                    article['published'], datetime) else article['published']
-                fetch_time_str = article['fetch_time'].isoformat() if isinstance(
-                    article['fetch_time'], datetime) else article['fetch_time']
-
-                # Try to insert
-                cursor.execute('''
-                    INSERT OR REPLACE INTO articles
-                    (id, title, link, published, summary, source, source_category,
-                     category, authority_score, score, fetch_time)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                ''', (
-                    article['id'],
-                    article['title'],
-                    article['link'],
-                    published_str,
-                    article.get('summary', ''),
-                    article['source'],
-                    article.get('source_category', 'unknown'),
-                    article.get('category', '其他'),
-                    article.get('authority_score', 20),
-                    article.get('score', 0),
-                    fetch_time_str
-                ))
-
-                if cursor.rowcount > 0:
-                    inserted += 1
-
-            except sqlite3.IntegrityError:
-                updated += 1
-                logger.debug(f"Article already exists: {article['title']}")
+                row = self._article_row(article)
             except Exception as e:
                 logger.error(f"Error saving article {article.get('id', 'unknown')}: {e}")
+                continue
+            rows[row[2]] = row  # Last occurrence of a link wins
+
+        stored = self._stored_content(rows)
+        content_index = [ARTICLE_COLUMNS.index(col) for col in CONTENT_COLUMNS]
+
+        to_insert = []
+        to_update = []
+        unchanged = 0
+        for link, row in rows.items():
+            if link not in stored:
+                to_insert.append(row)
+            elif tuple(row[i] for i in content_index) != stored[link]:
+                to_update.append(row)
+            else:
+                unchanged += 1
+
+        inserted = len(to_insert)
+        updated = len(to_update)
+
+        try:
+            with self.conn:
+                self.conn.executemany(UPSERT_SQL, to_insert + to_update)
+        except sqlite3.IntegrityError as e:
+            # e.g. an id collision with a different link; retry row by row
+            logger.warning(f"Bulk upsert failed ({e}), retrying row by row")
+            with self.conn:
+                for row in to_insert + to_update:
+                    try:
+                        self.conn.execute(UPSERT_SQL, row)
+                    except sqlite3.IntegrityError as row_error:
+                        logger.error(f"Error saving article {row[0]}: {row_error}")
+                        if row[2] in stored:
+                            updated -= 1
+                        else:
+                            inserted -= 1
+
+        logger.info(f"Saved articles: {inserted} inserted, {updated} updated, "
+                    f"{unchanged} unchanged")
+        return (inserted, updated, unchanged)
+
+    def get_stored_titles(self):
+        """
+        Get link and title of every stored article
 
-        self.conn.commit()
-        logger.info(f"Saved articles: {inserted} inserted, {updated} updated")
-        return (inserted, updated)
+        Returns:
+            list: List of dictionaries with 'link' and 'title'
+        """
+        cursor = self.conn.cursor()
+        cursor.execute('SELECT link, title FROM articles')
+        return [dict(row) for row in cursor.fetchall()]
 
     def get_recent_articles(self, hours=24, limit=100):
         """
@@ -142,27 +547,22 @@ class ArticleDatabase:
             limit (int): Maximum number of articles
 
         Returns:
-            list: List of article dictionaries
+            list: List of ArticleRow mappings
         """
-        cursor = self.conn.cursor()
-
-        cutoff_time = datetime.now() - timedelta(hours=hours)
-        cutoff_str = cutoff_time.isoformat()
+        cutoff = to_epoch(datetime.now() - timedelta(hours=hours))
 
-        cursor.execute('''
+        # The inner query is answered from idx_published_score alone;
+        # full rows are only read for the selected rowids
+        articles = self._query_articles('''
             SELECT * FROM articles
-            WHERE published >= ?
+            WHERE rowid IN (
+                SELECT rowid FROM articles
+                WHERE published >= ?
+                ORDER BY score DESC, published DESC
+                LIMIT ?
+            )
             ORDER BY score DESC, published DESC
-            LIMIT ?
-        ''', (cutoff_str, limit))
-
-        articles = []
-        for row in cursor.fetchall():
-            article = dict(row)
-            # Convert string back to datetime
-            article['published'] = datetime.fromisoformat(article['published'])
-            article['fetch_time'] = datetime.fromisoformat(article['fetch_time'])
-            articles.append(article)
+        ''', (cutoff, limit))
 
         logger.info(f"Retrieved {len(articles)} articles from last {hours} hours")
         return articles
@@ -175,10 +575,42 @@ class ArticleDatabase:
             limit (int): Maximum number of articles
 
         Returns:
-            list: List of article dictionaries
+            list: List of ArticleRow mappings
         """
         return self.get_recent_articles(hours=24, limit=limit)
 
+    def get_category_leaders(self, hours=24, per_category=10):
+        """
+        Top articles of every category, in one query
+
+        The result holds each category's `per_category` best articles, so
+        it contains the top N (N <= per_category) of any set of categories,
+        including all of them.
+
+        Args:
+            hours (int): Number of hours to look back
+            per_category (int): Articles kept per category
+
+        Returns:
+            list: ArticleRow mappings, best first (score, then recency)
+        """
+        cutoff = to_epoch(datetime.now() - timedelta(hours=hours))
+
+        articles = self._query_articles('''
+            SELECT * FROM (
+                SELECT *, ROW_NUMBER() OVER (
+                    PARTITION BY category ORDER BY score DESC, published DESC
+                ) AS category_rank
+                FROM articles
+                WHERE published >= ?
+            )
+            WHERE category_rank <= ?
+            ORDER BY score DESC, published DESC
+        ''', (cutoff, per_category))
+
+        logger.info(f"Retrieved {len(articles)} category leaders from last {hours} hours")
+        return articles
+
     def get_articles_by_category(self, category, hours=24, limit=50):
         """
         Get articles filtered by category
@@ -189,58 +621,198 @@ class ArticleDatabase:
             limit (int): Maximum number of articles
 
         Returns:
-            list: List of article dictionaries
+            list: List of ArticleRow mappings
         """
-        cursor = self.conn.cursor()
-
-        cutoff_time = datetime.now() - timedelta(hours=hours)
-        cutoff_str = cutoff_time.isoformat()
+        cutoff = to_epoch(datetime.now() - timedelta(hours=hours))
 
-        cursor.execute('''
+        return self._query_articles('''
             SELECT * FROM articles
-            WHERE category = ? AND published >= ?
+            WHERE rowid IN (
+                SELECT rowid FROM articles
+                WHERE category = ? AND published >= ?
+                ORDER BY score DESC, published DESC
+                LIMIT ?
+            )
             ORDER BY score DESC, published DESC
-            LIMIT ?
-        ''', (category, cutoff_str, limit))
-
-        articles = []
-        for row in cursor.fetchall():
-            article = dict(row)
-            article['published'] = datetime.fromisoformat(article['published'])
-            article['fetch_time'] = datetime.fromisoformat(article['fetch_time'])
-            articles.append(article)
+        ''', (category, cutoff, limit))
 
-        return articles
+    def _archive_rows(self, rowids, archive_dir):
+        """Append rows to gzip-compressed JSON Lines files, one per created_at month"""
+        cursor = self.conn.cursor()
+        placeholders = ','.join('?' * len(rowids))
+        cursor.execute(f'SELECT * FROM articles WHERE rowid IN ({placeholders})', rowids)
 
-    def cleanup_old_articles(self, days=30):
+        by_month = {}
+        for row in cursor.fetchall():
+            record = dict(row)
+            for column in TIMESTAMP_COLUMNS:
+                if record.get(column) is not None:
+                    record[column] = datetime.fromtimestamp(record[column]).isoformat()
+            month = (record['created_at'] or 'unknown')[:7]
+            by_month.setdefault(month, []).append(record)
+
+        Path(archive_dir).mkdir(parents=True, exist_ok=True)
+        for month, records in by_month.items():
+            # Appending adds a new gzip member; readers see one stream
+            with gzip.open(Path(archive_dir) / f'articles-{month}.jsonl.gz', 'at', encoding='utf-8') as f:
+                for record in records:
+                    f.write(json.dumps(record, ensure_ascii=False) + '\n')
+
+    def cleanup_old_articles(self, days=30, chunk_size=500, max_chunks=20,
+                             vacuum_pages=1000, archive_dir=None):
         """
-        Delete articles older than specified days
+        Delete articles older than specified days in bounded chunks
+
+        Each chunk is selected through idx_created_at and deleted in its own
+        transaction, so the writer lock is never held for the whole purge.
+        At most max_chunks chunks are deleted per call; any remaining
+        backlog is left for the next run.
 
         Args:
             days (int): Number of days to retain
+            chunk_size (int): Rows deleted per transaction
+            max_chunks (int): Maximum chunks per call
+            vacuum_pages (int): Free pages to release afterwards (0 to skip)
+            archive_dir (str): Archive expired rows to monthly .jsonl.gz files here
 
         Returns:
             int: Number of deleted articles
         """
         cursor = self.conn.cursor()
 
-        cutoff_time = datetime.now() - timedelta(days=days)
-        cutoff_str = cutoff_time.isoformat()
+        cutoff = to_epoch(datetime.now() - timedelta(days=days))
+        deleted_count = 0
+        backlog = False
+
+        for chunk in range(max_chunks):
+            cursor.execute('''
+                SELECT rowid FROM articles
+                WHERE created_at < ?
+                ORDER BY created_at
+                LIMIT ?
+            ''', (cutoff, chunk_size))
+            rowids = [row[0] for row in cursor.fetchall()]
+
+            if not rowids:
+                break
+
+            # Archive before deleting: a crash in between re-archives the
+            # chunk on the next run rather than losing it
+            if archive_dir is not None:
+                self._archive_rows(rowids, archive_dir)
+
+            with self.conn:
+                self.conn.executemany('DELETE FROM articles WHERE rowid = ?',
+                                      [(rowid,) for rowid in rowids])
+            deleted_count += len(rowids)
+
+            if len(rowids) < chunk_size:
+                break
+        else:
+            backlog = max_chunks > 0
+
+        if vacuum_pages:
+            # executescript steps the pragma to completion; execute() would
+            # only release a single page
+            self.conn.executescript(f'PRAGMA incremental_vacuum({int(vacuum_pages)})')
+
+        logger.info(f"Cleaned up {deleted_count} old articles (older than {days} days)")
+        if backlog:
+            logger.info("Retention backlog remains, continuing on next run")
+        return deleted_count
+
+    def rebuild_search_index(self):
+        """Rebuild the full-text index from the articles table"""
+        with self.conn:
+            self.conn.execute("INSERT INTO articles_fts (articles_fts) VALUES ('delete-all')")
+            self.conn.execute('''
+                INSERT INTO articles_fts (rowid, title, summary)
+                SELECT rowid, fts_segment(title), fts_segment(summary) FROM articles
+            ''')
+        logger.info("Rebuilt full-text search index")
+
+    def search_articles(self, query, since=None, category=None, limit=20):
+        """
+        Full-text search over title and summary, ranked by BM25
+
+        Args:
+            query (str): Search terms (Chinese and English)
+            since (datetime): Only articles published at or after this time
+            category (str): Only articles in this category
+            limit (int): Maximum number of articles
+
+        Returns:
+            list: ArticleRow mappings (best match first), with a 'rank' field
+        """
+        match = build_search_query(query)
+        if not match:
+            return []
+
+        # Title matches weigh twice as much as summary matches
+        sql = '''
+            SELECT articles.*, bm25(articles_fts, 2.0, 1.0) AS rank
+            FROM articles_fts
+            JOIN articles ON articles.rowid = articles_fts.rowid
+            WHERE articles_fts MATCH ?
+        '''
+        params = [match]
+
+        if since is not None:
+            sql += ' AND articles.published >= ?'
+            params.append(to_epoch(since))
+
+        if category:
+            sql += ' AND articles.category = ?'
+            params.append(category)
+
+        sql += ' ORDER BY rank LIMIT ?'
+        params.append(limit)
+
+        articles = self._query_articles(sql, params)
+        logger.info(f"Search '{query}': {len(articles)} articles")
+        return articles
+
+    def _window_counts(self, cutoff):
+        """
+        Article counts by category and by source for published >= cutoff
+
+        Whole hours come from article_rollup; only the partial hour at the
+        start of the window is counted from the articles table.
+        """
+        first_bucket = cutoff - cutoff % ROLLUP_BUCKET_SECONDS
+        if first_bucket < cutoff:
+            first_bucket += ROLLUP_BUCKET_SECONDS
+
+        cursor = self.conn.cursor()
+        categories = {}
+        sources = {}
 
         cursor.execute('''
-            DELETE FROM articles
-            WHERE created_at < ?
-        ''', (cutoff_str,))
+            SELECT category, source, SUM(count) AS count
+            FROM article_rollup
+            WHERE bucket >= ?
+            GROUP BY category, source
+        ''', (first_bucket,))
+        rows = cursor.fetchall()
 
-        deleted_count = cursor.rowcount
-        self.conn.commit()
+        cursor.execute('''
+            SELECT COALESCE(category, '') AS category, COALESCE(source, '') AS source,
+                   COUNT(*) AS count
+            FROM articles
+            WHERE published >= ? AND published < ?
+            GROUP BY 1, 2
+        ''', (cutoff, first_bucket))
+        rows += cursor.fetchall()
 
-        logger.info(f"Cleaned up {deleted_count} old articles (older than {days} days)")
-        return deleted_count
+        for row in rows:
+            categories[row['category']] = categories.get(row['category'], 0) + row['count']
+            sources[row['source']] = sources.get(row['source'], 0) + row['count']
+
+        return categories, sources
 
     def get_stats(self):
         """
-        Get database statistics
+        Get database statistics from the rollup and totals tables
 
         Returns:
             dict: Statistics dictionary
@@ -248,37 +820,16 @@ class ArticleDatabase:
         cursor = self.conn.cursor()
 
         # Total articles
-        cursor.execute('SELECT COUNT(*) as count FROM articles')
+        cursor.execute('SELECT count FROM article_totals WHERE id = 1')
         total = cursor.fetchone()['count']
 
-        # Today's articles
-        cutoff = (datetime.now() - timedelta(hours=24)).isoformat()
-        cursor.execute('''
-            SELECT COUNT(*) as count FROM articles
-            WHERE published >= ?
-        ''', (cutoff,))
-        today = cursor.fetchone()['count']
-
-        # Articles by category
-        cursor.execute('''
-            SELECT category, COUNT(*) as count
-            FROM articles
-            WHERE published >= ?
-            GROUP BY category
-            ORDER BY count DESC
-        ''', (cutoff,))
-        categories = {row['category']: row['count'] for row in cursor.fetchall()}
+        # Today's articles by category and source
+        cutoff = to_epoch(datetime.now() - timedelta(hours=24))
+        categories, sources = self._window_counts(cutoff)
+        today = sum(categories.values())
 
-        # Top sources
-        cursor.execute('''
-            SELECT source, COUNT(*) as count
-            FROM articles
-            WHERE published >= ?
-            GROUP BY source
-            ORDER BY count DESC
-            LIMIT 10
-        ''', (cutoff,))
-        sources = {row['source']: row['count'] for row in cursor.fetchall()}
+        categories = dict(sorted(categories.items(), key=lambda x: x[1], reverse=True))
+        sources = dict(sorted(sources.items(), key=lambda x: x[1], reverse=True)[:10])
 
         return {
             'total_articles': total,
@@ -287,6 +838,129 @@ class ArticleDatabase:
             'top_sources': sources
         }
 
+    def get_source_activity(self, days=14):
+        """
+        Recent publish activity per source, from the rollup table
+
+        Args:
+            days (int): Window length
+
+        Returns:
+            dict: Source -> (article count, epoch of the earliest hour bucket)
+        """
+        now = to_epoch(datetime.now())
+        cursor = self.conn.cursor()
+
+        cursor.execute('''
+            SELECT source, SUM(count) AS count, MIN(bucket) AS first_bucket
+            FROM article_rollup
+            WHERE bucket >= ? AND bucket <= ?
+            GROUP BY source
+        ''', (now - days * 86400, now))
+
+        return {row['source']: (row['count'], row['first_bucket']) for row in cursor.fetchall()}
+
+    def add_subscription(self, channel, target, name=None, categories=None, top_n=10,
+                         secret=None):
+        """
+        Add a push subscriber, or update the one with the same channel and target
+
+        Args:
+            channel (str): Push channel key (feishu, wechat_work, dingtalk,
+                telegram, email)
+            target (str): Webhook URL, Telegram chat ID or email address
+            name (str): Display name
+            categories (list): Categories to include (None for all)
+            top_n (int): Articles per digest
+            secret (str): DingTalk signing secret or Telegram bot token
+
+        Returns:
+            int: Subscription ID
+        """
+        with self.conn:
+            self.conn.execute('''
+                INSERT INTO subscriptions (name, channel, target, secret, categories, top_n)
+                VALUES (?, ?, ?, ?, ?, ?)
+                ON CONFLICT(channel, target) DO UPDATE SET
+                    name = excluded.name, secret = excluded.secret,
+                    categories = excluded.categories, top_n = excluded.top_n, enabled = 1
+            ''', (name, channel, target, secret,
+                  json.dumps(list(categories), ensure_ascii=False) if categories else None, top_n))
+
+        row = self.conn.execute('SELECT id FROM subscriptions WHERE channel = ? AND target = ?',
+                                (channel, target)).fetchone()
+        return row['id']
+
+    def remove_subscription(self, subscription_id):
+        """
+        Delete a push subscriber
+
+        Returns:
+            bool: Whether it existed
+        """
+        with self.conn:
+            cursor = self.conn.execute('DELETE FROM subscriptions WHERE id = ?', (subscription_id,))
+        return cursor.rowcount > 0
+
+    def get_subscriptions(self, enabled_only=True):
+        """
+        Push subscribers
+
+        Args:
+            enabled_only (bool): Skip disabled subscriptions
+
+        Returns:
+            list: Dicts with the subscription columns; categories decoded
+                to a list (None for all)
+        """
+        sql = 'SELECT * FROM subscriptions'
+        if enabled_only:
+            sql += ' WHERE enabled = 1'
+        sql += ' ORDER BY id'
+
+        subscriptions = []
+        for row in self.conn.execute(sql):
+            subscription = dict(row)
+            if subscription['categories']:
+                subscription['categories'] = json.loads(subscription['categories'])
+            subscriptions.append(subscription)
+        return subscriptions
+
+    def rebuild_rollup(self):
+        """
+        Recompute article_rollup and the running total from the articles table
+
+        Returns:
+            int: Number of rollup rows that were missing, stale or extra
+        """
+        cursor = self.conn.cursor()
+
+        cursor.execute(f'''
+            SELECT COALESCE(published, 0) - COALESCE(published, 0) % {ROLLUP_BUCKET_SECONDS},
+                   COALESCE(category, ''), COALESCE(source, ''), COUNT(*)
+            FROM articles
+            GROUP BY 1, 2, 3
+        ''')
+        expected = {tuple(row[:3]): row[3] for row in cursor.fetchall()}
+
+        cursor.execute('SELECT bucket, category, source, count FROM article_rollup')
+        actual = {tuple(row[:3]): row[3] for row in cursor.fetchall()}
+
+        mismatched = sum(1 for key in expected.keys() | actual.keys()
+                         if expected.get(key) != actual.get(key))
+
+        with self.conn:
+            self.conn.execute('DELETE FROM article_rollup')
+            self.conn.executemany(
+                'INSERT INTO article_rollup (bucket, category, source, count) VALUES (?, ?, ?, ?)',
+                [key + (count,) for key, count in expected.items()]
+            )
+            self.conn.execute('UPDATE article_totals SET count = ? WHERE id = 1',
+                              (sum(expected.values()),))
+
+        logger.info(f"Rebuilt statistics rollup: {len(expected)} rows, {mismatched} mismatched")
+        return mismatched
+
     def close(self):
         """Close database connection"""
         if self.conn:
@@ -0,0 +1,222 @@
+#!/usr/bin/env python3
+"""
+Near-Duplicate Detection Module
+MinHash signatures with LSH banding for sub-quadratic title deduplication
+"""
+
+import re
+import random
+import hashlib
+import logging
+from array import array
+
+logger = logging.getLogger(__name__)
+
+# Same tokenization as calculate_title_similarity in process.py
+WORD_PATTERN = re.compile(r'\w+')
+
+# 20 bands x 3 rows: a pair at Jaccard 0.7 collides in at least one band
+# with probability 1 - (1 - 0.7**3)**20 ≈ 0.9998
+DEFAULT_NUM_PERM = 60
+DEFAULT_BANDS = 20
+
+_MERSENNE_PRIME = (1 << 61) - 1
+_MAX_HASH = (1 << 32) - 1
+
+
+def tokenize_title(title):
+    """
+    Tokenize a title into its lowercase word set
+
+    Args:
+        title (str): Article title
+
+    Returns:
+        frozenset: Set of word tokens
+    """
+    return frozenset(WORD_PATTERN.findall(title.lower()))
+
+
+def jaccard_similarity(tokens1, tokens2):
+    """
+    Exact Jaccard similarity between two token sets
+
+    Args:
+        tokens1 (frozenset): First token set
+        tokens2 (frozenset): Second token set
+
+    Returns:
+        float: Similarity score (0-1)
+    """
+    if not tokens1 or not tokens2:
+        return 0.0
+
+    intersection = len(tokens1 & tokens2)
+    return intersection / (len(tokens1) + len(tokens2) - intersection)
+
+
+def token_hash(token):
+    """Stable 64-bit hash of a token (independent of PYTHONHASHSEED)"""
+    digest = hashlib.blake2b(token.encode('utf-8'), digest_size=8).digest()
+    return int.from_bytes(digest, 'little')
+
+
+class MinHashLSH:
+    """
+    MinHash/LSH index over token sets
+
+    Candidates are found by band collisions and then verified with exact
+    Jaccard similarity, so results never contain false positives.
+    """
+
+    def __init__(self, threshold=0.7, num_perm=DEFAULT_NUM_PERM,
+                 bands=DEFAULT_BANDS, seed=1):
+        """
+        Initialize an empty index
+
+        Args:
+            threshold (float): Jaccard threshold for a match (0-1)
+            num_perm (int): Number of MinHash permutations
+            bands (int): Number of LSH bands (must divide num_perm)
+            seed (int): Seed for the permutation coefficients
+        """
+        if num_perm % bands != 0:
+            raise ValueError(f"num_perm ({num_perm}) must be divisible by bands ({bands})")
+
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+
+        rng = random.Random(seed)
+        self._perms = [
+            (rng.randint(1, _MERSENNE_PRIME - 1), rng.randint(0, _MERSENNE_PRIME - 1))
+            for _ in range(num_perm)
+        ]
+
+        self._token_cache = {}  # token -> array of permuted hashes
+        self._buckets = {}      # (band, band_signature) -> set of keys
+        self._entries = {}      # key -> (tokens, band_keys)
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def signature(self, tokens):
+        """
+        Compute the MinHash signature of a token set
+
+        Args:
+            tokens (frozenset): Token set
+
+        Returns:
+            tuple: Signature of length num_perm (empty if no tokens)
+        """
+        cache = self._token_cache
+        vectors = []
+
+        for token in tokens:
+            vector = cache.get(token)
+            if vector is None:
+                h = token_hash(token)
+                vector = array('Q', (((a * h + b) % _MERSENNE_PRIME) & _MAX_HASH
+                                     for a, b in self._perms))
+                cache[token] = vector
+            vectors.append(vector)
+
+        return tuple(map(min, zip(*vectors)))
+
+    def _band_keys(self, signature):
+        rows = self.rows
+        return [(band, signature[band * rows:(band + 1) * rows])
+                for band in range(self.bands)]
+
+    def band_hashes(self, signature):
+        """
+        Stable signed 64-bit hash of each band, for persistent storage
+
+        Args:
+            signature (tuple): MinHash signature
+
+        Returns:
+            list: One integer per band (empty if signature is empty)
+        """
+        if not signature:
+            return []
+
+        hashes = []
+        for band, band_signature in self._band_keys(signature):
+            payload = band.to_bytes(2, 'little') + array('Q', band_signature).tobytes()
+            digest = hashlib.blake2b(payload, digest_size=8).digest()
+            hashes.append(int.from_bytes(digest, 'little', signed=True))
+        return hashes
+
+    def insert(self, key, tokens, signature=None):
+        """
+        Add a token set to the index
+
+        Args:
+            key: Hashable identifier
+            tokens (frozenset): Token set
+            signature (tuple): Precomputed signature (optional)
+        """
+        if key in self._entries:
+            self.remove(key)
+
+        if not tokens:
+            # An empty title is never similar to anything
+            self._entries[key] = (tokens, [])
+            return
+
+        if signature is None:
+            signature = self.signature(tokens)
+
+        band_keys = self._band_keys(signature)
+        for band_key in band_keys:
+            self._buckets.setdefault(band_key, set()).add(key)
+
+        self._entries[key] = (tokens, band_keys)
+
+    def remove(self, key):
+        """Remove a key from the index (no-op if absent)"""
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+
+        for band_key in entry[1]:
+            bucket = self._buckets.get(band_key)
+            if bucket is not None:
+                bucket.discard(key)
+                if not bucket:
+                    del self._buckets[band_key]
+
+    def query(self, tokens, signature=None):
+        """
+        Find indexed keys whose Jaccard similarity reaches the threshold
+
+        Args:
+            tokens (frozenset): Token set to look up
+            signature (tuple): Precomputed signature (optional)
+
+        Returns:
+            list: Matching keys
+        """
+        if not tokens or not self._buckets:
+            return []
+
+        if signature is None:
+            signature = self.signature(tokens)
+
+        candidates = set()
+        for band_key in self._band_keys(signature):
+            bucket = self._buckets.get(band_key)
+            if bucket:
+                candidates.update(bucket)
+
+        entries = self._entries
+        return [
+            key for key in candidates
+            if jaccard_similarity(tokens, entries[key][0]) >= self.threshold
+        ]
@@ -0,0 +1,305 @@
+#!/usr/bin/env python3
+"""
+Digest Rendering Module
+Renders each article of a push digest once per markup, then assembles
+channel payloads from the cached fragments, split at platform size limits
+"""
+
+import json
+import time
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from datetime import datetime
+
+logger = logging.getLogger(__name__)
+
+TITLE = "AI Today's Top News"
+SUMMARY_LENGTH = 150
+
+# Markup and size limit per channel; units are 'bytes' (UTF-8) or 'chars'.
+# Feishu's limit is on the whole card request, so leave room for the card.
+CHANNEL_FORMATS = {
+    'Feishu': {'markup': 'lark', 'limit': 28000, 'unit': 'bytes'},
+    'WeChatWork': {'markup': 'markdown', 'limit': 4096, 'unit': 'bytes'},
+    'DingTalk': {'markup': 'markdown', 'limit': 20000, 'unit': 'bytes'},
+    'Telegram': {'markup': 'telegram', 'limit': 4096, 'unit': 'chars'},
+    'Email': {'markup': 'markdown', 'limit': None, 'unit': 'chars'},
+}
+
+CACHE_ENTRIES = 8
+CACHE_TTL = 600   # seconds; "N hours ago" strings go stale after that
+
+
+def _age(published, now):
+    """Human-readable time since publication"""
+    if published.tzinfo is not None:
+        published = published.replace(tzinfo=None)
+    age_hours = (now - published).total_seconds() / 3600
+    if age_hours < 1:
+        return f"{int(age_hours * 60)} min ago"
+    if age_hours < 24:
+        return f"{int(age_hours)} hours ago"
+    return f"{int(age_hours / 24)} days ago"
+
+
+def _summary(article):
+    summary = article.get('summary', '') or ''
+    if len(summary) > SUMMARY_LENGTH:
+        summary = summary[:SUMMARY_LENGTH] + "..."
+    return summary
+
+
+def _escape_telegram(text):
+    """Escape Telegram (legacy) Markdown control characters"""
+    for char in ('\\', '_', '*', '`', '['):
+        text = text.replace(char, '\\' + char)
+    return text
+
+
+def _render_markdown(article, rank, now):
+    emoji = "🔥" if rank <= 3 else "📰"
+    return (
+        f"## {emoji} Top {rank}: {article['title']}\n\n"
+        f"**Source**: {article['source']} | "
+        f"**Category**: {article['category']} | "
+        f"**Score**: {article['score']:.1f}\n\n"
+        f"**Published**: {_age(article['published'], now)}\n\n"
+        f"{_summary(article)}\n\n"
+        f"[Read More]({article['link']})\n\n"
+        "---\n\n"
+    )
+
+
+def _render_lark(article, rank, now):
+    # Feishu card markdown has no headings
+    emoji = "🔥" if rank <= 3 else "📰"
+    return (
+        f"**{emoji} Top {rank}: {article['title']}**\n"
+        f"{article['source']} | {article['category']} | "
+        f"{article['score']:.1f} | {_age(article['published'], now)}\n"
+        f"{_summary(article)}\n"
+        f"[Read More]({article['link']})\n\n"
+    )
+
+
+def _render_telegram(article, rank, now):
+    emoji = "🔥" if rank <= 3 else "📰"
+    return (
+        f"{emoji} *Top {rank}:* {_escape_telegram(article['title'])}\n"
+        f"_{_escape_telegram(article['source'])}_ | {_escape_telegram(article['category'])} | "
+        f"{article['score']:.1f} | {_age(article['published'], now)}\n"
+        f"{_escape_telegram(_summary(article))}\n"
+        f"[Read More]({article['link']})\n\n"
+    )
+
+
+def _header_markdown(count, now):
+    return (
+        f"# 🤖 {TITLE}\n\n"
+        f"**Date**: {now.strftime('%Y-%m-%d %H:%M')}\n"
+        f"**Articles**: {count}\n\n"
+        "---\n\n"
+    )
+
+
+def _header_lark(count, now):
+    # The card header already carries the title
+    return f"**Date**: {now.strftime('%Y-%m-%d %H:%M')} | **Articles**: {count}\n\n"
+
+
+def _header_telegram(count, now):
+    return f"🤖 *{TITLE}*\n{now.strftime('%Y-%m-%d %H:%M')} | {count} articles\n\n"
+
+
+RENDERERS = {
+    'markdown': (_header_markdown, _render_markdown),
+    'lark': (_header_lark, _render_lark),
+    'telegram': (_header_telegram, _render_telegram),
+}
+
+
+def _size(text, unit):
+    return len(text.encode('utf-8')) if unit == 'bytes' else len(text)
+
+
+def _truncate(text, limit, unit):
+    """Cut text to fit the limit (never splitting a UTF-8 sequence)"""
+    if _size(text, unit) <= limit:
+        return text
+    if unit == 'bytes':
+        return text.encode('utf-8')[:limit - 3].decode('utf-8', errors='ignore') + '...'
+    return text[:limit - 3] + '...'
+
+
+def split_message(header, fragments, limit, unit='chars'):
+    """
+    Pack fragments into as few messages as fit the limit
+
+    The header opens the first message; a fragment never spans two
+    messages (one that alone exceeds the limit is truncated).
+
+    Args:
+        header (str): Text at the start of the first message
+        fragments (list): Article fragments, in order
+        limit (int): Maximum message size (None for no limit)
+        unit (str): 'bytes' (UTF-8) or 'chars'
+
+    Returns:
+        list: Message texts
+    """
+    if limit is None:
+        return [header + ''.join(fragments)]
+
+    messages = []
+    current, size = [header], _size(header, unit)
+    for fragment in fragments:
+        fragment_size = _size(fragment, unit)
+        if fragment_size > limit:
+            # Oversized: truncate into the current message if it has room
+            room = limit - size if limit - size >= limit // 2 else limit
+            fragment = _truncate(fragment, room, unit)
+            fragment_size = _size(fragment, unit)
+        if size + fragment_size > limit and size > 0:
+            messages.append(''.join(current))
+            current, size = [], 0
+        current.append(fragment)
+        size += fragment_size
+
+    if current and size:
+        messages.append(''.join(current))
+    return messages
+
+
+def digest_key(articles):
+    """Cache key identifying an ordered article set and its displayed fields"""
+    fingerprint = json.dumps([
+        (article.get('id'), article.get('title'), article.get('link'),
+         article.get('category'), round(article.get('score') or 0, 1))
+        for article in articles
+    ], ensure_ascii=False)
+    return hashlib.sha1(fingerprint.encode('utf-8')).hexdigest()
+
+
+class Digest:
+    """
+    One rendered digest
+
+    Each article is rendered at most once per markup; channel payloads
+    are assembled from those fragments on first use and cached, so the
+    same digest sent to many webhooks or chats is rendered once.
+    """
+
+    def __init__(self, articles, now=None):
+        """
+        Args:
+            articles (list): Articles in display order
+            now (datetime): Render time for dates and ages (default: now)
+        """
+        self.articles = list(articles)
+        self.now = now or datetime.now()
+        self.key = digest_key(self.articles)
+        self._fragments = {}   # markup -> [fragment]
+        self._parts = {}       # channel -> [message]
+        self._lock = threading.Lock()
+
+    def fragments(self, markup):
+        """Per-article fragments in a markup ('markdown', 'lark', 'telegram')"""
+        with self._lock:
+            if markup not in self._fragments:
+                _, render = RENDERERS[markup]
+                self._fragments[markup] = [
+                    render(article, rank, self.now)
+                    for rank, article in enumerate(self.articles, 1)
+                ]
+            return self._fragments[markup]
+
+    def header(self, markup):
+        header, _ = RENDERERS[markup]
+        return header(len(self.articles), self.now)
+
+    def text(self, markup='markdown'):
+        """The whole digest as one text, unsplit"""
+        return self.header(markup) + ''.join(self.fragments(markup))
+
+    def parts(self, channel):
+        """
+        Payload texts for a channel, split at its size limit
+
+        Args:
+            channel (str): Channel name (see CHANNEL_FORMATS)
+
+        Returns:
+            list: Message texts, in sending order
+        """
+        with self._lock:
+            if channel in self._parts:
+                return self._parts[channel]
+
+        spec = CHANNEL_FORMATS.get(channel, CHANNEL_FORMATS['Email'])
+        parts = split_message(self.header(spec['markup']), self.fragments(spec['markup']),
+                              spec['limit'], spec['unit'])
+        if len(parts) > 1:
+            logger.info(f"{channel} digest split into {len(parts)} messages")
+
+        with self._lock:
+            self._parts[channel] = parts
+        return parts
+
+
+class DigestCache:
+    """Recently rendered digests, keyed on the article set"""
+
+    def __init__(self, max_entries=CACHE_ENTRIES, ttl=CACHE_TTL):
+        """
+        Args:
+            max_entries (int): Digests kept (least recently used dropped)
+            ttl (float): Seconds a digest is reused before re-rendering
+        """
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries = OrderedDict()   # key -> (created monotonic, Digest)
+        self._lock = threading.Lock()
+
+    def get(self, articles):
+        """
+        Digest for an article set (rendered on first request)
+
+        Args:
+            articles (list): Articles in display order
+
+        Returns:
+            Digest: Cached or newly created digest
+        """
+        key = digest_key(articles)
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and now - entry[0] < self.ttl:
+                self._entries.move_to_end(key)
+                return entry[1]
+
+            digest = Digest(articles)
+            self._entries[key] = (now, digest)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+            return digest
+
+
+_cache = DigestCache()
+
+
+def render_digest(articles, count=10):
+    """
+    Digest of the top `count` articles, from the shared cache
+
+    Args:
+        articles (list): Articles ranked best first
+        count (int): Number of articles to include
+
+    Returns:
+        Digest: Rendered digest
+    """
+    return _cache.get(articles[:count])
@@ -5,20 +5,272 @@ Fetches articles from configured RSS sources
 """
 
 import feedparser
+import requests
+import asyncio
 import hashlib
+import json
+import threading
+import time
 from datetime import datetime
+from pathlib import Path
+from urllib.parse import urlsplit
 from concurrent.futures import ThreadPoolExecutor, as_completed
 import logging
 
+import instrument
+
 logger = logging.getLogger(__name__)
 
+try:
+    import httpx
+    # Per-source results are logged below; skip httpx's per-request lines
+    logging.getLogger('httpx').setLevel(logging.WARNING)
+except ImportError:
+    httpx = None
+
+try:
+    import h2  # noqa: F401  (enables HTTP/2 in httpx)
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+FETCH_TIMEOUT = 30      # seconds per source
+FETCH_DEADLINE = 120    # seconds for a whole async fetch run
+MAX_CONNECTIONS = 50    # pooled connections across all hosts
+PER_HOST_LIMIT = 4      # concurrent requests per host
+MAX_FEED_BYTES = 10 * 1024 * 1024
+USER_AGENT = 'Mozilla/5.0 (compatible; AI-News-Skill/1.0; +feedparser)'
+
+
+class FeedCache:
+    """
+    Per-source HTTP validators and high-water marks, stored as a JSON file
+
+    For each feed URL it keeps the ETag / Last-Modified validators of the
+    last 200 response, its size, the newest entry timestamp seen, the
+    error of the last fetch if it failed, and cumulative hit/miss/error/
+    bytes-saved counters.
+    """
+
+    def __init__(self, path):
+        """
+        Load cache file (missing or unreadable files start empty)
+
+        Args:
+            path (str): Path to JSON cache file
+        """
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self._entries = {}
+
+        if self.path.exists():
+            try:
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    self._entries = json.load(f)
+            except (OSError, ValueError) as e:
+                logger.warning(f"Ignoring unreadable feed cache {self.path}: {e}")
+
+    def get(self, url):
+        """Return a copy of the cache entry for a feed URL"""
+        with self._lock:
+            return dict(self._entries.get(url, {}))
+
+    def record_hit(self, url):
+        """
+        Record a 304 Not Modified response
+
+        Returns:
+            int: Bytes saved (size of the last full response)
+        """
+        with self._lock:
+            entry = self._entries.setdefault(url, {})
+            saved = entry.get('size', 0)
+            entry.pop('last_error', None)
+            entry['hits'] = entry.get('hits', 0) + 1
+            entry['bytes_saved'] = entry.get('bytes_saved', 0) + saved
+            return saved
+
+    def record_miss(self, url, etag, last_modified, size, high_water):
+        """Record a full 200 response and its validators"""
+        with self._lock:
+            entry = self._entries.setdefault(url, {})
+            entry['etag'] = etag
+            entry['last_modified'] = last_modified
+            entry['size'] = size
+            entry.pop('last_error', None)
+            entry['misses'] = entry.get('misses', 0) + 1
+            if high_water is not None:
+                entry['high_water'] = max(high_water, entry.get('high_water', high_water))
+
+    def discard(self, url, error):
+        """
+        Forget a feed's validators and high-water mark after its articles
+        could not be stored, so the next fetch is a full one
+        """
+        with self._lock:
+            entry = self._entries.setdefault(url, {})
+            for key in ('etag', 'last_modified', 'high_water'):
+                entry.pop(key, None)
+            entry['last_error'] = str(error) or type(error).__name__
+            entry['errors'] = entry.get('errors', 0) + 1
+
+    def record_error(self, url, error):
+        """Record a failed fetch (validators are kept)"""
+        with self._lock:
+            entry = self._entries.setdefault(url, {})
+            entry['last_error'] = str(error) or type(error).__name__
+            entry['errors'] = entry.get('errors', 0) + 1
+
+    def save(self, path=None):
+        """
+        Write cache file atomically
+
+        Args:
+            path (str): Write here instead of the file it was loaded from
+        """
+        path = Path(path) if path else self.path
+        with self._lock:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_suffix('.tmp')
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(self._entries, f, ensure_ascii=False, indent=2)
+            tmp_path.replace(path)
+
+
+def _conditional_headers(cached):
+    """Request headers carrying the cached ETag / Last-Modified validators"""
+    headers = {'User-Agent': USER_AGENT}
+    if cached.get('etag'):
+        headers['If-None-Match'] = cached['etag']
+    if cached.get('last_modified'):
+        headers['If-Modified-Since'] = cached['last_modified']
+    return headers
+
+
+def _not_modified(source_config, cache):
+    """Handle a 304 response: count the cache hit and return no articles"""
+    saved = cache.record_hit(source_config['url']) if cache else 0
+    instrument.record('sources', source_config['name'], status='not_modified', saved_bytes=saved)
+    logger.info(f"[{source_config['name']}] cache hit (304 Not Modified), saved {saved} bytes")
+    return []
+
+
+def _parse_feed_response(source_config, content, headers, cached=None):
+    """
+    Parse a full feed response into articles
+
+    Does not touch the validator cache, so it can run in a worker thread
+    whose result may be discarded (deadline, cancellation); the caller
+    applies the returned update with _apply_feed_update once the articles
+    are actually used.
+
+    Args:
+        source_config (dict): Source configuration with url, name, etc.
+        content (bytes): Response body
+        headers (dict): Response headers with lowercase names
+        cached (dict): Cache entry read before the request
+
+    Returns:
+        tuple: (articles, update) where update holds the new validators,
+            high-water mark and parse statistics
+    """
+    name = source_config['name']
+    cached = cached or {}
+    start = time.perf_counter()
+
+    feed = feedparser.parse(content, response_headers=headers)
+
+    if feed.bozo:
+        logger.warning(f"RSS parse warning for {name}: {feed.bozo_exception}")
+
+    high_water = cached.get('high_water')
+    newest = None
+    skipped = 0
 
-def fetch_rss_source(source_config):
+    articles = []
+    for entry in feed.entries:
+        # Generate unique ID from URL
+        article_id = hashlib.md5(entry.link.encode()).hexdigest()
+
+        # Parse published time
+        published = None
+        if hasattr(entry, 'published_parsed') and entry.published_parsed:
+            try:
+                published = datetime(*entry.published_parsed[:6])
+            except:
+                pass
+
+        if published:
+            published_ts = published.timestamp()
+            newest = published_ts if newest is None else max(newest, published_ts)
+            # Older than anything seen last time: already processed
+            if high_water is not None and published_ts < high_water:
+                skipped += 1
+                continue
+
+        if not published:
+            published = datetime.now()
+
+        article = {
+            'id': article_id,
+            'title': entry.get('title', 'No Title'),
+            'link': entry.link,
+            'published': published,
+            'summary': entry.get('summary', entry.get('description', '')),
+            'source': source_config['name'],
+            'source_category': source_config.get('category', 'unknown'),
+            'authority_score': source_config.get('authority_score', 20),
+            'fetch_time': datetime.now()
+        }
+
+        articles.append(article)
+
+    update = {
+        'etag': headers.get('etag'),
+        'last_modified': headers.get('last-modified'),
+        'size': len(content),
+        'high_water': newest,
+        'skipped': skipped,
+        'entries': len(feed.entries),
+        'parse': time.perf_counter() - start,
+    }
+    return articles, update
+
+
+def _apply_feed_update(source_config, cache, articles, update):
+    """Store a parsed response's validators and high-water mark, and record it"""
+    name = source_config['name']
+    if cache:
+        cache.record_miss(source_config['url'], update['etag'], update['last_modified'],
+                          update['size'], update['high_water'])
+        logger.info(f"[{name}] cache miss, {update['size']} bytes, "
+                    f"{update['skipped']} entries below high-water mark")
+
+    instrument.record('sources', name, status='ok', parse=update['parse'], bytes=update['size'],
+                      entries=update['entries'], items=len(articles))
+    logger.info(f"Fetched {len(articles)} articles from {name}")
+    return articles
+
+
+def _record_error(source_config, cache, error):
+    """Note a failed fetch in the validator cache and the run report"""
+    if cache and 'url' in source_config:
+        cache.record_error(source_config['url'], error)
+    instrument.record('sources', source_config.get('name', 'unknown'), status='error',
+                      error=str(error))
+
+
+def fetch_rss_source(source_config, cache=None):
     """
     Fetch articles from a single RSS source
 
+    With a FeedCache, the request carries If-None-Match / If-Modified-Since
+    validators, a 304 response returns no articles, and entries published
+    before the source's high-water mark are skipped.
+
     Args:
         source_config (dict): Source configuration with url, name, etc.
+        cache (FeedCache): Optional validator cache
 
     Returns:
         list: List of article dictionaries
@@ -27,65 +279,273 @@ def fetch_rss_source(source_config):
         url = source_config['url']
         logger.info(f"Fetching RSS from: {source_config['name']}")
 
-        feed = feedparser.parse(url)
-
-        if feed.bozo:
-            logger.warning(f"RSS parse warning for {source_config['name']}: {feed.bozo_exception}")
+        cached = cache.get(url) if cache else {}
+        start = time.perf_counter()
+        response = requests.get(url, headers=_conditional_headers(cached),
+                                timeout=source_config.get('timeout', FETCH_TIMEOUT))
+        instrument.record('sources', source_config['name'], download=time.perf_counter() - start)
 
-        articles = []
-        for entry in feed.entries:
-            # Generate unique ID from URL
-            article_id = hashlib.md5(entry.link.encode()).hexdigest()
-
-            # Parse published time
-            published = None
-            if hasattr(entry, 'published_parsed') and entry.published_parsed:
-                try:
-                    published = datetime(*entry.published_parsed[:6])
-                except:
-                    pass
+        if response.status_code == 304:
+            return _not_modified(source_config, cache)
 
-            if not published:
-                published = datetime.now()
+        response.raise_for_status()
+        # feedparser looks up response headers by lowercase name
+        headers = {k.lower(): v for k, v in response.headers.items()}
+        articles, update = _parse_feed_response(source_config, response.content, headers, cached)
+        return _apply_feed_update(source_config, cache, articles, update)
 
-            article = {
-                'id': article_id,
-                'title': entry.get('title', 'No Title'),
-                'link': entry.link,
-                'published': published,
-                'summary': entry.get('summary', entry.get('description', '')),
-                'source': source_config['name'],
-                'source_category': source_config.get('category', 'unknown'),
-                'authority_score': source_config.get('authority_score', 20),
-                'fetch_time': datetime.now()
-            }
+    except Exception as e:
+        logger.error(f"Error fetching {source_config.get('name', 'unknown')}: {e}")
+        _record_error(source_config, cache, e)
+        return []
 
-            articles.append(article)
 
-        logger.info(f"Fetched {len(articles)} articles from {source_config['name']}")
-        return articles
+async def _fetch_rss_source_async(client, source_config, host_limits, cache=None):
+    """
+    Fetch one source through the shared async client
 
+    The body is streamed with a size cap, and parsing runs in the default
+    executor so it overlaps with downloads still in flight.
+    """
+    try:
+        url = source_config['url']
+        cached = cache.get(url) if cache else {}
+        limiter = host_limits[urlsplit(url).netloc]
+
+        async def download():
+            logger.info(f"Fetching RSS from: {source_config['name']}")
+            async with client.stream('GET', url, headers=_conditional_headers(cached)) as response:
+                if response.status_code == 304:
+                    return None, None
+
+                response.raise_for_status()
+                chunks = []
+                size = 0
+                async for chunk in response.aiter_bytes():
+                    size += len(chunk)
+                    if size > MAX_FEED_BYTES:
+                        raise ValueError(f"feed larger than {MAX_FEED_BYTES} bytes")
+                    chunks.append(chunk)
+
+                return b''.join(chunks), {k.lower(): v for k, v in response.headers.items()}
+
+        # The timeout starts once the per-host slot is held, so time spent
+        # queued behind other feeds on the same host doesn't count against it
+        async with limiter:
+            start = time.perf_counter()
+            content, headers = await asyncio.wait_for(
+                download(), timeout=source_config.get('timeout', FETCH_TIMEOUT)
+            )
+            instrument.record('sources', source_config['name'], download=time.perf_counter() - start)
+
+        if content is None:
+            return _not_modified(source_config, cache)
+
+        # A cancelled task never gets past the await, so the worker's result
+        # (and its validators) is dropped and the next run refetches
+        loop = asyncio.get_running_loop()
+        articles, update = await loop.run_in_executor(
+            None, _parse_feed_response, source_config, content, headers, cached
+        )
+        return _apply_feed_update(source_config, cache, articles, update)
+
+    except asyncio.TimeoutError:
+        logger.error(f"Timeout fetching {source_config.get('name', 'unknown')}")
+        _record_error(source_config, cache, 'timeout')
+        return []
     except Exception as e:
         logger.error(f"Error fetching {source_config.get('name', 'unknown')}: {e}")
+        _record_error(source_config, cache, e)
+        return []
+
+
+def _make_client(max_connections=MAX_CONNECTIONS):
+    """Pooled async HTTP client (HTTP/2 when h2 is installed)"""
+    limits = httpx.Limits(max_connections=max_connections,
+                          max_keepalive_connections=max_connections)
+    return httpx.AsyncClient(http2=HTTP2_AVAILABLE, limits=limits,
+                             timeout=httpx.Timeout(FETCH_TIMEOUT),
+                             follow_redirects=True)
+
+
+async def fetch_all_sources_async(sources_list, cache=None, max_connections=MAX_CONNECTIONS,
+                                  per_host_limit=PER_HOST_LIMIT, deadline=FETCH_DEADLINE,
+                                  client=None, on_batch=None):
+    """
+    Fetch articles from all sources concurrently over one pooled client
+
+    Args:
+        sources_list (list): List of source configurations
+        cache (FeedCache): Optional validator cache
+        max_connections (int): Connection pool size across all hosts
+        per_host_limit (int): Concurrent requests per host (scheme://host:port)
+        deadline (float): Seconds before unfinished sources are cancelled
+        client (httpx.AsyncClient): Client to reuse (left open); a new one
+            is created and closed when omitted
+        on_batch (callable): Called with each source's articles as soon as
+            that source finishes (on the event loop thread)
+
+    Returns:
+        list: Combined list of all articles, in source order
+    """
+    if httpx is None:
+        raise RuntimeError("httpx is required for async fetching (pip install httpx)")
+
+    if client is None:
+        async with _make_client(max_connections) as client:
+            return await fetch_all_sources_async(sources_list, cache, max_connections,
+                                                 per_host_limit, deadline, client, on_batch)
+
+    host_limits = {}
+    for source in sources_list:
+        host = urlsplit(source['url']).netloc
+        host_limits.setdefault(host, asyncio.Semaphore(per_host_limit))
+
+    tasks = [
+        asyncio.create_task(_fetch_rss_source_async(client, source, host_limits, cache))
+        for source in sources_list
+    ]
+    if not tasks:
         return []
 
+    loop = asyncio.get_running_loop()
+    stop_at = loop.time() + deadline
+    done, pending = set(), set(tasks)
+    while pending and loop.time() < stop_at:
+        finished, pending = await asyncio.wait(pending, timeout=stop_at - loop.time(),
+                                               return_when=asyncio.FIRST_COMPLETED)
+        done |= finished
+        if on_batch:
+            for task in finished:
+                _deliver_batch(on_batch, task.result())
+
+    for task, source in zip(tasks, sources_list):
+        if task in pending:
+            task.cancel()
+            _record_error(source, cache, 'deadline exceeded')
+    if pending:
+        logger.warning(f"Fetch deadline of {deadline}s reached, cancelled {len(pending)} sources")
+        await asyncio.gather(*pending, return_exceptions=True)
+
+    all_articles = []
+    for task in tasks:
+        if task in done:
+            all_articles.extend(task.result())
+
+    return all_articles
+
 
-def fetch_all_sources(sources_list, max_workers=10):
+class AsyncFetcher:
+    """
+    Event loop and pooled HTTP client kept open across fetch runs
+
+    For long-running processes: connections stay alive between runs
+    instead of being re-established every time. Not thread-safe; use it
+    from one thread at a time.
+    """
+
+    def __init__(self, max_connections=MAX_CONNECTIONS, per_host_limit=PER_HOST_LIMIT,
+                 deadline=FETCH_DEADLINE):
+        """
+        Create the event loop (the client is opened on first use)
+
+        Args:
+            max_connections (int): Connection pool size across all hosts
+            per_host_limit (int): Concurrent requests per host
+            deadline (float): Seconds before unfinished sources are cancelled
+        """
+        if httpx is None:
+            raise RuntimeError("httpx is required for async fetching (pip install httpx)")
+
+        self.max_connections = max_connections
+        self.per_host_limit = per_host_limit
+        self.deadline = deadline
+        self._loop = asyncio.new_event_loop()
+        self._client = None
+
+    def fetch(self, sources_list, cache=None, on_batch=None):
+        """
+        Fetch articles from all sources over the shared client
+
+        Args:
+            sources_list (list): List of source configurations
+            cache (FeedCache): Optional validator cache
+            on_batch (callable): Called with each source's articles as they arrive
+
+        Returns:
+            list: Combined list of all articles, in source order
+        """
+        if self._client is None:
+            self._client = _make_client(self.max_connections)
+
+        return self._loop.run_until_complete(fetch_all_sources_async(
+            sources_list, cache, self.max_connections, self.per_host_limit,
+            self.deadline, client=self._client, on_batch=on_batch
+        ))
+
+    def close(self):
+        """Close the client and event loop"""
+        if self._client is not None:
+            self._loop.run_until_complete(self._client.aclose())
+            self._client = None
+        self._loop.close()
+
+
+def _deliver_batch(on_batch, articles):
+    """Hand one source's articles to the consumer; its errors don't stop the fetch"""
+    if not articles:
+        return
+    try:
+        on_batch(articles)
+    except Exception as e:
+        logger.error(f"Error handling batch from {articles[0].get('source', 'unknown')}: {e}",
+                     exc_info=True)
+
+
+def _event_loop_running():
+    try:
+        asyncio.get_running_loop()
+        return True
+    except RuntimeError:
+        return False
+
+
+def fetch_all_sources(sources_list, max_workers=10, cache=None, use_async=True, fetcher=None,
+                      on_batch=None):
     """
     Fetch articles from all sources in parallel
 
+    Uses the asyncio engine when httpx is installed, otherwise (or when
+    called from inside a running event loop) a thread pool.
+
     Args:
         sources_list (list): List of source configurations
-        max_workers (int): Maximum number of parallel workers
+        max_workers (int): Maximum number of parallel workers (thread pool)
+        cache (FeedCache): Optional validator cache shared by all workers
+        use_async (bool): Prefer the asyncio engine when available
+        fetcher (AsyncFetcher): Long-lived fetcher to reuse (async engine)
+        on_batch (callable): Called with each source's articles as soon as
+            that source finishes, on the calling thread
 
     Returns:
         list: Combined list of all articles
     """
+    if fetcher is not None:
+        all_articles = fetcher.fetch(sources_list, cache, on_batch)
+        logger.info(f"Total articles fetched: {len(all_articles)}")
+        return all_articles
+
+    if use_async and httpx is not None and not _event_loop_running():
+        all_articles = asyncio.run(fetch_all_sources_async(sources_list, cache=cache,
+                                                           on_batch=on_batch))
+        logger.info(f"Total articles fetched: {len(all_articles)}")
+        return all_articles
+
     all_articles = []
 
     with ThreadPoolExecutor(max_workers=max_workers) as executor:
         future_to_source = {
-            executor.submit(fetch_rss_source, source): source
+            executor.submit(fetch_rss_source, source, cache): source
             for source in sources_list
         }
 
@@ -94,6 +554,8 @@ def fetch_all_sources(sources_list, max_workers=10):
             try:
                 articles = future.result()
                 all_articles.extend(articles)
+                if on_batch:
+                    _deliver_batch(on_batch, articles)
             except Exception as e:
                 logger.error(f"Exception for {source.get('name', 'unknown')}: {e}")
 
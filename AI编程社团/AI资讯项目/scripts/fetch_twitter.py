@@ -1,17 +1,77 @@
 #!/usr/bin/env python3
 """
 Twitter/X Scraping Module
-Scrapes tweets from Twitter/X using Playwright
+Scrapes tweets from Twitter/X using Playwright, one browser shared by
+parallel per-account contexts
 """
 
+import re
+import json
+import asyncio
 import hashlib
 import logging
 import random
 from datetime import datetime, timedelta
 from pathlib import Path
 
+try:
+    from playwright.async_api import async_playwright, TimeoutError as PlaywrightTimeoutError
+except ImportError:
+    async_playwright = None
+    PlaywrightTimeoutError = TimeoutError
+
 logger = logging.getLogger(__name__)
 
+TWITTER_BASE_URL = 'https://twitter.com'
+USER_AGENT = ('Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 '
+              '(KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36')
+DEFAULT_CONCURRENCY = 4       # parallel browser contexts
+STAGGER_SECONDS = 1.0         # random start delay per account, so requests don't burst
+PAGE_TIMEOUT = 30000          # ms
+SELECTOR_TIMEOUT = 10000      # ms to wait for the first tweet
+SCROLL_TIMEOUT = 3000         # ms to wait for new tweets after a scroll
+NETWORK_IDLE_TIMEOUT = 2000   # ms
+BLOCKED_RESOURCE_TYPES = frozenset(('image', 'font', 'media'))
+
+STATUS_ID_PATTERN = re.compile(r'/status/(\d+)')
+
+# In-page parse of every rendered tweet not in `skip` (hrefs), in one round-trip.
+# `context` is the social-context line above pinned tweets and retweets
+# ("Pinned", "... reposted"), which sit out of chronological order
+EXTRACT_TWEETS_JS = """
+skip => {
+    const seen = new Set(skip);
+    const tweets = [];
+    for (const article of document.querySelectorAll('article')) {
+        const link = article.querySelector('a[href*="/status/"]');
+        const href = link && link.getAttribute('href');
+        if (!href || seen.has(href)) continue;
+        const text = article.querySelector('div[data-testid="tweetText"]');
+        const time = article.querySelector('time');
+        const context = article.querySelector('[data-testid="socialContext"]');
+        tweets.push({
+            href: href,
+            text: text ? text.innerText : null,
+            datetime: time ? time.getAttribute('datetime') : null,
+            context: context ? context.innerText : null,
+        });
+    }
+    return tweets;
+}
+"""
+
+# True once a tweet not in `skip` is rendered (the timeline is virtualized,
+# so the article count alone does not grow reliably)
+HAS_NEW_TWEETS_JS = """
+skip => {
+    const seen = new Set(skip);
+    return [...document.querySelectorAll('article')].some(article => {
+        const link = article.querySelector('a[href*="/status/"]');
+        return link && !seen.has(link.getAttribute('href'));
+    });
+}
+"""
+
 # Twitter accounts to scrape (high-value AI accounts)
 TWITTER_ACCOUNTS = [
     {'username': 'OpenAI', 'name': 'OpenAI', 'authority_score': 30},
@@ -27,361 +87,402 @@ TWITTER_ACCOUNTS = [
 ]
 
 
-def get_browser():
-    """Get Playwright browser instance"""
-    try:
-        from playwright.sync_api import sync_playwright
-        playwright = sync_playwright().start()
-        browser = playwright.chromium.launch(headless=True)
-        return browser, playwright
-    except ImportError:
-        logger.error("Playwright not installed. Run: pip install playwright && playwright install chromium")
-        return None, None
-    except Exception as e:
-        logger.error(f"Failed to launch browser: {e}")
-        return None, None
+class TimelineState:
+    """
+    Per-account high-water marks, stored as a JSON file
+
+    For each username it keeps the newest status ID scraped and that
+    tweet's timestamp, so the next scrape stops at already-seen content.
+    """
 
+    def __init__(self, path):
+        """
+        Load state file (missing or unreadable files start empty)
 
-def parse_tweet_date(date_str):
-    """Parse Twitter date format to datetime"""
+        Args:
+            path (str): Path to JSON state file
+        """
+        self.path = Path(path)
+        self._entries = {}
+
+        if self.path.exists():
+            try:
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    self._entries = json.load(f)
+            except (OSError, ValueError) as e:
+                logger.warning(f"Ignoring unreadable timeline state {self.path}: {e}")
+
+    def high_water(self, username):
+        """Newest status ID seen for an account (0 if never scraped)"""
+        return int(self._entries.get(username, {}).get('status_id', 0))
+
+    def record(self, username, status_id, published=None):
+        """Advance an account's high-water mark (never moves it back)"""
+        if status_id <= self.high_water(username):
+            return
+        self._entries[username] = {
+            'status_id': str(status_id),
+            'published': published.isoformat() if published else None,
+        }
+
+    def discard(self, username):
+        """Forget an account's high-water mark (its tweets were not stored)"""
+        self._entries.pop(username, None)
+
+    def save(self, path=None):
+        """
+        Write state file atomically
+
+        Args:
+            path (str): Write here instead of the file it was loaded from
+        """
+        path = Path(path) if path else self.path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix('.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self._entries, f, ensure_ascii=False, indent=2)
+        tmp_path.replace(path)
+
+
+def _status_id(href):
+    """Numeric status ID from a tweet link (None if it has none)"""
+    match = STATUS_ID_PATTERN.search(href or '')
+    return int(match.group(1)) if match else None
+
+
+def _parse_tweet_time(datetime_str):
+    """Datetime from a <time datetime> attribute (None if missing or invalid)"""
+    if not datetime_str:
+        return None
     try:
-        # Twitter format: "12:30 PM · Mar 17, 2026"
-        from dateutil import parser
-        return parser.parse(date_str)
-    except:
-        return datetime.now()
+        return datetime.fromisoformat(datetime_str.replace('Z', '+00:00'))
+    except ValueError:
+        return None
 
 
-def scrape_twitter_user(username, authority_score, max_tweets=20):
+def _tweet_article(username, authority_score, text, href, datetime_str,
+                   max_age_hours, base_url=TWITTER_BASE_URL):
     """
-    Scrape tweets from a single Twitter user
-
-    Args:
-        username: Twitter username (without @)
-        authority_score: Authority score for this source
-        max_tweets: Maximum number of tweets to fetch
+    Build an article from the parts of one rendered tweet
 
     Returns:
-        list: List of tweet articles
+        dict: Article, or None if the tweet is incomplete or too old
     """
-    browser, playwright = get_browser()
-    if not browser:
-        return []
-
-    articles = []
-    try:
-        context = browser.contexts[0]
-        page = context.new_page()
+    if not text or not href:
+        return None
+
+    title = text[:200]  # Limit title length
+    link = href if href.startswith('http') else f"{base_url}{href}"
+    published = _parse_tweet_time(datetime_str) or datetime.now()
+
+    # Only include recent tweets
+    if (datetime.now() - published.replace(tzinfo=None)) > timedelta(hours=max_age_hours):
+        return None
+
+    return {
+        'id': hashlib.md5(link.encode()).hexdigest(),
+        'title': f"@{username}: {title}",
+        'link': link,
+        'published': published,
+        'summary': title,
+        'source': f"Twitter @{username}",
+        'source_category': 'social_media',
+        'authority_score': authority_score,
+        'fetch_time': datetime.now()
+    }
+
+
+async def _block_heavy_resources(route):
+    """Abort images, fonts and media; tweets only need the DOM"""
+    if route.request.resource_type in BLOCKED_RESOURCE_TYPES:
+        await route.abort()
+    else:
+        await route.continue_()
+
+
+class TwitterScraperPool:
+    """
+    Scrape several accounts in parallel with a single browser
 
-        # Construct the URL - Twitter now uses /with_replies for full timeline
-        url = f"https://twitter.com/{username}"
+    One Chromium is launched for the pool; each account gets its own
+    isolated browser context (cookies, cache), and at most `concurrency`
+    contexts are open at once. With a TimelineState, each timeline is read
+    only down to the newest tweet of the previous scrape. Use as an async
+    context manager.
+    """
 
-        logger.info(f"Scraping Twitter: @{username}")
+    def __init__(self, concurrency=DEFAULT_CONCURRENCY, base_url=TWITTER_BASE_URL,
+                 stagger=STAGGER_SECONDS, headless=True, state=None):
+        """
+        Args:
+            concurrency (int): Accounts scraped at the same time
+            base_url (str): Site to scrape (a fixture server in benchmarks)
+            stagger (float): Max random delay before each account starts
+            headless (bool): Run the browser headless
+            state (TimelineState): Per-account high-water marks (optional)
+        """
+        self.concurrency = concurrency
+        self.base_url = base_url.rstrip('/')
+        self.stagger = stagger
+        self.headless = headless
+        self.state = state
+        self._semaphore = asyncio.Semaphore(concurrency)
+        self._playwright = None
+        self._browser = None
+
+    async def __aenter__(self):
+        self._playwright = await async_playwright().start()
+        try:
+            self._browser = await self._playwright.chromium.launch(headless=self.headless)
+        except Exception:
+            await self._playwright.stop()
+            raise
+        return self
+
+    async def __aexit__(self, *exc_info):
+        if self._browser:
+            await self._browser.close()
+        if self._playwright:
+            await self._playwright.stop()
+
+    async def _wait_for_new(self, page, collected):
+        """
+        Wait until a tweet not in `collected` (hrefs) is rendered
+
+        Returns:
+            bool: Whether new tweets appeared
+        """
+        skip = list(collected)
+        try:
+            await page.wait_for_function(HAS_NEW_TWEETS_JS, arg=skip, timeout=SCROLL_TIMEOUT)
+            return True
+        except PlaywrightTimeoutError:
+            pass
+
+        # Timeline requests may still be in flight; give them until the network settles
+        try:
+            await page.wait_for_load_state('networkidle', timeout=NETWORK_IDLE_TIMEOUT)
+        except PlaywrightTimeoutError:
+            pass
+        return await page.evaluate(HAS_NEW_TWEETS_JS, skip)
+
+    async def _read_timeline(self, page, high_water, max_tweets, scrolls):
+        """
+        Collect rendered tweets newer than `high_water`, scrolling for more
+
+        Scrolling stops once max_tweets new tweets are collected, the
+        timeline reaches a tweet at or below the high-water mark, or no new
+        tweets load. Pinned tweets and retweets (marked by a social-context
+        line) are out of chronological order, so they never count as
+        reaching seen content; neither does the first tweet on the page, in
+        case the marker is not rendered.
+
+        Returns:
+            list: Raw tweets (href, text, datetime, status_id), newest first
+        """
+        collected = {}  # href -> raw tweet
+        fresh = 0
+
+        for scroll in range(scrolls + 1):
+            batch = await page.evaluate(EXTRACT_TWEETS_JS, list(collected))
+            reached_seen = False
+            for tweet in batch:
+                tweet['status_id'] = _status_id(tweet['href'])
+                position = len(collected)
+                collected[tweet['href']] = tweet
+                if tweet['status_id'] is None:
+                    continue
+                if tweet['status_id'] > high_water:
+                    fresh += 1
+                elif position > 0 and not tweet.get('context'):
+                    reached_seen = True
+
+            if reached_seen or fresh >= max_tweets or scroll == scrolls:
+                break
+            await page.mouse.wheel(0, 1000)
+            if not await self._wait_for_new(page, collected):
+                break
+
+        tweets = [
+            tweet for tweet in collected.values()
+            if tweet['status_id'] is not None and tweet['status_id'] > high_water
+        ]
+        tweets.sort(key=lambda tweet: tweet['status_id'], reverse=True)
+        return tweets[:max_tweets]
+
+    async def scrape_account(self, account, max_tweets=10, max_age_hours=48, scrolls=2):
+        """
+        Scrape one account in its own browser context
+
+        Args:
+            account (dict): Entry with 'username' and 'authority_score'
+            max_tweets (int): Maximum tweets to read from the timeline
+            max_age_hours (float): Skip tweets older than this
+            scrolls (int): Maximum scrolls to load more tweets
+
+        Returns:
+            list: Tweet articles (empty on failure)
+        """
+        username = account['username']
+        authority_score = account['authority_score']
+
+        async with self._semaphore:
+            if self.stagger:
+                await asyncio.sleep(random.uniform(0, self.stagger))
+
+            context = await self._browser.new_context(
+                viewport={'width': 1280, 'height': 720},
+                user_agent=USER_AGENT,
+                extra_http_headers={'Accept-Language': 'en-US,en;q=0.9'},
+            )
+            articles = []
+            try:
+                await context.route('**/*', _block_heavy_resources)
+                page = await context.new_page()
 
-        # Set extra HTTP headers to mimic real browser
-        page.set_extra_http_headers({
-            'Accept-Language': 'en-US,en;q=0.9',
-            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
-        })
+                logger.info(f"Scraping Twitter: @{username}")
+                await page.goto(f"{self.base_url}/{username}",
+                                wait_until='domcontentloaded', timeout=PAGE_TIMEOUT)
 
-        page.goto(url, wait_until='domcontentloaded', timeout=30000)
+                try:
+                    await page.wait_for_selector('article', timeout=SELECTOR_TIMEOUT)
+                except PlaywrightTimeoutError:
+                    logger.warning(f"No tweets found for @{username}")
+                    return []
 
-        # Wait for tweets to load
-        page.wait_for_selector('article', timeout=10000)
+                high_water = self.state.high_water(username) if self.state else 0
+                tweets = await self._read_timeline(page, high_water, max_tweets, scrolls)
 
-        # Scroll to load more tweets
-        for _ in range(3):
-            page.mouse.wheel(0, 500)
-            page.wait_for_timeout(1000)
+                for tweet in tweets:
+                    article = _tweet_article(
+                        username, authority_score, tweet['text'], tweet['href'],
+                        tweet['datetime'], max_age_hours, self.base_url
+                    )
+                    if article:
+                        articles.append(article)
 
-        # Extract tweets
-        tweets = page.query_selector_all('article')
+                if self.state and tweets:
+                    self.state.record(username, tweets[0]['status_id'],
+                                      _parse_tweet_time(tweets[0]['datetime']))
 
-        for tweet in tweets[:max_tweets]:
-            try:
-                # Get tweet text
-                text_elem = tweet.query_selector('div[data-testid="tweetText"]')
-                if not text_elem:
-                    continue
-                title = text_elem.inner_text()[:200]  # Limit title length
-
-                # Get tweet link
-                link_elem = tweet.query_selector('a[href*="/status/"]')
-                if not link_elem:
-                    continue
-                link = link_elem.get_attribute('href')
-                if not link.startswith('http'):
-                    link = f"https://twitter.com{link}"
-
-                # Get timestamp
-                time_elem = tweet.query_selector('time')
-                if time_elem:
-                    datetime_str = time_elem.get_attribute('datetime')
-                    try:
-                        published = datetime.fromisoformat(datetime_str.replace('Z', '+00:00'))
-                    except:
-                        published = datetime.now()
-                else:
-                    published = datetime.now()
-
-                # Only include recent tweets (within 24 hours)
-                if (datetime.now() - published.replace(tzinfo=None)) > timedelta(hours=24):
-                    continue
-
-                article_id = hashlib.md5(link.encode()).hexdigest()
-
-                article = {
-                    'id': article_id,
-                    'title': f"@{username}: {title}",
-                    'link': link,
-                    'published': published,
-                    'summary': title,
-                    'source': f"Twitter @{username}",
-                    'source_category': 'social_media',
-                    'authority_score': authority_score,
-                    'fetch_time': datetime.now()
-                }
-                articles.append(article)
+                logger.info(f"Fetched {len(articles)} tweets from @{username} "
+                            f"({len(tweets)} new since last scrape)")
 
             except Exception as e:
-                logger.debug(f"Error parsing tweet: {e}")
-                continue
+                logger.error(f"Error scraping @{username}: {e}")
 
-        logger.info(f"Fetched {len(articles)} tweets from @{username}")
+            finally:
+                await context.close()
 
-    except Exception as e:
-        logger.error(f"Error scraping @{username}: {e}")
+            return articles
 
-    finally:
-        if playwright:
-            playwright.stop()
+    async def scrape_accounts(self, accounts, **kwargs):
+        """
+        Scrape accounts in parallel (bounded by the pool's concurrency)
 
-    return articles
+        Args:
+            accounts (list): Entries with 'username' and 'authority_score'
+            **kwargs: Passed to scrape_account
 
+        Returns:
+            list: Combined tweet articles, in account order
+        """
+        results = await asyncio.gather(*(
+            self.scrape_account(account, **kwargs) for account in accounts
+        ))
+        return [article for articles in results for article in articles]
 
-def scrape_all_twitter_accounts(max_tweets_per_account=10):
+
+def scrape_twitter_accounts(accounts=None, max_tweets=10, max_age_hours=48, scrolls=2,
+                            concurrency=DEFAULT_CONCURRENCY, base_url=TWITTER_BASE_URL,
+                            stagger=STAGGER_SECONDS, state=None):
     """
-    Scrape tweets from all configured Twitter accounts
+    Scrape accounts with a TwitterScraperPool (blocking)
 
     Args:
-        max_tweets_per_account: Maximum tweets per account
+        accounts (list): Entries with 'username' and 'authority_score'
+            (default: TWITTER_ACCOUNTS)
+        max_tweets (int): Maximum tweets per account
+        max_age_hours (float): Skip tweets older than this
+        scrolls (int): Maximum scrolls per timeline
+        concurrency (int): Accounts scraped at the same time
+        base_url (str): Site to scrape
+        stagger (float): Max random delay before each account starts
+        state (TimelineState): Per-account high-water marks; only tweets
+            newer than them are returned, and they are advanced in place
 
     Returns:
         list: Combined list of tweet articles
     """
-    all_articles = []
-
-    # Import here to avoid dependency issues if not needed
-    try:
-        from playwright.sync_api import sync_playwright
-    except ImportError:
+    if async_playwright is None:
         logger.error("Playwright not installed. Run: pip install playwright && playwright install chromium")
         return []
 
-    playwright = None
-    browser = None
+    accounts = TWITTER_ACCOUNTS if accounts is None else accounts
 
-    try:
-        playwright = sync_playwright().start()
-        browser = playwright.chromium.launch(headless=True)
-        context = browser.contexts[0]
-
-        for account in TWITTER_ACCOUNTS:
-            username = account['username']
-            authority_score = account['authority_score']
-
-            try:
-                page = context.new_page()
-
-                url = f"https://twitter.com/{username}"
-                logger.info(f"Scraping Twitter: @{username}")
+    async def run():
+        async with TwitterScraperPool(concurrency, base_url, stagger, state=state) as pool:
+            return await pool.scrape_accounts(
+                accounts, max_tweets=max_tweets,
+                max_age_hours=max_age_hours, scrolls=scrolls
+            )
 
-                page.set_extra_http_headers({
-                    'Accept-Language': 'en-US,en;q=0.9',
-                    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
-                })
-
-                page.goto(url, wait_until='domcontentloaded', timeout=30000)
-                page.wait_for_selector('article', timeout=10000)
-
-                # Scroll to load more tweets
-                for _ in range(2):
-                    page.mouse.wheel(0, 300)
-                    page.wait_for_timeout(800)
-
-                tweets = page.query_selector_all('article')
-
-                for tweet in tweets[:max_tweets_per_account]:
-                    try:
-                        text_elem = tweet.query_selector('div[data-testid="tweetText"]')
-                        if not text_elem:
-                            continue
-                        title = text_elem.inner_text()[:200]
-
-                        link_elem = tweet.query_selector('a[href*="/status/"]')
-                        if not link_elem:
-                            continue
-                        link = link_elem.get_attribute('href')
-                        if not link.startswith('http'):
-                            link = f"https://twitter.com{link}"
-
-                        time_elem = tweet.query_selector('time')
-                        if time_elem:
-                            datetime_str = time_elem.get_attribute('datetime')
-                            try:
-                                published = datetime.fromisoformat(datetime_str.replace('Z', '+00:00'))
-                            except:
-                                published = datetime.now()
-                        else:
-                            published = datetime.now()
-
-                        # Only include recent tweets
-                        if (datetime.now() - published.replace(tzinfo=None)) > timedelta(hours=48):
-                            continue
-
-                        article_id = hashlib.md5(link.encode()).hexdigest()
-
-                        article = {
-                            'id': article_id,
-                            'title': f"@{username}: {title}",
-                            'link': link,
-                            'published': published,
-                            'summary': title,
-                            'source': f"Twitter @{username}",
-                            'source_category': 'social_media',
-                            'authority_score': authority_score,
-                            'fetch_time': datetime.now()
-                        }
-                        all_articles.append(article)
-
-                    except Exception as e:
-                        continue
-
-                logger.info(f"Fetched tweets from @{username}")
-                page.close()
-
-                # Random delay between accounts
-                import time
-                time.sleep(random.uniform(1, 3))
-
-            except Exception as e:
-                logger.error(f"Error scraping @{username}: {e}")
-                continue
-
-    finally:
-        if browser:
-            browser.close()
-        if playwright:
-            playwright.stop()
+    try:
+        articles = asyncio.run(run())
+    except Exception as e:
+        logger.error(f"Failed to launch browser: {e}")
+        return []
 
-    logger.info(f"Total tweets fetched: {len(all_articles)}")
-    return all_articles
+    logger.info(f"Total tweets fetched: {len(articles)}")
+    return articles
 
 
-def scrape_twitter_with_context():
-    """
-    Alternative approach: create a new context explicitly
-    Returns list of articles
+def scrape_twitter_user(username, authority_score, max_tweets=20):
     """
-    from playwright.sync_api import sync_playwright
-
-    all_articles = []
+    Scrape tweets from a single Twitter user
 
-    with sync_playwright() as p:
-        browser = p.chromium.launch(headless=True)
-        # Create explicit context with viewport
-        context = browser.new_context(
-            viewport={'width': 1280, 'height': 720},
-            user_agent='Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
-        )
+    Args:
+        username: Twitter username (without @)
+        authority_score: Authority score for this source
+        max_tweets: Maximum number of tweets to fetch
 
-        for account in TWITTER_ACCOUNTS:
-            username = account['username']
-            authority_score = account['authority_score']
+    Returns:
+        list: List of tweet articles
+    """
+    account = {'username': username, 'authority_score': authority_score}
+    return scrape_twitter_accounts([account], max_tweets=max_tweets,
+                                   max_age_hours=24, scrolls=3, stagger=0)
 
-            try:
-                page = context.new_page()
 
-                url = f"https://twitter.com/{username}"
-                logger.info(f"Scraping Twitter: @{username}")
+def scrape_all_twitter_accounts(max_tweets_per_account=10):
+    """
+    Scrape tweets from all configured Twitter accounts
 
-                page.goto(url, wait_until='domcontentloaded', timeout=30000)
+    Args:
+        max_tweets_per_account: Maximum tweets per account
 
-                # Try to wait for article element
-                try:
-                    page.wait_for_selector('article', timeout=10000)
-                except:
-                    logger.warning(f"No tweets found for @{username}")
-                    page.close()
-                    continue
+    Returns:
+        list: Combined list of tweet articles
+    """
+    return scrape_twitter_accounts(max_tweets=max_tweets_per_account)
 
-                # Scroll to load more
-                for _ in range(2):
-                    page.mouse.wheel(0, 300)
-                    page.wait_for_timeout(800)
-
-                tweets = page.query_selector_all('article')
-
-                for tweet in tweets[:10]:
-                    try:
-                        text_elem = tweet.query_selector('div[data-testid="tweetText"]')
-                        if not text_elem:
-                            continue
-                        title = text_elem.inner_text()[:200]
-
-                        link_elem = tweet.query_selector('a[href*="/status/"]')
-                        if not link_elem:
-                            continue
-                        link = link_elem.get_attribute('href')
-                        if not link.startswith('http'):
-                            link = f"https://twitter.com{link}"
-
-                        time_elem = tweet.query_selector('time')
-                        if time_elem:
-                            datetime_str = time_elem.get_attribute('datetime')
-                            try:
-                                published = datetime.fromisoformat(datetime_str.replace('Z', '+00:00'))
-                            except:
-                                published = datetime.now()
-                        else:
-                            published = datetime.now()
-
-                        # Only include recent tweets (48 hours)
-                        if (datetime.now() - published.replace(tzinfo=None)) > timedelta(hours=48):
-                            continue
-
-                        article_id = hashlib.md5(link.encode()).hexdigest()
-
-                        article = {
-                            'id': article_id,
-                            'title': f"@{username}: {title}",
-                            'link': link,
-                            'published': published,
-                            'summary': title,
-                            'source': f"Twitter @{username}",
-                            'source_category': 'social_media',
-                            'authority_score': authority_score,
-                            'fetch_time': datetime.now()
-                        }
-                        all_articles.append(article)
-
-                    except Exception as e:
-                        continue
-
-                logger.info(f"Fetched from @{username}")
-                page.close()
-
-                import time
-                time.sleep(random.uniform(1, 2))
 
-            except Exception as e:
-                logger.error(f"Error scraping @{username}: {e}")
-                continue
+def scrape_twitter_with_context(max_tweets=10, concurrency=DEFAULT_CONCURRENCY, state=None,
+                                accounts=None):
+    """
+    Scrape configured accounts in parallel browser contexts
 
-        context.close()
-        browser.close()
+    Args:
+        max_tweets: Maximum tweets per account
+        concurrency: Accounts scraped at the same time
+        state: TimelineState for incremental scraping (optional)
+        accounts: Entries to scrape (default: all of TWITTER_ACCOUNTS)
 
-    return all_articles
+    Returns:
+        list: Combined list of tweet articles
+    """
+    return scrape_twitter_accounts(accounts, max_tweets=max_tweets, concurrency=concurrency,
+                                   state=state)
 
 
 if __name__ == '__main__':
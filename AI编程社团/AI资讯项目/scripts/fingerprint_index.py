@@ -0,0 +1,236 @@
+#!/usr/bin/env python3
+"""
+Fingerprint Index Module
+Persistent URL hashes and title shingles of already stored articles,
+so repeated updates only process new content
+"""
+
+import sqlite3
+import hashlib
+import logging
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from dedup import MinHashLSH, tokenize_title, jaccard_similarity
+
+logger = logging.getLogger(__name__)
+
+# SQLite limits the number of host parameters per statement
+QUERY_CHUNK_SIZE = 500
+
+
+def url_hash(url):
+    """MD5 of an article URL (same scheme as article ids in fetch_rss.py)"""
+    return hashlib.md5(url.encode()).hexdigest()
+
+
+def _chunks(items, size=QUERY_CHUNK_SIZE):
+    items = list(items)
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+class FingerprintIndex:
+    """SQLite-backed index of seen article URLs and title band hashes"""
+
+    def __init__(self, db_path, threshold=0.7):
+        """
+        Initialize index connection
+
+        Args:
+            db_path (str): Path to SQLite index file
+            threshold (float): Title similarity threshold (0-1)
+        """
+        self.db_path = db_path
+        self.conn = None
+        self.lsh = MinHashLSH(threshold=threshold)
+        self.init_index()
+
+    def init_index(self):
+        """Create index file and tables if they don't exist"""
+        Path(self.db_path).parent.mkdir(parents=True, exist_ok=True)
+
+        self.conn = sqlite3.connect(self.db_path)
+        cursor = self.conn.cursor()
+
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS fingerprints (
+                url_hash TEXT PRIMARY KEY,
+                tokens TEXT NOT NULL,
+                created_at TIMESTAMP NOT NULL
+            )
+        ''')
+
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS title_bands (
+                band_hash INTEGER NOT NULL,
+                url_hash TEXT NOT NULL
+            )
+        ''')
+
+        cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_band_hash
+            ON title_bands(band_hash)
+        ''')
+
+        cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_band_url_hash
+            ON title_bands(url_hash)
+        ''')
+
+        cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_fingerprint_created_at
+            ON fingerprints(created_at)
+        ''')
+
+        self.conn.commit()
+
+    def __len__(self):
+        return self.conn.execute('SELECT COUNT(*) FROM fingerprints').fetchone()[0]
+
+    def _seen_urls(self, hashes):
+        seen = set()
+        for chunk in _chunks(hashes):
+            placeholders = ','.join('?' * len(chunk))
+            rows = self.conn.execute(
+                f'SELECT url_hash FROM fingerprints WHERE url_hash IN ({placeholders})',
+                chunk
+            )
+            seen.update(row[0] for row in rows)
+        return seen
+
+    def _band_candidates(self, band_hashes):
+        candidates = {}
+        for chunk in _chunks(band_hashes):
+            placeholders = ','.join('?' * len(chunk))
+            rows = self.conn.execute(
+                f'SELECT band_hash, url_hash FROM title_bands WHERE band_hash IN ({placeholders})',
+                chunk
+            )
+            for band, key in rows:
+                candidates.setdefault(band, set()).add(key)
+        return candidates
+
+    def _stored_tokens(self, hashes):
+        tokens = {}
+        for chunk in _chunks(hashes):
+            placeholders = ','.join('?' * len(chunk))
+            rows = self.conn.execute(
+                f'SELECT url_hash, tokens FROM fingerprints WHERE url_hash IN ({placeholders})',
+                chunk
+            )
+            for key, joined in rows:
+                tokens[key] = frozenset(joined.split())
+        return tokens
+
+    def filter_new(self, articles):
+        """
+        Drop articles already stored or near-duplicates of stored titles
+
+        Args:
+            articles (list): List of article dictionaries
+
+        Returns:
+            list: Articles not yet in the index
+        """
+        hashes = [url_hash(article['link']) for article in articles]
+        seen = self._seen_urls(set(hashes))
+
+        pending = []
+        for article, key in zip(articles, hashes):
+            if key in seen:
+                continue
+            tokens = tokenize_title(article['title'])
+            bands = self.lsh.band_hashes(self.lsh.signature(tokens))
+            pending.append((article, tokens, bands))
+
+        all_bands = {band for _, _, bands in pending for band in bands}
+        band_matches = self._band_candidates(all_bands)
+        candidate_keys = set().union(*band_matches.values()) if band_matches else set()
+        stored_tokens = self._stored_tokens(candidate_keys)
+
+        new_articles = []
+        near_duplicates = 0
+        for article, tokens, bands in pending:
+            candidates = set()
+            for band in bands:
+                candidates.update(band_matches.get(band, ()))
+
+            if any(jaccard_similarity(tokens, stored_tokens[key]) >= self.lsh.threshold
+                   for key in candidates if key in stored_tokens):
+                near_duplicates += 1
+                continue
+
+            new_articles.append(article)
+
+        logger.info(f"Fingerprint index: {len(articles)} -> {len(new_articles)} articles "
+                    f"({len(articles) - len(pending)} seen, {near_duplicates} near-duplicates)")
+        return new_articles
+
+    def add_articles(self, articles):
+        """
+        Record articles in the index
+
+        Args:
+            articles (list): Article dictionaries with 'link' and 'title'
+
+        Returns:
+            int: Number of newly indexed articles
+        """
+        cursor = self.conn.cursor()
+        now_str = datetime.now().isoformat()
+        added = 0
+
+        for article in articles:
+            key = url_hash(article['link'])
+            tokens = tokenize_title(article['title'])
+
+            cursor.execute('''
+                INSERT OR IGNORE INTO fingerprints (url_hash, tokens, created_at)
+                VALUES (?, ?, ?)
+            ''', (key, ' '.join(sorted(tokens)), now_str))
+
+            if cursor.rowcount == 0:
+                continue
+
+            bands = self.lsh.band_hashes(self.lsh.signature(tokens))
+            cursor.executemany(
+                'INSERT INTO title_bands (band_hash, url_hash) VALUES (?, ?)',
+                [(band, key) for band in bands]
+            )
+            added += 1
+
+        self.conn.commit()
+        logger.info(f"Fingerprint index: added {added} articles")
+        return added
+
+    def cleanup_old_fingerprints(self, days=30):
+        """
+        Delete fingerprints older than specified days
+
+        Args:
+            days (int): Number of days to retain
+
+        Returns:
+            int: Number of deleted fingerprints
+        """
+        cursor = self.conn.cursor()
+        cutoff_str = (datetime.now() - timedelta(days=days)).isoformat()
+
+        cursor.execute('''
+            DELETE FROM title_bands WHERE url_hash IN (
+                SELECT url_hash FROM fingerprints WHERE created_at < ?
+            )
+        ''', (cutoff_str,))
+
+        cursor.execute('DELETE FROM fingerprints WHERE created_at < ?', (cutoff_str,))
+        deleted_count = cursor.rowcount
+        self.conn.commit()
+
+        logger.info(f"Cleaned up {deleted_count} old fingerprints (older than {days} days)")
+        return deleted_count
+
+    def close(self):
+        """Close index connection"""
+        if self.conn:
+            self.conn.close()
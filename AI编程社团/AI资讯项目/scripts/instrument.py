@@ -0,0 +1,360 @@
+#!/usr/bin/env python3
+"""
+Pipeline Instrumentation Module
+Records per-stage and per-source timings of a pipeline run into a JSON
+run report, and profiles runs with cProfile into collapsed stacks for
+flame graphs
+"""
+
+import os
+import json
+import time
+import pstats
+import cProfile
+import logging
+import threading
+from collections import defaultdict
+from contextlib import contextmanager
+from datetime import datetime
+from functools import wraps
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+LOG_DIR = Path(__file__).parent.parent / 'logs'
+REPORT_DIR = LOG_DIR / 'runs'
+PROFILE_DIR = LOG_DIR / 'profiles'
+REPORTS_KEPT = 100        # newest run reports kept in REPORT_DIR
+FOLDED_MIN_FRACTION = 1e-4  # call paths below this share of the run are not split further
+
+
+class RunReport:
+    """
+    Timings and counters of one pipeline run
+
+    Stages are named by pipeline step ('fetch.rss', 'process.classify',
+    'db.save', ...). A stage entered several times (once per batch in
+    streaming mode) accumulates wall time, calls and counters. Stage times
+    are inclusive, so a stage that runs inside another (processing inside
+    a streaming fetch) is also part of its parent's time. Records group
+    per-item measurements, such as each feed's download and parse time
+    under 'sources'. Safe to update from several threads.
+    """
+
+    def __init__(self, command):
+        """
+        Args:
+            command (str): Pipeline command ('update', 'push', ...)
+        """
+        self.command = command
+        self.started = datetime.now()
+        self.status = 'running'
+        self.wall = None
+        self._start = time.perf_counter()
+        self._stages = {}
+        self._records = defaultdict(dict)   # group -> key -> metrics
+        self._lock = threading.Lock()
+
+    def add_stage(self, name, seconds, counts=None):
+        """Accumulate one pass through a stage"""
+        with self._lock:
+            stage = self._stages.setdefault(name, {'seconds': 0.0, 'calls': 0})
+            stage['seconds'] += seconds
+            stage['calls'] += 1
+            for key, value in (counts or {}).items():
+                _accumulate(stage, key, value)
+
+    def record(self, group, key, **metrics):
+        """
+        Accumulate metrics for one item of a group
+
+        Numeric metrics are summed across calls; other values replace the
+        previous one.
+
+        Args:
+            group (str): Record group ('sources', 'deliveries', ...)
+            key (str): Item name within the group
+            **metrics: Values to record
+        """
+        with self._lock:
+            entry = self._records[group].setdefault(key, {})
+            for name, value in metrics.items():
+                _accumulate(entry, name, value)
+
+    def finish(self, status='ok'):
+        self.status = status
+        self.wall = time.perf_counter() - self._start
+
+    def to_dict(self):
+        """JSON-serializable report"""
+        with self._lock:
+            stages = {name: dict(stage) for name, stage in self._stages.items()}
+            records = {group: {key: dict(entry) for key, entry in items.items()}
+                       for group, items in self._records.items()}
+
+        for stage in stages.values():
+            stage['seconds'] = round(stage['seconds'], 4)
+        for items in records.values():
+            for entry in items.values():
+                for name, value in entry.items():
+                    if isinstance(value, float):
+                        entry[name] = round(value, 4)
+
+        report = {
+            'command': self.command,
+            'started': self.started.isoformat(),
+            'status': self.status,
+            'seconds': round(self.wall, 4) if self.wall is not None else None,
+            'stages': stages,
+        }
+
+        # Totals per group, so the slowest phase of e.g. fetching shows at a glance
+        for group, items in records.items():
+            totals = {}
+            for entry in items.values():
+                for name, value in entry.items():
+                    if isinstance(value, (int, float)) and not isinstance(value, bool):
+                        totals[name] = round(totals.get(name, 0) + value, 4)
+            report[group] = {'total': totals, 'items': items}
+
+        return report
+
+    def summary(self):
+        """One-line summary of the slowest stages"""
+        with self._lock:
+            stages = sorted(self._stages.items(), key=lambda item: item[1]['seconds'], reverse=True)
+        parts = [f"{name} {stage['seconds']:.2f}s" for name, stage in stages[:6]]
+        return f"{self.command} {self.status} in {self.wall or 0:.2f}s: " + ', '.join(parts)
+
+    def write(self, directory=REPORT_DIR, keep=REPORTS_KEPT):
+        """
+        Write the report as JSON and prune old reports
+
+        Args:
+            directory (Path): Report directory
+            keep (int): Newest reports to keep
+
+        Returns:
+            Path: Report file
+        """
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        path = directory / f"{self.command}-{self.started.strftime('%Y%m%d-%H%M%S-%f')}.json"
+
+        tmp_path = path.with_suffix('.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.to_dict(), f, ensure_ascii=False, indent=2)
+        tmp_path.replace(path)
+
+        reports = sorted(directory.glob('*.json'), key=os.path.getmtime)
+        for old in reports[:-keep] if keep else []:
+            try:
+                old.unlink()
+            except OSError:
+                pass
+        return path
+
+
+def _accumulate(entry, name, value):
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        entry[name] = entry.get(name, 0) + value
+    else:
+        entry[name] = value
+
+
+_active = None
+_active_lock = threading.Lock()
+
+
+@contextmanager
+def run(command, directory=REPORT_DIR):
+    """
+    Record a pipeline run and write its report when it ends
+
+    A run started while another is active joins the active one, so a
+    pipeline function that calls another instrumented function produces
+    a single report.
+
+    Args:
+        command (str): Pipeline command, used in the report file name
+        directory (Path): Report directory
+
+    Yields:
+        RunReport: The active report
+    """
+    global _active
+
+    with _active_lock:
+        outer = _active is None
+        if outer:
+            _active = RunReport(command)
+        report = _active
+
+    if not outer:
+        yield report
+        return
+
+    status = 'ok'
+    try:
+        yield report
+    except BaseException as e:
+        status = f"error: {e.__class__.__name__}"
+        raise
+    finally:
+        with _active_lock:
+            _active = None
+        report.finish(status)
+        try:
+            path = report.write(directory)
+            logger.info(f"Run report: {report.summary()} ({path})")
+        except OSError as e:
+            logger.warning(f"Could not write run report: {e}")
+
+
+def reported(command):
+    """Decorator: record each call of a pipeline function as a run"""
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            with run(command):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+@contextmanager
+def stage(name, **counts):
+    """
+    Time a pipeline stage of the active run (no-op without one)
+
+    Yields a dict; counters put into it ('items', 'bytes', ...) are added
+    to the stage when it ends.
+
+    Args:
+        name (str): Stage name
+        **counts: Initial counters
+
+    Yields:
+        dict: Counters of this pass through the stage
+    """
+    report = _active
+    if report is None:
+        yield counts
+        return
+
+    start = time.perf_counter()
+    try:
+        yield counts
+    finally:
+        report.add_stage(name, time.perf_counter() - start, counts)
+
+
+def record(group, key, **metrics):
+    """Record metrics for one item of the active run (no-op without one)"""
+    report = _active
+    if report is not None:
+        report.record(group, key, **metrics)
+
+
+def _label(func):
+    filename, lineno, name = func
+    if filename == '~':
+        label = name   # built-in, e.g. "<method 'execute' of 'sqlite3.Cursor' objects>"
+    else:
+        label = f"{name} ({os.path.basename(filename)}:{lineno})"
+    return label.replace(';', ',')
+
+
+def folded_stacks(stats, min_fraction=FOLDED_MIN_FRACTION):
+    """
+    Collapsed stacks from cProfile statistics
+
+    cProfile keeps caller/callee pairs rather than whole stacks, so each
+    function's own time is walked up its callers and split between them
+    in proportion to the time each caller spent in it (the approach of
+    flameprof and similar tools). A path stops at a function without
+    callers, at a recursive repeat, or once its share falls below
+    min_fraction of the run; all own time is kept. cProfile can lose
+    caller links around asyncio tasks, so some stacks start at a
+    coroutine rather than at the entry point.
+
+    Args:
+        stats (pstats.Stats): Profile statistics
+        min_fraction (float): Share of the total below which a path is
+            not split further
+
+    Returns:
+        dict: 'frame;frame;frame' -> microseconds of self time
+    """
+    entries = stats.stats
+    min_seconds = (stats.total_tt or 1.0) * min_fraction
+    folded = defaultdict(float)
+
+    def climb(func, path, seen, seconds):
+        path = (_label(func),) + path
+        callers = [(caller, edge) for caller, edge in entries[func][4].items()
+                   if caller not in seen and caller in entries]
+        if not callers or seconds < min_seconds:
+            folded[';'.join(path)] += seconds * 1e6
+            return
+
+        # Split by time spent per caller, or by call count when too fast to time
+        weights = [edge[3] for _, edge in callers]
+        if sum(weights) <= 0:
+            weights = [edge[1] or 1 for _, edge in callers]
+        total = sum(weights)
+        seen = seen | {func}
+        for (caller, _), weight in zip(callers, weights):
+            if weight > 0:
+                climb(caller, path, seen, seconds * weight / total)
+
+    for func, (_, _, own, _, _) in entries.items():
+        if own > 0:
+            climb(func, (), frozenset(), own)
+
+    return {stack: round(micros) for stack, micros in folded.items() if micros >= 1}
+
+
+def write_folded(stats, path, min_fraction=FOLDED_MIN_FRACTION):
+    """Write collapsed stacks, one 'stack count' line each (flamegraph.pl, speedscope)"""
+    folded = folded_stacks(stats, min_fraction)
+    with open(path, 'w', encoding='utf-8') as f:
+        for stack, micros in sorted(folded.items()):
+            f.write(f"{stack} {micros}\n")
+    return len(folded)
+
+
+def profile_call(func, name, directory=PROFILE_DIR):
+    """
+    Run a function under cProfile and save the profile
+
+    Writes <name>-<time>.prof (pstats; snakeviz, gprof2dot) and
+    <name>-<time>.folded (collapsed stacks in microseconds). Only the
+    calling thread is profiled: work handed to thread pools (feed
+    parsing, push delivery) appears as waiting, and its time is in the
+    run report instead.
+
+    Args:
+        func (callable): Function to run (no arguments)
+        name (str): Profile name, used in the file names
+        directory (Path): Output directory
+
+    Returns:
+        tuple: (pstats.Stats, .prof path, .folded path)
+    """
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    stem = f"{name}-{datetime.now().strftime('%Y%m%d-%H%M%S')}"
+
+    profiler = cProfile.Profile()
+    try:
+        profiler.runcall(func)
+    finally:
+        stats = pstats.Stats(profiler)
+        prof_path = directory / f"{stem}.prof"
+        folded_path = directory / f"{stem}.folded"
+        stats.dump_stats(str(prof_path))
+        stacks = write_folded(stats, folded_path)
+        logger.info(f"Profile written: {prof_path}, {folded_path} ({stacks} stacks)")
+
+    return stats, prof_path, folded_path
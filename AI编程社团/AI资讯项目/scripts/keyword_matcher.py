@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Keyword Matching Module
+Aho-Corasick automaton counting keyword hits for many keyword groups
+in a single pass over the text
+"""
+
+import logging
+from collections import deque
+
+logger = logging.getLogger(__name__)
+
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+
+class _PythonAutomaton:
+    """Pure-Python Aho-Corasick automaton (fallback without pyahocorasick)"""
+
+    def __init__(self, keywords):
+        self._goto = [{}]
+        self._fail = [0]
+        self._output = [()]
+
+        for keyword in keywords:
+            state = 0
+            for char in keyword:
+                next_state = self._goto[state].get(char)
+                if next_state is None:
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._output.append(())
+                    next_state = len(self._goto) - 1
+                    self._goto[state][char] = next_state
+                state = next_state
+            self._output[state] = self._output[state] + (keyword,)
+
+        # Breadth-first construction of failure links
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(char, 0)
+                self._fail[next_state] = target if target != next_state else 0
+                self._output[next_state] += self._output[self._fail[next_state]]
+
+    def iter(self, text):
+        """Yield (end_index, keyword) for every occurrence, in text order"""
+        goto, fail, output = self._goto, self._fail, self._output
+        state = 0
+
+        for index, char in enumerate(text):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            for keyword in output[state]:
+                yield index, keyword
+
+
+def _build_automaton(keywords):
+    if ahocorasick is None:
+        logger.debug("pyahocorasick not installed, using pure-Python keyword matcher")
+        return _PythonAutomaton(keywords)
+
+    automaton = ahocorasick.Automaton()
+    for keyword in keywords:
+        automaton.add_word(keyword, keyword)
+    automaton.make_automaton()
+    return automaton
+
+
+class KeywordMatcher:
+    """
+    Count keyword hits per group in one pass
+
+    A keyword scores once per listing in its group when it occurs anywhere
+    in the text, exactly like summing `kw in text` over the group's list.
+    Matching is case-sensitive; callers lowercase the text.
+    """
+
+    def __init__(self, groups):
+        """
+        Compile the matcher
+
+        Args:
+            groups (dict): Group name -> list of keywords
+        """
+        self.groups = list(groups)
+        self._keyword_groups = {}  # keyword -> {group: listings}
+
+        for group, keywords in groups.items():
+            for keyword in keywords:
+                listings = self._keyword_groups.setdefault(keyword, {})
+                listings[group] = listings.get(group, 0) + 1
+
+        self._automaton = _build_automaton(self._keyword_groups) if self._keyword_groups else None
+
+    def count(self, text, prefix_length=None):
+        """
+        Count hits per group in text and, optionally, in a text prefix
+
+        Args:
+            text (str): Text to scan
+            prefix_length (int): Also count hits fully inside text[:prefix_length]
+
+        Returns:
+            tuple: (hits, prefix_hits) dicts of group -> count;
+                prefix_hits is None when prefix_length is not given
+        """
+        hits = dict.fromkeys(self.groups, 0)
+        prefix_hits = dict.fromkeys(self.groups, 0) if prefix_length is not None else None
+
+        if self._automaton is None or not text:
+            return hits, prefix_hits
+
+        # Earliest end index of each keyword found
+        found = {}
+        for end, keyword in self._automaton.iter(text):
+            if keyword not in found:
+                found[keyword] = end
+
+        for keyword, end in found.items():
+            in_prefix = prefix_hits is not None and end < prefix_length
+            for group, listings in self._keyword_groups[keyword].items():
+                hits[group] += listings
+                if in_prefix:
+                    prefix_hits[group] += listings
+
+        return hits, prefix_hits
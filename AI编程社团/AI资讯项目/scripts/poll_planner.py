@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+Adaptive Polling Module
+Per-source poll intervals learned from publish rates, with backoff on
+errors and empty fetches
+"""
+
+import json
+import math
+import time
+import logging
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+DAY_SECONDS = 86400
+
+MIN_INTERVAL = 900           # 15 minutes
+MAX_INTERVAL = DAY_SECONDS   # 1 day
+DEFAULT_INTERVAL = 3600      # sources without history: the old hourly refresh
+REFERENCE_RATE = 4          # posts per day of a source polled exactly hourly
+REFERENCE_INTERVAL = 3600
+ERROR_BACKOFF = 2.0
+EMPTY_BACKOFF = 1.5
+EMPTY_GRACE_GAPS = 3         # silence tolerated, in mean publish gaps, before backing off
+
+
+def publish_rate(count, first_published, now, min_span=DAY_SECONDS):
+    """
+    Estimate posts per day
+
+    Args:
+        count (int): Posts published in the observed window
+        first_published (float): Epoch of the earliest of those posts
+        now (float): Epoch of the end of the window
+        min_span (float): Lower bound on the window length in seconds
+
+    Returns:
+        float: Posts per day
+    """
+    span = max(now - first_published, min_span)
+    return count * DAY_SECONDS / span
+
+
+class PollPlanner:
+    """
+    Decide which sources are due for a fetch
+
+    Poll intervals follow the square-root rule, interval ∝ 1/sqrt(rate),
+    which minimizes the mean publish-to-fetch lag for a given number of
+    requests; they are clamped to [min_interval, max_interval].
+    Consecutive errors back the interval off exponentially. Empty fetches
+    back it off more gently once a source has been silent for more than
+    EMPTY_GRACE_GAPS mean publish gaps. Any fetch with new articles resets
+    both.
+    """
+
+    def __init__(self, state_path=None, min_interval=MIN_INTERVAL,
+                 max_interval=MAX_INTERVAL, default_interval=DEFAULT_INTERVAL):
+        """
+        Load planner state
+
+        Args:
+            state_path (str): JSON state file (None keeps state in memory)
+            min_interval (float): Shortest poll interval in seconds
+            max_interval (float): Longest poll interval in seconds
+            default_interval (float): Interval for sources without history
+        """
+        self.state_path = Path(state_path) if state_path else None
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.default_interval = default_interval
+        self.rates = {}     # source -> posts per day
+        self._state = {}    # source -> {next_due, errors, empties, last_polled}
+
+        if self.state_path and self.state_path.exists():
+            try:
+                with open(self.state_path, 'r', encoding='utf-8') as f:
+                    self._state = json.load(f)
+            except (OSError, ValueError) as e:
+                logger.warning(f"Ignoring unreadable poll state {self.state_path}: {e}")
+
+    def learn_rates(self, activity, now=None):
+        """
+        Set publish rates from recent activity
+
+        Args:
+            activity (dict): Source -> (count, first_published epoch)
+            now (float): Current epoch (default: time.time())
+        """
+        now = time.time() if now is None else now
+        self.rates = {
+            source: publish_rate(count, first, now)
+            for source, (count, first) in activity.items()
+            if count
+        }
+
+    def base_interval(self, source):
+        """Poll interval from the publish rate alone, in seconds"""
+        rate = self.rates.get(source)
+        if not rate:
+            return self.default_interval
+
+        interval = REFERENCE_INTERVAL * math.sqrt(REFERENCE_RATE / rate)
+        return min(max(interval, self.min_interval), self.max_interval)
+
+    def interval(self, source):
+        """Poll interval including error and empty-fetch backoff, in seconds"""
+        state = self._state.get(source, {})
+        interval = self.base_interval(source)
+        interval *= ERROR_BACKOFF ** state.get('errors', 0)
+
+        rate = self.rates.get(source)
+        if rate:
+            silent_gaps = state.get('empties', 0) * interval * rate / DAY_SECONDS
+            interval *= EMPTY_BACKOFF ** max(int(silent_gaps - EMPTY_GRACE_GAPS), 0)
+
+        return min(interval, self.max_interval)
+
+    def due(self, sources, now=None):
+        """
+        Sources whose next poll time has passed (never-polled sources are due)
+
+        Args:
+            sources (list): Source names to consider
+            now (float): Current epoch (default: time.time())
+
+        Returns:
+            list: Due source names, in input order
+        """
+        now = time.time() if now is None else now
+        return [
+            source for source in sources
+            if self._state.get(source, {}).get('next_due', 0) <= now
+        ]
+
+    def record_poll(self, source, new_articles, error=False, now=None):
+        """
+        Record a fetch outcome and schedule the next poll
+
+        Args:
+            source (str): Source name
+            new_articles (int): Articles not seen before
+            error (bool): Whether the fetch failed
+            now (float): Current epoch (default: time.time())
+
+        Returns:
+            float: Epoch of the next poll
+        """
+        now = time.time() if now is None else now
+        state = self._state.setdefault(source, {})
+
+        if error:
+            state['errors'] = state.get('errors', 0) + 1
+        elif new_articles:
+            state['errors'] = 0
+            state['empties'] = 0
+        else:
+            state['errors'] = 0
+            state['empties'] = state.get('empties', 0) + 1
+
+        state['last_polled'] = now
+        state['next_due'] = now + self.interval(source)
+        return state['next_due']
+
+    def save(self):
+        """Write state file atomically"""
+        if not self.state_path:
+            return
+
+        self.state_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.state_path.with_suffix('.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self._state, f, ensure_ascii=False, indent=2)
+        tmp_path.replace(self.state_path)
@@ -9,6 +9,15 @@ import hashlib
 from datetime import datetime
 import logging
 
+import instrument
+from dedup import MinHashLSH, tokenize_title
+from keyword_matcher import KeywordMatcher
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
 logger = logging.getLogger(__name__)
 
 
@@ -52,6 +61,26 @@ CATEGORIES = {
     }
 }
 
+# Title keywords that add excitement points
+EXCITEMENT_KEYWORDS = [
+    'breakthrough', 'first', 'launches', 'achieves', 'new',
+    'revolutionary', 'unveils', 'announces', 'major', 'significant',
+    # 大模型关键词
+    'gpt', 'claude', 'gemini', 'deepseek', 'llama', 'mistral',
+    'openai', 'anthropic', 'google', 'meta ai', 'alphafold',
+    'o1', 'o3', 'gpt-4', 'gpt-5', 'sonnet', 'opus',
+    '重磅', '炸裂', '爆火', '颠覆', '史上最强', '王炸',
+    'v4', 'v5', 'v3', '4o', '4v', '4.5', '5.0'
+]
+
+EXCITEMENT_GROUP = '__excitement__'
+
+# Compiled once from CATEGORIES and EXCITEMENT_KEYWORDS
+KEYWORD_MATCHER = KeywordMatcher({
+    **{category: config['keywords'] for category, config in CATEGORIES.items()},
+    EXCITEMENT_GROUP: EXCITEMENT_KEYWORDS
+})
+
 
 def deduplicate_by_url(articles):
     """
@@ -107,6 +136,11 @@ def deduplicate_by_similarity(articles, threshold=0.7):
     """
     Remove near-duplicate articles by title similarity
 
+    Each title is tokenized once and indexed with MinHash/LSH; exact
+    Jaccard similarity is only computed for band collisions. When an
+    article matches, it is compared against the earliest kept match and
+    the one with higher authority score is kept.
+
     Args:
         articles (list): List of article dictionaries
         threshold (float): Similarity threshold (0-1)
@@ -114,55 +148,76 @@ def deduplicate_by_similarity(articles, threshold=0.7):
     Returns:
         list: Deduplicated articles
     """
-    unique_articles = []
+    index = MinHashLSH(threshold=threshold)
+    kept = {}  # position -> article, in kept order
 
-    for article in articles:
-        is_duplicate = False
-
-        for existing in unique_articles:
-            similarity = calculate_title_similarity(
-                article['title'],
-                existing['title']
-            )
-
-            if similarity >= threshold:
-                is_duplicate = True
-                # Keep the one with higher authority score
-                if article['authority_score'] > existing['authority_score']:
-                    unique_articles.remove(existing)
-                    unique_articles.append(article)
-                break
-
-        if not is_duplicate:
-            unique_articles.append(article)
+    for position, article in enumerate(articles):
+        tokens = tokenize_title(article['title'])
+        signature = index.signature(tokens)
+        matches = index.query(tokens, signature)
+
+        if not matches:
+            kept[position] = article
+            index.insert(position, tokens, signature)
+            continue
+
+        first = min(matches)
+        existing = kept[first]
+
+        # Keep the one with higher authority score
+        if article['authority_score'] > existing['authority_score']:
+            del kept[first]
+            index.remove(first)
+            kept[position] = article
+            index.insert(position, tokens, signature)
+
+    unique_articles = list(kept.values())
 
     logger.info(f"Similarity dedup: {len(articles)} -> {len(unique_articles)} articles")
     return unique_articles
 
 
-def classify_article(article):
+def match_article_keywords(article):
     """
-    Classify article into categories based on keywords
+    Scan title and summary once for category and excitement keywords
 
     Args:
         article (dict): Article dictionary
 
     Returns:
-        str: Category name
+        tuple: (category_hits, excitement_hits) where category_hits maps
+            each category to its keyword hit count over title + summary,
+            and excitement_hits counts excitement keywords in the title
     """
     title = article.get('title', '').lower()
     summary = article.get('summary', '').lower()
-    text = title + ' ' + summary
 
-    # Score each category
-    category_scores = {}
-    for category, config in CATEGORIES.items():
-        keywords = config['keywords']
-        weight = config['weight']
+    hits, title_hits = KEYWORD_MATCHER.count(title + ' ' + summary, len(title))
+    category_hits = {category: hits[category] for category in CATEGORIES}
+
+    return category_hits, title_hits[EXCITEMENT_GROUP]
+
+
+def classify_article(article, keyword_hits=None):
+    """
+    Classify article into categories based on keywords
+
+    Args:
+        article (dict): Article dictionary
+        keyword_hits (tuple): Precomputed match_article_keywords result
 
-        # Count keyword matches
-        matches = sum(1 for kw in keywords if kw in text)
-        category_scores[category] = matches * weight
+    Returns:
+        str: Category name
+    """
+    if keyword_hits is None:
+        keyword_hits = match_article_keywords(article)
+    category_hits = keyword_hits[0]
+
+    # Score each category
+    category_scores = {
+        category: category_hits[category] * config['weight']
+        for category, config in CATEGORIES.items()
+    }
 
     # Return category with highest score
     if category_scores:
@@ -173,12 +228,13 @@ def classify_article(article):
     return '其他'
 
 
-def calculate_article_score(article):
+def calculate_article_score(article, keyword_hits=None):
     """
     Calculate multi-dimensional score for article
 
     Args:
         article (dict): Article dictionary
+        keyword_hits (tuple): Precomputed match_article_keywords result
 
     Returns:
         float: Article score (0-100)
@@ -199,19 +255,12 @@ def calculate_article_score(article):
     score += authority_score
 
     # 3. Title excitement score (0-20 points)
-    title = article.get('title', '').lower()
-    excitement_keywords = [
-        'breakthrough', 'first', 'launches', 'achieves', 'new',
-        'revolutionary', 'unveils', 'announces', 'major', 'significant',
-        # 大模型关键词
-        'gpt', 'claude', 'gemini', 'deepseek', 'llama', 'mistral',
-        'openai', 'anthropic', 'google', 'meta ai', 'alphafold',
-        'o1', 'o3', 'gpt-4', 'gpt-5', 'sonnet', 'opus',
-        '重磅', '炸裂', '爆火', '颠覆', '史上最强', '王炸',
-        'v4', 'v5', 'v3', '4o', '4v', '4.5', '5.0'
-    ]
-    excitement_score = sum(4 for kw in excitement_keywords if kw in title)
-    excitement_score = min(excitement_score, 20)
+    if keyword_hits is not None:
+        excitement_hits = keyword_hits[1]
+    else:
+        title = article.get('title', '').lower()
+        excitement_hits = KEYWORD_MATCHER.count(title)[0][EXCITEMENT_GROUP]
+    excitement_score = min(4 * excitement_hits, 20)
     score += excitement_score
 
     # 4. Content richness score (0-10 points)
@@ -227,18 +276,22 @@ def calculate_article_score(article):
     return round(score, 2)
 
 
-def rank_articles(articles):
+def rank_articles(articles, keyword_hits=None):
     """
     Rank articles by calculated score
 
     Args:
         articles (list): List of article dictionaries
+        keyword_hits (list): Precomputed match_article_keywords results,
+            parallel to articles
 
     Returns:
         list: Sorted articles (highest score first)
     """
-    for article in articles:
-        article['score'] = calculate_article_score(article)
+    if keyword_hits is None:
+        keyword_hits = [None] * len(articles)
+    for article, hits in zip(articles, keyword_hits):
+        article['score'] = calculate_article_score(article, hits)
 
     sorted_articles = sorted(articles, key=lambda x: x['score'], reverse=True)
 
@@ -250,12 +303,99 @@ def rank_articles(articles):
     return sorted_articles
 
 
-def process_articles(articles):
+def score_articles_batch(articles, now=None, keyword_hits=None):
+    """
+    Score all articles at once with NumPy column arithmetic
+
+    Uses the same formula as calculate_article_score, but with a single
+    reference timestamp for the whole batch. Scores are written back to
+    each article's 'score' field.
+
+    Args:
+        articles (list): List of article dictionaries
+        now (datetime): Reference time (defaults to datetime.now())
+        keyword_hits (list): Precomputed match_article_keywords results,
+            parallel to articles
+
+    Returns:
+        numpy.ndarray: Indices of articles sorted by score (highest first)
+    """
+    if now is None:
+        now = datetime.now()
+
+    count = len(articles)
+    age_seconds = np.empty(count)
+    authority = np.empty(count)
+    excitement_hits = np.empty(count)
+    summary_length = np.empty(count)
+    category_weight = np.empty(count)
+
+    for i, article in enumerate(articles):
+        published = article['published']
+        if published.tzinfo is not None:
+            published = published.replace(tzinfo=None)
+        age_seconds[i] = (now - published).total_seconds()
+        authority[i] = article.get('authority_score', 20)
+        if keyword_hits is not None:
+            excitement_hits[i] = keyword_hits[i][1]
+        else:
+            title = article.get('title', '').lower()
+            excitement_hits[i] = KEYWORD_MATCHER.count(title)[0][EXCITEMENT_GROUP]
+        summary_length[i] = len(article.get('summary', ''))
+        category = article.get('category', '其他')
+        category_weight[i] = CATEGORIES.get(category, {}).get('weight', 1.0)
+
+    # Same operation order as calculate_article_score
+    time_score = 40 / (1 + (age_seconds / 3600) / 24)
+    authority_score = np.minimum(authority, 30)
+    excitement_score = np.minimum(4 * excitement_hits, 20)
+    content_score = np.minimum(summary_length / 50, 10)
+
+    raw_scores = (time_score + authority_score + excitement_score + content_score) * category_weight
+    scores = [round(score, 2) for score in raw_scores.tolist()]
+
+    for article, score in zip(articles, scores):
+        article['score'] = score
+
+    # Stable sort keeps the input order for equal scores, like sorted()
+    return np.argsort(-np.array(scores), kind='stable')
+
+
+def rank_articles_batch(articles, keyword_hits=None):
+    """
+    Rank articles using the vectorized batch scorer
+
+    Args:
+        articles (list): List of article dictionaries
+        keyword_hits (list): Precomputed match_article_keywords results,
+            parallel to articles
+
+    Returns:
+        list: Sorted articles (highest score first)
+    """
+    if not articles:
+        return []
+
+    order = score_articles_batch(articles, keyword_hits=keyword_hits)
+    sorted_articles = [articles[i] for i in order]
+
+    logger.info(f"Ranked {len(sorted_articles)} articles (batch)")
+    logger.info(f"Top score: {sorted_articles[0]['score']}, "
+               f"Bottom score: {sorted_articles[-1]['score']}")
+
+    return sorted_articles
+
+
+def process_articles(articles, fingerprint_index=None, batch_scoring=False):
     """
     Complete processing pipeline: deduplicate, classify, rank
 
     Args:
         articles (list): Raw articles from fetcher
+        fingerprint_index (FingerprintIndex): Optional index of stored
+            articles; already-seen articles and near-duplicates of stored
+            titles are dropped before classification and ranking
+        batch_scoring (bool): Rank with the NumPy batch scorer
 
     Returns:
         list: Processed and ranked articles
@@ -263,17 +403,37 @@ def process_articles(articles):
     logger.info(f"Starting processing of {len(articles)} articles")
 
     # Step 1: Deduplicate by URL
-    articles = deduplicate_by_url(articles)
+    with instrument.stage('process.dedup_url', items=len(articles)) as counts:
+        articles = deduplicate_by_url(articles)
+        counts['kept'] = len(articles)
+
+    # Skip articles stored by previous runs
+    if fingerprint_index is not None:
+        with instrument.stage('process.known', items=len(articles)) as counts:
+            articles = fingerprint_index.filter_new(articles)
+            counts['kept'] = len(articles)
 
     # Step 2: Deduplicate by similarity
-    articles = deduplicate_by_similarity(articles, threshold=0.7)
+    with instrument.stage('process.dedup_similar', items=len(articles)) as counts:
+        articles = deduplicate_by_similarity(articles, threshold=0.7)
+        counts['kept'] = len(articles)
 
-    # Step 3: Classify
-    for article in articles:
-        article['category'] = classify_article(article)
+    # Step 3: Classify (one keyword scan per article, reused for ranking)
+    with instrument.stage('process.classify', items=len(articles)):
+        keyword_hits = [match_article_keywords(article) for article in articles]
+        for article, hits in zip(articles, keyword_hits):
+            article['category'] = classify_article(article, hits)
 
     # Step 4: Rank
-    articles = rank_articles(articles)
+    if batch_scoring and np is None:
+        logger.warning("NumPy not installed, falling back to per-article scoring")
+        batch_scoring = False
+
+    with instrument.stage('process.rank', items=len(articles)):
+        if batch_scoring:
+            articles = rank_articles_batch(articles, keyword_hits)
+        else:
+            articles = rank_articles(articles, keyword_hits)
 
     logger.info(f"Processing complete: {len(articles)} articles ready")
     return articles
@@ -2,17 +2,71 @@
 """
 Push Notification Module
 Supports multiple platforms: Feishu, WeChatWork, DingTalk, Telegram, Email
+Channels are sent to concurrently, with per-channel rate limits and retries
 """
 
 import requests
 import json
 import logging
 import os
+import random
+import threading
+import time
 import subprocess
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from functools import partial
+from itertools import islice
+from requests.adapters import HTTPAdapter
+
+from digest import TITLE, Digest, render_digest
 
 logger = logging.getLogger(__name__)
 
+HTTP_TIMEOUT = 10
+TELEGRAM_API = 'https://api.telegram.org'
+DISPATCH_WORKERS = 8
+FANOUT_WORKERS = 16      # deliveries in flight when pushing to subscribers
+RETRY_BASE_DELAY = 1.0   # seconds; doubles per attempt, full jitter
+RETRY_MAX_DELAY = 30.0
+
+# Per-target send limits (messages per second, burst) and attempts, from
+# the platforms' documented bot limits; channel_rate additionally caps
+# the whole channel (e.g. one Telegram bot across all chats)
+CHANNEL_LIMITS = {
+    'Feishu': {'rate': 5, 'burst': 5, 'attempts': 3},             # 5/s, 100/min per bot
+    'WeChatWork': {'rate': 20 / 60, 'burst': 5, 'attempts': 3},   # 20/min per bot
+    'DingTalk': {'rate': 20 / 60, 'burst': 5, 'attempts': 3},     # 20/min per bot
+    'Telegram': {'rate': 1, 'burst': 3, 'attempts': 3,            # ~1/s per chat,
+                 'channel_rate': 30},                             # 30/s per bot
+    'Email': {'rate': 1, 'burst': 1, 'attempts': 1},
+}
+
+# push.yaml section key -> channel name
+CHANNEL_NAMES = {
+    'feishu': 'Feishu',
+    'wechat_work': 'WeChatWork',
+    'dingtalk': 'DingTalk',
+    'telegram': 'Telegram',
+    'email': 'Email',
+}
+
+# Platform error codes meaning "rate limited / try again later"
+RETRYABLE_CODES = {
+    'Feishu': {9499, 11232},
+    'WeChatWork': {-1, 45009},
+    'DingTalk': {-1, 130101},
+    'Telegram': {429, 500, 502, 503, 504},
+}
+
+# One message to one target; send(session=...) makes a single attempt
+PushMessage = namedtuple('PushMessage', ['channel', 'target', 'send'])
+
+# Outcome of a message: latency is the last attempt's round-trip, elapsed
+# the total including rate-limit waits and retries (seconds)
+Delivery = namedtuple('Delivery', ['channel', 'ok', 'attempts', 'latency', 'elapsed', 'result'])
+
 
 def format_for_markdown(articles, count=10):
     """
@@ -25,52 +79,18 @@ def format_for_markdown(articles, count=10):
     Returns:
         str: Formatted markdown text
     """
-    content = f"# 🤖 AI Today's Top News\n\n"
-    content += f"**Date**: {datetime.now().strftime('%Y-%m-%d %H:%M')}\n"
-    content += f"**Articles**: {min(count, len(articles))}\n\n"
-    content += "---\n\n"
-
-    for i, article in enumerate(articles[:count], 1):
-        emoji = "🔥" if i <= 3 else "📰"
-
-        content += f"## {emoji} Top {i}: {article['title']}\n\n"
-        content += f"**Source**: {article['source']} | "
-        content += f"**Category**: {article['category']} | "
-        content += f"**Score**: {article['score']:.1f}\n\n"
-
-        # Time ago
-        published = article['published']
-        if published.tzinfo is not None:
-            published = published.replace(tzinfo=None)
-        age_hours = (datetime.now() - published).total_seconds() / 3600
-        if age_hours < 1:
-            time_str = f"{int(age_hours * 60)} min ago"
-        elif age_hours < 24:
-            time_str = f"{int(age_hours)} hours ago"
-        else:
-            time_str = f"{int(age_hours / 24)} days ago"
-
-        content += f"**Published**: {time_str}\n\n"
-
-        # Summary (truncated)
-        summary = article.get('summary', '')
-        if len(summary) > 150:
-            summary = summary[:150] + "..."
+    return render_digest(articles, count).text('markdown')
 
-        content += f"{summary}\n\n"
-        content += f"[Read More]({article['link']})\n\n"
-        content += "---\n\n"
 
-    return content
-
-
-def send_to_feishu(webhook_url, content):
+def send_to_feishu(webhook_url, content, session=None, timeout=HTTP_TIMEOUT):
     """
     Send message to Feishu (Lark) group bot
 
     Args:
         webhook_url (str): Feishu webhook URL
         content (str): Markdown content
+        session (requests.Session): Shared HTTP session (optional)
+        timeout (float): Request timeout in seconds
 
     Returns:
         dict: API response
@@ -107,7 +127,7 @@ def send_to_feishu(webhook_url, content):
             }
         }
 
-        response = requests.post(webhook_url, json=payload, timeout=10)
+        response = (session or requests).post(webhook_url, json=payload, timeout=timeout)
         result = response.json()
 
         if result.get('code') == 0:
@@ -122,13 +142,15 @@ def send_to_feishu(webhook_url, content):
         return {"error": str(e)}
 
 
-def send_to_wechat_work(webhook_url, content):
+def send_to_wechat_work(webhook_url, content, session=None, timeout=HTTP_TIMEOUT):
     """
     Send message to WeChatWork (企业微信) group bot
 
     Args:
         webhook_url (str): WeChatWork webhook URL
         content (str): Markdown content
+        session (requests.Session): Shared HTTP session (optional)
+        timeout (float): Request timeout in seconds
 
     Returns:
         dict: API response
@@ -141,7 +163,7 @@ def send_to_wechat_work(webhook_url, content):
             }
         }
 
-        response = requests.post(webhook_url, json=payload, timeout=10)
+        response = (session or requests).post(webhook_url, json=payload, timeout=timeout)
         result = response.json()
 
         if result.get('errcode') == 0:
@@ -156,7 +178,7 @@ def send_to_wechat_work(webhook_url, content):
         return {"error": str(e)}
 
 
-def send_to_dingtalk(webhook_url, content, secret=None):
+def send_to_dingtalk(webhook_url, content, secret=None, session=None, timeout=HTTP_TIMEOUT):
     """
     Send message to DingTalk (钉钉) group bot
 
@@ -164,12 +186,13 @@ def send_to_dingtalk(webhook_url, content, secret=None):
         webhook_url (str): DingTalk webhook URL
         content (str): Markdown content
         secret (str): Optional security secret
+        session (requests.Session): Shared HTTP session (optional)
+        timeout (float): Request timeout in seconds
 
     Returns:
         dict: API response
     """
     try:
-        import time
         import hmac
         import hashlib
         import base64
@@ -197,7 +220,7 @@ def send_to_dingtalk(webhook_url, content, secret=None):
             }
         }
 
-        response = requests.post(url, json=payload, timeout=10)
+        response = (session or requests).post(url, json=payload, timeout=timeout)
         result = response.json()
 
         if result.get('errcode') == 0:
@@ -212,7 +235,8 @@ def send_to_dingtalk(webhook_url, content, secret=None):
         return {"error": str(e)}
 
 
-def send_to_telegram(bot_token, chat_id, content):
+def send_to_telegram(bot_token, chat_id, content, session=None, timeout=HTTP_TIMEOUT,
+                     api_base=TELEGRAM_API):
     """
     Send message to Telegram
 
@@ -220,12 +244,15 @@ def send_to_telegram(bot_token, chat_id, content):
         bot_token (str): Telegram bot token
         chat_id (str): Telegram chat ID
         content (str): Markdown content
+        session (requests.Session): Shared HTTP session (optional)
+        timeout (float): Request timeout in seconds
+        api_base (str): Bot API server (a self-hosted one or a test stub)
 
     Returns:
         dict: API response
     """
     try:
-        url = f"https://api.telegram.org/bot{bot_token}/sendMessage"
+        url = f"{api_base}/bot{bot_token}/sendMessage"
 
         # Telegram has message length limit
         if len(content) > 4096:
@@ -238,7 +265,7 @@ def send_to_telegram(bot_token, chat_id, content):
             "disable_web_page_preview": True
         }
 
-        response = requests.post(url, json=payload, timeout=10)
+        response = (session or requests).post(url, json=payload, timeout=timeout)
         result = response.json()
 
         if result.get('ok'):
@@ -253,7 +280,7 @@ def send_to_telegram(bot_token, chat_id, content):
         return {"error": str(e)}
 
 
-def send_email(to_email, subject, content):
+def send_email(to_email, subject, content, session=None):
     """
     Send email using capymail CLI
 
@@ -261,6 +288,7 @@ def send_email(to_email, subject, content):
         to_email (str): Recipient email address
         subject (str): Email subject
         content (str): Email body (markdown)
+        session: Unused; accepted so all senders share one call signature
 
     Returns:
         dict: Send result
@@ -296,60 +324,387 @@ def send_email(to_email, subject, content):
         return {"error": str(e)}
 
 
-def push_to_channels(articles, config, count=10):
+def _succeeded(channel, result):
+    """Whether a channel's response reports success"""
+    if channel == 'Feishu':
+        return result.get('code') == 0 or result.get('StatusCode') == 0
+    if channel in ('WeChatWork', 'DingTalk'):
+        return result.get('errcode') == 0
+    if channel == 'Telegram':
+        return bool(result.get('ok'))
+    return result.get('status') == 'success'
+
+
+def _retry_delay(channel, result, attempt):
+    """
+    Backoff before the next attempt of a failed send
+
+    Transport errors and the platform's rate-limit codes are retried with
+    exponential backoff and full jitter (Telegram's retry_after is honoured
+    when given); other errors are permanent.
+
+    Returns:
+        float: Seconds to wait, or None if the failure is not retryable
+    """
+    code = result.get('code', result.get('errcode', result.get('error_code')))
+    if 'error' not in result and code not in RETRYABLE_CODES.get(channel, ()):
+        return None
+
+    retry_after = (result.get('parameters') or {}).get('retry_after')
+    if retry_after:
+        return min(float(retry_after), RETRY_MAX_DELAY)
+    return random.uniform(0, min(RETRY_BASE_DELAY * 2 ** attempt, RETRY_MAX_DELAY))
+
+
+class TokenBucket:
+    """Thread-safe token bucket: `rate` tokens per second, up to `burst`"""
+
+    def __init__(self, rate, burst):
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """
+        Take a token, sleeping until one is available
+
+        Returns:
+            float: Seconds waited
+        """
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return waited
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+            waited += wait
+
+
+class PushDispatcher:
+    """
+    Send push messages concurrently over a shared HTTP session
+
+    Each message runs on a worker thread, so a slow webhook only delays
+    its own channel. Sends to one target (webhook, chat) share a token
+    bucket with that channel's CHANNEL_LIMITS, and retryable failures
+    are retried with jittered backoff.
+    """
+
+    def __init__(self, max_workers=DISPATCH_WORKERS, limits=None, session=None,
+                 timeout=HTTP_TIMEOUT):
+        """
+        Args:
+            max_workers (int): Messages sent at the same time
+            limits (dict): Per-channel overrides of CHANNEL_LIMITS
+            session (requests.Session): HTTP session (default: a new pooled one)
+            timeout (float): Request timeout in seconds
+        """
+        self.max_workers = max_workers
+        self.timeout = timeout
+        self.limits = {
+            channel: {**CHANNEL_LIMITS.get(channel, {}), **(limits or {}).get(channel, {})}
+            for channel in set(CHANNEL_LIMITS) | set(limits or {})
+        }
+        self.session = session
+        if self.session is None:
+            self.session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=max_workers, pool_maxsize=max_workers)
+            self.session.mount('https://', adapter)
+            self.session.mount('http://', adapter)
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+    def _buckets_for(self, channel, target):
+        """The target's bucket, preceded by the channel-wide one if limited"""
+        limit = self.limits.get(channel, {})
+        buckets = []
+        with self._lock:
+            if limit.get('channel_rate'):
+                if channel not in self._buckets:
+                    rate = limit['channel_rate']
+                    self._buckets[channel] = TokenBucket(rate, max(int(rate), 1))
+                buckets.append(self._buckets[channel])
+
+            key = (channel, target)
+            if key not in self._buckets:
+                self._buckets[key] = TokenBucket(limit.get('rate', 1), limit.get('burst', 1))
+            buckets.append(self._buckets[key])
+        return buckets
+
+    def _deliver(self, message):
+        """Send one message with rate limiting and retries"""
+        attempts = max(self.limits.get(message.channel, {}).get('attempts', 1), 1)
+        buckets = self._buckets_for(message.channel, message.target)
+        start = time.perf_counter()
+        latency = 0.0
+        result = {}
+
+        for attempt in range(attempts):
+            for bucket in buckets:
+                bucket.acquire()
+            sent = time.perf_counter()
+            try:
+                result = message.send(session=self.session)
+            except Exception as e:
+                result = {'error': str(e)}
+            latency = time.perf_counter() - sent
+
+            if _succeeded(message.channel, result):
+                return Delivery(message.channel, True, attempt + 1, latency,
+                                time.perf_counter() - start, result)
+
+            delay = _retry_delay(message.channel, result, attempt)
+            if delay is None or attempt + 1 == attempts:
+                break
+            logger.warning(f"[{message.channel}] attempt {attempt + 1} failed, "
+                           f"retrying in {delay:.1f}s")
+            time.sleep(delay)
+
+        return Delivery(message.channel, False, attempt + 1, latency,
+                        time.perf_counter() - start, result)
+
+    def _deliver_in_order(self, messages):
+        return [self._deliver(message) for message in messages]
+
+    def dispatch(self, messages):
+        """
+        Send messages concurrently
+
+        Messages to the same target (e.g. the parts of a split digest)
+        are sent one after another, in input order; different targets are
+        sent concurrently.
+
+        Args:
+            messages (list): PushMessage entries
+
+        Returns:
+            list: Delivery per message, in input order
+        """
+        if not messages:
+            return []
+
+        groups = {}
+        for index, message in enumerate(messages):
+            groups.setdefault((message.channel, message.target), []).append(index)
+
+        deliveries = [None] * len(messages)
+        workers = min(self.max_workers, len(groups))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            results = executor.map(
+                self._deliver_in_order,
+                [[messages[index] for index in indexes] for indexes in groups.values()]
+            )
+            for indexes, group_deliveries in zip(groups.values(), results):
+                for index, delivery in zip(indexes, group_deliveries):
+                    deliveries[index] = delivery
+        return deliveries
+
+    def close(self):
+        """Close the HTTP session"""
+        self.session.close()
+
+
+def target_messages(channel_key, settings, digest, subject=None):
+    """
+    Messages delivering a digest to one target
+
+    The digest is sent in the channel's markup, split into as many
+    messages as its size limit requires.
+
+    Args:
+        channel_key (str): push.yaml channel key (see CHANNEL_NAMES)
+        settings (dict): The channel's settings (webhook/secret, bot_token/
+            chat_id/api_base or to)
+        digest (Digest): Rendered digest
+        subject (str): Email subject
+
+    Returns:
+        list: PushMessage entries (empty if the target is not configured)
+    """
+    channel = CHANNEL_NAMES[channel_key]
+
+    if channel_key == 'telegram':
+        bot_token = settings.get('bot_token')
+        target = settings.get('chat_id')
+        if not (bot_token and target):
+            return []
+        send = partial(send_to_telegram, bot_token, target,
+                       api_base=settings.get('api_base', TELEGRAM_API))
+    elif channel_key == 'email':
+        target = settings.get('to')
+        if not target:
+            return []
+        subject = subject or f"{TITLE} - {datetime.now().strftime('%Y-%m-%d')}"
+        send = partial(send_email, target, subject)
+    else:
+        target = settings.get('webhook')
+        if not target:
+            return []
+        if channel_key == 'dingtalk':
+            send = partial(send_to_dingtalk, target, secret=settings.get('secret'))
+        elif channel_key == 'wechat_work':
+            send = partial(send_to_wechat_work, target)
+        else:
+            send = partial(send_to_feishu, target)
+
+    return [PushMessage(channel, target, partial(send, part)) for part in digest.parts(channel)]
+
+
+def channel_messages(config, digest, subject=None):
+    """
+    Build the messages for every enabled, configured channel
+
+    Args:
+        config (dict): Push configuration
+        digest (Digest): Rendered digest
+        subject (str): Email subject
+
+    Returns:
+        list: PushMessage entries
     """
-    Push articles to all configured channels
+    messages = []
+    for channel_key in CHANNEL_NAMES:
+        settings = config.get(channel_key, {})
+        if settings.get('enabled'):
+            messages.extend(target_messages(channel_key, settings, digest, subject))
+    return messages
+
+
+def push_to_channels(articles, config, count=10, dispatcher=None):
+    """
+    Push articles to all configured channels concurrently
 
     Args:
         articles (list): List of article dictionaries
         config (dict): Push configuration
         count (int): Number of articles to push
+        dispatcher (PushDispatcher): Dispatcher to reuse (default: a
+            temporary one, closed afterwards)
+
+    Returns:
+        list: Delivery per message sent (one per channel unless a digest
+            was split)
+    """
+    messages = channel_messages(config, render_digest(articles, count))
+
+    if dispatcher is not None:
+        return dispatcher.dispatch(messages)
+
+    dispatcher = PushDispatcher(limits=config.get('rate_limits'))
+    try:
+        return dispatcher.dispatch(messages)
+    finally:
+        dispatcher.close()
+
+
+def subscriber_view(candidates, categories=None, top_n=10):
+    """
+    A subscriber's digest articles, selected from the shared candidate set
+
+    Args:
+        candidates (list): Articles ranked best first
+        categories (list): Categories to include (None for all)
+        top_n (int): Articles to keep
 
     Returns:
-        list: List of (channel, result) tuples
+        list: Up to top_n articles
     """
-    content = format_for_markdown(articles, count)
-    results = []
-
-    # Feishu
-    if config.get('feishu', {}).get('enabled'):
-        webhook = config['feishu'].get('webhook')
-        if webhook:
-            result = send_to_feishu(webhook, content)
-            results.append(('Feishu', result))
-
-    # WeChatWork
-    if config.get('wechat_work', {}).get('enabled'):
-        webhook = config['wechat_work'].get('webhook')
-        if webhook:
-            result = send_to_wechat_work(webhook, content)
-            results.append(('WeChatWork', result))
-
-    # DingTalk
-    if config.get('dingtalk', {}).get('enabled'):
-        webhook = config['dingtalk'].get('webhook')
-        secret = config['dingtalk'].get('secret')
-        if webhook:
-            result = send_to_dingtalk(webhook, content, secret)
-            results.append(('DingTalk', result))
-
-    # Telegram
-    if config.get('telegram', {}).get('enabled'):
-        bot_token = config['telegram'].get('bot_token')
-        chat_id = config['telegram'].get('chat_id')
-        if bot_token and chat_id:
-            result = send_to_telegram(bot_token, chat_id, content)
-            results.append(('Telegram', result))
-
-    # Email
-    if config.get('email', {}).get('enabled'):
-        to_email = config['email'].get('to')
-        if to_email:
-            subject = f"AI Today's Top News - {datetime.now().strftime('%Y-%m-%d')}"
-            result = send_email(to_email, subject, content)
-            results.append(('Email', result))
-
-    return results
+    if categories:
+        wanted = set(categories)
+        candidates = (article for article in candidates if article['category'] in wanted)
+    return list(islice(candidates, top_n))
+
+
+def subscription_settings(subscription, config):
+    """
+    Channel settings for a subscriber
+
+    Telegram subscribers without their own bot token use push.yaml's bot
+    token and API server.
+    """
+    channel_key, target, secret = subscription['channel'], subscription['target'], subscription.get('secret')
+
+    if channel_key == 'telegram':
+        telegram = config.get('telegram', {})
+        return {
+            'chat_id': target,
+            'bot_token': secret or telegram.get('bot_token'),
+            'api_base': telegram.get('api_base', TELEGRAM_API),
+        }
+    if channel_key == 'email':
+        return {'to': target}
+    return {'webhook': target, 'secret': secret}
+
+
+def push_to_subscribers(candidates, subscriptions, config, dispatcher=None,
+                        max_parallel=FANOUT_WORKERS):
+    """
+    Deliver each subscriber its own digest
+
+    Views are computed from the shared candidate set, and each distinct
+    view (category filter, top-N) is rendered once however many
+    subscribers share it. Deliveries run concurrently, at most
+    `max_parallel` at a time.
+
+    Args:
+        candidates (list): Articles ranked best first, covering every
+            subscriber's view (see ArticleDatabase.get_category_leaders)
+        subscriptions (list): Subscription dicts (see get_subscriptions)
+        config (dict): Push configuration (Telegram bot token, rate limits)
+        dispatcher (PushDispatcher): Dispatcher to reuse (default: a
+            temporary one, closed afterwards)
+        max_parallel (int): Deliveries in flight at once
+
+    Returns:
+        list: (subscription, [Delivery]) per subscriber that had articles
+    """
+    digests = {}     # (categories, top_n) -> Digest, or None for an empty view
+    messages = []
+    owners = []      # index into `delivered` for each message
+    delivered = []
+
+    for subscription in subscriptions:
+        if subscription['channel'] not in CHANNEL_NAMES:
+            logger.warning(f"Skipping subscription {subscription['id']}: "
+                           f"unknown channel '{subscription['channel']}'")
+            continue
+
+        key = (tuple(sorted(subscription['categories'] or ())), subscription['top_n'])
+        if key not in digests:
+            view = subscriber_view(candidates, subscription['categories'], subscription['top_n'])
+            digests[key] = Digest(view) if view else None
+        if digests[key] is None:
+            continue
+
+        target = target_messages(subscription['channel'], subscription_settings(subscription, config),
+                                 digests[key])
+        if target:
+            owners.extend([len(delivered)] * len(target))
+            messages.extend(target)
+            delivered.append((subscription, []))
+
+    logger.info(f"Pushing {len(messages)} messages to {len(delivered)} subscribers "
+                f"({sum(1 for digest in digests.values() if digest)} distinct digests)")
+
+    own_dispatcher = dispatcher is None
+    if own_dispatcher:
+        dispatcher = PushDispatcher(max_workers=max_parallel, limits=config.get('rate_limits'))
+    try:
+        deliveries = dispatcher.dispatch(messages)
+    finally:
+        if own_dispatcher:
+            dispatcher.close()
+
+    for owner, delivery in zip(owners, deliveries):
+        delivered[owner][1].append(delivery)
+    return delivered
 
 
 if __name__ == '__main__':
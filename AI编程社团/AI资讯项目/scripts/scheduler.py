@@ -1,15 +1,22 @@
 #!/usr/bin/env python3
 """
 Scheduler for automated daily news push
+
+Jobs run in-process by default (daemon mode), keeping the pipeline modules,
+configs, HTTP pool and database connections warm; subprocess mode runs each
+job as a separate `ai_news.py` invocation.
 """
 
 import schedule
 import time
 import sys
+import json
 import yaml
 import logging
+import argparse
 from pathlib import Path
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
 import subprocess
 
 # Setup logging
@@ -24,6 +31,11 @@ logging.basicConfig(
 
 logger = logging.getLogger(__name__)
 
+UPDATE_TIMEOUT = 300  # 5 minutes
+PUSH_TIMEOUT = 60     # 1 minute
+CANCEL_GRACE = 30     # seconds a timed-out job gets to stop at a stage boundary
+METRICS_PATH = Path(__file__).parent.parent / 'logs' / 'scheduler_metrics.json'
+
 
 def load_push_config():
     """Load push configuration"""
@@ -37,6 +49,17 @@ def load_push_config():
         return yaml.safe_load(f)
 
 
+def load_settings():
+    """Load the settings section of the sources configuration"""
+    config_path = Path(__file__).parent.parent / 'config' / 'sources.yaml'
+
+    if not config_path.exists():
+        return {}
+
+    with open(config_path, 'r', encoding='utf-8') as f:
+        return (yaml.safe_load(f) or {}).get('settings', {})
+
+
 def daily_update_and_push():
     """Daily job: update articles and push to channels"""
     logger.info("=== Running Daily Job ===")
@@ -104,10 +127,189 @@ def hourly_update():
         logger.error(f"Hourly update failed: {e}", exc_info=True)
 
 
+def adaptive_update():
+    """Tick job: update only the sources due under adaptive polling"""
+    logger.info("=== Running Adaptive Update ===")
+
+    script_path = Path(__file__).parent / 'ai_news.py'
+
+    try:
+        result = subprocess.run(
+            [sys.executable, str(script_path), 'update', '--due'],
+            capture_output=True,
+            text=True,
+            timeout=300
+        )
+
+        if result.returncode == 0:
+            logger.info("Adaptive update complete")
+        else:
+            logger.error(f"Update failed: {result.stderr}")
+
+    except Exception as e:
+        logger.error(f"Adaptive update failed: {e}", exc_info=True)
+
+
+class PipelineDaemon:
+    """
+    Run pipeline jobs in-process on a single worker thread
+
+    The worker owns a long-lived AppContext (SQLite connections are bound
+    to the thread that opened them). A job that exceeds its timeout is
+    cancelled cooperatively: it stops at the next stage boundary, and
+    jobs scheduled while it is still running are skipped. Per-job
+    durations and outcomes are kept in `metrics` and written to
+    logs/scheduler_metrics.json.
+    """
+
+    def __init__(self, metrics_path=METRICS_PATH):
+        """
+        Import the pipeline and open the shared context on the worker thread
+
+        Args:
+            metrics_path (Path): JSON file for job metrics
+        """
+        import ai_news
+
+        self._ai_news = ai_news
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='pipeline')
+        self.context = self._executor.submit(ai_news.AppContext, persistent_http=True).result()
+        self._current = None
+        self.metrics_path = metrics_path
+        self.metrics = {}
+
+    def run_job(self, name, func, timeout):
+        """
+        Run a job on the worker and wait for it
+
+        Args:
+            name (str): Job name (metrics key)
+            func (callable): Job body
+            timeout (float): Seconds before the job is cancelled
+
+        Returns:
+            str: 'ok', 'failed', 'timeout' or 'skipped'
+        """
+        if self._current is not None and not self._current.done():
+            logger.warning(f"Skipping {name} job: previous job is still running")
+            self._record(name, 'skipped', None)
+            return 'skipped'
+
+        logger.info(f"=== Running {name} job (in-process) ===")
+        self.context.cancel_event.clear()
+        start = time.monotonic()
+        self._current = self._executor.submit(func)
+
+        try:
+            self._current.result(timeout=timeout)
+            status = 'ok'
+        except FutureTimeout:
+            status = 'timeout'
+            logger.error(f"{name} job exceeded {timeout}s, cancelling")
+            self.context.cancel_event.set()
+            try:
+                self._current.result(timeout=CANCEL_GRACE)
+            except FutureTimeout:
+                logger.error(f"{name} job did not stop within {CANCEL_GRACE}s; "
+                             f"later jobs are skipped until it finishes")
+            except Exception:
+                pass
+        except Exception as e:
+            status = 'failed'
+            logger.error(f"{name} job failed: {e}", exc_info=True)
+
+        duration = time.monotonic() - start
+        self._record(name, status, duration)
+        logger.info(f"=== {name} job {status} in {duration:.1f}s ===")
+        return status
+
+    def _record(self, name, status, duration):
+        metrics = self.metrics.setdefault(name, {
+            'runs': 0, 'ok': 0, 'failed': 0, 'timeout': 0, 'skipped': 0,
+            'last_status': None, 'last_seconds': None, 'avg_seconds': None,
+            'max_seconds': 0.0, 'total_seconds': 0.0,
+        })
+        metrics[status] += 1
+        metrics['last_status'] = status
+
+        if duration is not None:
+            metrics['runs'] += 1
+            metrics['total_seconds'] = round(metrics['total_seconds'] + duration, 3)
+            metrics['last_seconds'] = round(duration, 3)
+            metrics['max_seconds'] = round(max(metrics['max_seconds'], duration), 3)
+            metrics['avg_seconds'] = round(metrics['total_seconds'] / metrics['runs'], 3)
+
+        try:
+            tmp_path = self.metrics_path.with_suffix('.tmp')
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({'updated': datetime.now().isoformat(), 'jobs': self.metrics},
+                          f, ensure_ascii=False, indent=2)
+            tmp_path.replace(self.metrics_path)
+        except OSError as e:
+            logger.warning(f"Could not write job metrics: {e}")
+
+    def daily_update_and_push(self):
+        """Daily job: update articles and push to channels"""
+        def job():
+            self._ai_news.update_database(context=self.context)
+            self.context.check_cancelled()
+            self._ai_news.push_news(context=self.context)
+
+        self.run_job('daily', job, UPDATE_TIMEOUT + PUSH_TIMEOUT)
+
+    def hourly_update(self):
+        """Hourly job: just update articles without push"""
+        self.run_job('hourly', lambda: self._ai_news.update_database(context=self.context),
+                     UPDATE_TIMEOUT)
+
+    def adaptive_update(self):
+        """Tick job: update only the sources due under adaptive polling"""
+        self.run_job('adaptive', lambda: self._ai_news.update_database(due_only=True, context=self.context),
+                     UPDATE_TIMEOUT)
+
+    def shutdown(self):
+        """Cancel any running job and close the shared context"""
+        self.context.cancel_event.set()
+        try:
+            if self._current is not None:
+                self._current.result(timeout=CANCEL_GRACE)
+        except Exception:
+            pass
+
+        try:
+            self._executor.submit(self.context.close).result(timeout=CANCEL_GRACE)
+        except Exception as e:
+            logger.warning(f"Error closing pipeline context: {e}")
+        self._executor.shutdown(wait=False)
+
+
 def main():
     """Main scheduler loop"""
+    parser = argparse.ArgumentParser(description='AI News Scheduler')
+    parser.add_argument('--mode', choices=['daemon', 'subprocess'],
+                        help='Run jobs in-process or one subprocess per job '
+                             '(default: settings.scheduler_mode, else daemon)')
+    args = parser.parse_args()
+
     logger.info("AI News Scheduler Started")
 
+    settings = load_settings()
+    mode = args.mode or settings.get('scheduler_mode', 'daemon')
+
+    daily_job, hourly_job, adaptive_job = daily_update_and_push, hourly_update, adaptive_update
+    daemon = None
+    if mode == 'daemon':
+        try:
+            daemon = PipelineDaemon()
+            daily_job, hourly_job, adaptive_job = (daemon.daily_update_and_push,
+                                                   daemon.hourly_update, daemon.adaptive_update)
+        except Exception as e:
+            logger.error(f"Daemon mode unavailable, falling back to subprocess mode: {e}",
+                         exc_info=True)
+            mode = 'subprocess'
+
+    logger.info(f"Running jobs in {mode} mode")
+
     # Load push config to get schedule
     push_config = load_push_config()
 
@@ -118,13 +320,19 @@ def main():
         logger.info(f"Daily push scheduled at: {daily_time}")
 
         # Schedule daily push
-        schedule.every().day.at(daily_time).do(daily_update_and_push)
+        schedule.every().day.at(daily_time).do(daily_job)
     else:
         logger.warning("No push config found, using default schedule")
-        schedule.every().day.at("08:00").do(daily_update_and_push)
-
-    # Schedule hourly updates (without push)
-    schedule.every().hour.do(hourly_update)
+        schedule.every().day.at("08:00").do(daily_job)
+
+    # Schedule updates between daily pushes: per-source adaptive polling
+    # checked every tick, or the fixed hourly full refresh
+    if settings.get('adaptive_polling', False):
+        tick_minutes = settings.get('poll_tick_minutes', 15)
+        logger.info(f"Adaptive polling every {tick_minutes} minutes")
+        schedule.every(tick_minutes).minutes.do(adaptive_job)
+    else:
+        schedule.every().hour.do(hourly_job)
 
     logger.info("Scheduler is running. Press Ctrl+C to stop.")
 
@@ -132,7 +340,7 @@ def main():
     try:
         # Run update immediately on start
         logger.info("Running initial update...")
-        hourly_update()
+        hourly_job()
 
         while True:
             schedule.run_pending()
@@ -143,6 +351,9 @@ def main():
     except Exception as e:
         logger.error(f"Scheduler error: {e}", exc_info=True)
         sys.exit(1)
+    finally:
+        if daemon:
+            daemon.shutdown()
 
 
 if __name__ == '__main__':
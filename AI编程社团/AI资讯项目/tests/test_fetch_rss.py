@@ -0,0 +1,177 @@
+"""
+Tests for conditional RSS fetching: ETag revalidation, cache counters and
+the per-feed high-water mark, against a local feed server
+
+Run from the project root:
+    python -m pytest tests
+"""
+
+import sys
+import asyncio
+import threading
+from pathlib import Path
+from email.utils import formatdate
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'scripts'))
+
+import fetch_rss
+from fetch_rss import FeedCache, fetch_rss_source, fetch_all_sources_async
+
+BASE_TIME = 1700000000
+
+
+def make_feed(items):
+    """RSS document for (title, published epoch seconds) pairs"""
+    body = ''.join(
+        f"<item><title>{title}</title>"
+        f"<link>https://example.com/{title.replace(' ', '-')}</link>"
+        f"<pubDate>{formatdate(published, usegmt=True)}</pubDate></item>"
+        for title, published in items
+    )
+    return (f'<?xml version="1.0"?><rss version="2.0"><channel>'
+            f'<title>Test feed</title>{body}</channel></rss>').encode()
+
+
+class FeedServer:
+    """Serves one feed whose ETag changes whenever its items are replaced"""
+
+    def __init__(self):
+        self.requests = []      # (If-None-Match, status) per request
+        self.set_items([('Item 0', BASE_TIME), ('Item 1', BASE_TIME - 3600)])
+
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def do_GET(self):
+                etag, body = server.etag, server.body
+                if self.headers.get('If-None-Match') == etag:
+                    server.requests.append((etag, 304))
+                    self.send_response(304)
+                    self.send_header('ETag', etag)
+                    self.send_header('Content-Length', '0')
+                    self.end_headers()
+                    return
+
+                server.requests.append((self.headers.get('If-None-Match'), 200))
+                self.send_response(200)
+                self.send_header('ETag', etag)
+                self.send_header('Content-Type', 'application/rss+xml')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self._httpd = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self._httpd.daemon_threads = True
+        threading.Thread(target=self._httpd.serve_forever, daemon=True).start()
+        self.url = f"http://127.0.0.1:{self._httpd.server_port}/feed.xml"
+
+    def set_items(self, items):
+        self.body = make_feed(items)
+        self.etag = f'"v{len(self.requests)}-{len(items)}"'
+
+    def close(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+
+def fetch_sync(source, cache):
+    return fetch_rss_source(source, cache)
+
+
+def fetch_async(source, cache):
+    if fetch_rss.httpx is None:
+        pytest.skip("httpx not installed")
+    return asyncio.run(fetch_all_sources_async([source], cache))
+
+
+@pytest.fixture
+def server():
+    server = FeedServer()
+    yield server
+    server.close()
+
+
+@pytest.fixture
+def source(server):
+    return {'name': 'Test feed', 'url': server.url, 'category': 'tech_media'}
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return FeedCache(tmp_path / 'feed_cache.json')
+
+
+@pytest.fixture(params=[fetch_sync, fetch_async], ids=['requests', 'httpx'])
+def fetch(request):
+    return request.param
+
+
+def test_first_fetch_is_a_miss_and_stores_validators(server, source, cache, fetch):
+    articles = fetch(source, cache)
+
+    assert [a['title'] for a in articles] == ['Item 0', 'Item 1']
+    entry = cache.get(server.url)
+    assert entry['etag'] == server.etag
+    assert entry['misses'] == 1
+    assert entry.get('hits', 0) == 0
+    assert entry['size'] == len(server.body)
+    assert server.requests == [(None, 200)]
+
+
+def test_not_modified_returns_no_articles(server, source, cache, fetch):
+    fetch(source, cache)
+    articles = fetch(source, cache)
+
+    assert articles == []
+    assert server.requests[-1] == (server.etag, 304)
+    entry = cache.get(server.url)
+    assert entry['hits'] == 1
+    assert entry['misses'] == 1
+    assert entry['bytes_saved'] == len(server.body)
+
+
+def test_changed_feed_is_refetched(server, source, cache, fetch):
+    fetch(source, cache)
+    server.set_items([('Item 2', BASE_TIME + 3600), ('Item 0', BASE_TIME)])
+    articles = fetch(source, cache)
+
+    assert articles
+    entry = cache.get(server.url)
+    assert entry['etag'] == server.etag
+    assert entry['misses'] == 2
+    assert entry.get('hits', 0) == 0
+
+
+def test_high_water_mark_filters_older_entries(server, source, cache, fetch):
+    fetch(source, cache)
+    high_water = cache.get(server.url)['high_water']
+
+    server.set_items([
+        ('Item 3', BASE_TIME + 7200),
+        ('Item 0', BASE_TIME),
+        ('Item 1', BASE_TIME - 3600),
+        ('Item 4', BASE_TIME - 7200),
+    ])
+    articles = fetch(source, cache)
+
+    # Item 0 sits exactly on the mark and is kept; dedup drops it later
+    assert [a['title'] for a in articles] == ['Item 3', 'Item 0']
+    assert all(a['published'].timestamp() >= high_water for a in articles)
+    assert cache.get(server.url)['high_water'] == high_water + 7200
+
+
+def test_cache_survives_save_and_reload(server, source, cache, fetch, tmp_path):
+    fetch(source, cache)
+    cache.save()
+
+    reloaded = FeedCache(tmp_path / 'feed_cache.json')
+    assert fetch(source, reloaded) == []
+    assert reloaded.get(server.url)['hits'] == 1
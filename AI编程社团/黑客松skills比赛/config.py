@@ -22,8 +22,29 @@ MINIMAX_API_KEY = "sk-cp-WsBzZ5kPtrd7LD6PXiutSDpk_hNGLGbtgYeKsjRVLuiC0QhH9ZnY41n
 # MiniMax API地址（根据你的API类型选择）
 MINIMAX_API_BASE = "https://api.minimax.chat/v1"
 
+# MiniMax分段生成的总超时（秒），超时未返回的段落使用模板内容
+AI_SECTION_DEADLINE = 60
+
+# 流式生成（--stream）的总超时（秒），超时后保留已生成的部分
+AI_STREAM_TIMEOUT = 120
+
+# 大模型响应缓存（相同的话题和提示词直接复用上次的结果，不重复消耗额度）
+# 命令行加 --no-cache 跳过缓存，加 --refresh-cache 重新生成并更新缓存
+LLM_CACHE_ENABLED = True
+LLM_CACHE_TTL = 7 * 24 * 3600   # 缓存有效期（秒）
+LLM_CACHE_MAX_MB = 50           # 缓存总大小上限，超出后淘汰最久未使用的
+
+# 各AI服务每分钟最多请求次数（只计实际调用，缓存命中不计），允许 AI_RATE_BURST 次突发
+AI_RATE_LIMITS = {"openai": 60, "claude": 50, "minimax": 60}
+AI_RATE_BURST = 4
+
+# 批量生成（batch 命令）：同时写作的文章数、默认篇数
+BATCH_WORKERS = 4
+BATCH_SIZE = 20
+
 # ============== 爬虫配置 ==============
-# 请求间隔（秒），不要设太短否则容易被封IP
+# 同一网站两次请求的最小间隔（秒），不要设太短否则容易被封IP
+# 不同平台之间互不影响，微博、知乎、抖音同时抓取
 REQUEST_DELAY = 2
 
 # 每次获取热点数量
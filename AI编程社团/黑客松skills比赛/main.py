@@ -8,13 +8,20 @@
     write 1 或 -w 1            - 选择话题编号写文章
     list 或 -l                 - 查看历史文章
     copy 1 或 -c 1            - 复制历史文章
+    batch 或 batch 30         - 批量为前N个没写过的热点生成文章
     help 或 -h                 - 查看帮助
+
+    cache 或 cache clear       - 查看/清空大模型响应缓存
+
+    search/write/gen 加 --stream 时流式输出：边生成边显示并写入文件
+    加 --no-cache 不使用缓存，加 --refresh-cache 重新生成并更新缓存
 """
 
 import sys
 import pyperclip
-from services import HotTopicService, AIWriter, ArticleService
-from storage import Database
+from services import HotTopicService, AIWriter, ArticleService, BatchWriter
+from storage import Database, get_llm_cache
+from storage.llm_cache import MODE_OFF, MODE_REFRESH
 
 
 # 命令映射表
@@ -27,7 +34,9 @@ COMMANDS = {
     "copy": "copy",
     "publish": "publish",
     "gen": "gen",
+    "batch": "batch",  # 批量生成
     "image": "image",  # 生成配图
+    "cache": "cache",  # 大模型响应缓存
     "help": "help",
     # 短参数
     "-h": "help",
@@ -37,6 +46,7 @@ COMMANDS = {
     "-c": "copy",
     "-p": "publish",
     "-g": "gen",
+    "-b": "batch",
     "-i": "image",
 }
 
@@ -50,6 +60,19 @@ def print_banner():
     print()
 
 
+def print_text(text: str):
+    """流式输出：文本一到就显示"""
+    print(text, end="", flush=True)
+
+
+def stream_to(out):
+    """流式输出：显示并追加到正在写入的文章文件"""
+    def on_text(text: str):
+        print_text(text)
+        out.write(text)
+    return on_text
+
+
 def cmd_hot():
     """获取今日热点"""
     print("\n=== 获取今日热点 ===\n")
@@ -75,7 +98,7 @@ def cmd_hot():
     return topics
 
 
-def cmd_search(keyword: str = None):
+def cmd_search(keyword: str = None, stream: bool = False):
     """搜索关键词并生成文章"""
     print("\n=== 搜索并生成文章 ===\n")
 
@@ -98,33 +121,42 @@ def cmd_search(keyword: str = None):
     print("   正在搜索并提取观点...")
 
     # 获取搜索结果和观点
-    search_result = searcher.search_and_extract(keyword)
+    search_result = searcher.search_and_extract(keyword, on_text=print_text if stream else None)
 
     if not search_result:
         print("搜索失败，请换个关键词试试")
         return
 
-    # 显示搜索到的信息
-    print("\n=== 搜索到的热点 ===")
-    for i, info in enumerate(search_result.get('highlights', [])[:5], 1):
-        print(f"  {i}. {info}")
-    print()
+    if stream:
+        print("\n")
+    else:
+        # 显示搜索到的信息
+        print("\n=== 搜索到的热点 ===")
+        for i, info in enumerate(search_result.get('highlights', [])[:5], 1):
+            print(f"  {i}. {info}")
+        print()
 
-    # 显示提取的观点
-    print("=== AI提取的观点 ===")
-    for i, point in enumerate(search_result.get('points', []), 1):
-        print(f"  {i}. {point}")
-    print()
+        # 显示提取的观点
+        print("=== AI提取的观点 ===")
+        for i, point in enumerate(search_result.get('points', []), 1):
+            print(f"  {i}. {point}")
+        print()
 
     print("2. 正在生成风格化文章...")
 
     # 生成文章
     from services.ai_writer import generate_from_search
-    article = generate_from_search(keyword, search_result)
-
-    # 保存文章
     article_service = ArticleService()
-    filepath = article_service.save_article(keyword, "搜索", article)
+    if stream:
+        # 边生成边写入文件
+        with article_service.stream_article(keyword, "搜索") as out:
+            article = generate_from_search(keyword, search_result, on_text=stream_to(out))
+        filepath = out.filepath
+    else:
+        article = generate_from_search(keyword, search_result)
+
+        # 保存文章
+        filepath = article_service.save_article(keyword, "搜索", article)
 
     # 复制到剪贴板
     pyperclip.copy(article)
@@ -137,7 +169,7 @@ def cmd_search(keyword: str = None):
     print("=" * 50)
 
 
-def cmd_write(topic_index: int = None):
+def cmd_write(topic_index: int = None, stream: bool = False):
     """写文章"""
     service = HotTopicService()
     topics = service.get_all_topics()
@@ -163,17 +195,8 @@ def cmd_write(topic_index: int = None):
     print(f"来源平台: {topic['platform']}")
     print("\n正在让AI为你写文章，请稍候...\n")
 
-    # AI写文章
-    writer = AIWriter()
-    article_content = writer.generate_article(topic['title'], topic['platform'])
-
-    # 保存文章
-    article_service = ArticleService()
-    filepath = article_service.save_article(
-        topic['title'],
-        topic['platform'],
-        article_content
-    )
+    # AI写文章并保存
+    filepath, article_content = write_article(topic, stream)
 
     # 保存到数据库
     db = Database()
@@ -190,6 +213,35 @@ def cmd_write(topic_index: int = None):
     print("=" * 50)
 
 
+def write_article(topic: dict, stream: bool = False):
+    """
+    为话题生成文章并保存到文件
+
+    Args:
+        topic: 热点话题
+        stream: 流式输出，边生成边显示并写入文件
+
+    Returns:
+        (文件路径, 文章内容)
+    """
+    writer = AIWriter()
+    article_service = ArticleService()
+
+    if stream:
+        with article_service.stream_article(topic['title'], topic['platform']) as out:
+            article_content = writer.generate_article(topic['title'], topic['platform'],
+                                                      on_text=stream_to(out))
+        return out.filepath, article_content
+
+    article_content = writer.generate_article(topic['title'], topic['platform'])
+    filepath = article_service.save_article(
+        topic['title'],
+        topic['platform'],
+        article_content
+    )
+    return filepath, article_content
+
+
 def cmd_list():
     """显示历史文章"""
     print("\n=== 历史文章列表 ===\n")
@@ -237,7 +289,7 @@ def cmd_copy(article_index: int):
         print("=" * 50)
 
 
-def cmd_gen(topic_index: int = None):
+def cmd_gen(topic_index: int = None, stream: bool = False):
     """快速生成文章：获取热点 + AI写文章 + 复制到剪贴板"""
     print("\n=== 快速生成文章 ===\n")
 
@@ -272,17 +324,8 @@ def cmd_gen(topic_index: int = None):
     print(f"\n2. 选择话题: {topic['title']}")
     print("   正在让AI生成文章...")
 
-    # AI写文章
-    writer = AIWriter()
-    article_content = writer.generate_article(topic['title'], topic['platform'])
-
-    # 保存文章
-    article_service = ArticleService()
-    filepath = article_service.save_article(
-        topic['title'],
-        topic['platform'],
-        article_content
-    )
+    # AI写文章并保存
+    filepath, article_content = write_article(topic, stream)
 
     # 复制到剪贴板
     print("\n3. 复制到剪贴板...")
@@ -296,6 +339,40 @@ def cmd_gen(topic_index: int = None):
     print("=" * 50)
 
 
+def cmd_batch(count: int = None):
+    """批量生成：为前N个没写过的热点并发写文章"""
+    from config import BATCH_SIZE
+
+    count = count or BATCH_SIZE
+    print(f"\n=== 批量生成文章（{count}篇） ===\n")
+
+    print("1. 获取今日热点...")
+    topics = HotTopicService().get_all_topics()
+    if not topics:
+        print("获取热点失败")
+        return
+
+    batch = BatchWriter()
+    selected, skipped = batch.select_topics(topics, count)
+    if not selected:
+        print(f"热点话题都已经写过了（跳过 {skipped} 个）")
+        return
+
+    print(f"\n2. 生成 {len(selected)} 篇文章（跳过已写过的 {skipped} 个，"
+          f"同时生成 {batch.workers} 篇）...\n")
+    stats = batch.run(selected)
+
+    minutes = stats["seconds"] / 60
+    print("=" * 50)
+    print(f"[OK] 批量生成完成：成功 {stats['written']} 篇，失败 {stats['failed']} 篇")
+    print(f"   总耗时: {stats['seconds']:.1f}s，平均每篇 {stats['latency']:.1f}s")
+    if minutes > 0:
+        print(f"   吞吐: {stats['written'] / minutes:.1f} 篇/分钟，{stats['chars'] / minutes:.0f} 字/分钟")
+    print(f"   缓存: 命中 {stats['cache_hits']} 次，未命中 {stats['cache_misses']} 次")
+    print(f"   文章保存在: {batch.article_service.output_dir}")
+    print("=" * 50)
+
+
 def cmd_publish(article_index: int = None):
     """发布文章到公众号草稿箱"""
     service = ArticleService()
@@ -394,24 +471,56 @@ def cmd_image(article_index: int = None):
         print("配图生成失败，请检查API配置")
 
 
+def cmd_cache(action: str = None):
+    """查看或清空大模型响应缓存"""
+    cache = get_llm_cache()
+
+    if action == "clear":
+        deleted = cache.clear()
+        print(f"已清空缓存，删除 {deleted} 条响应")
+        return
+
+    stats = cache.stats()
+    print("\n=== 大模型响应缓存 ===\n")
+    print(f"  位置: {cache.db_path}")
+    print(f"  条目: {stats['entries']}")
+    print(f"  大小: {stats['bytes'] / 1024 / 1024:.2f} MB / {cache.max_bytes / 1024 / 1024:.0f} MB")
+    print(f"  有效期: {cache.ttl / 3600:.0f} 小时" if cache.ttl else "  有效期: 不过期")
+
+
+def print_cache_summary():
+    """本次运行用到缓存时，显示命中情况"""
+    stats = get_llm_cache().stats()
+    if stats["hits"] or stats["misses"]:
+        print(f"\n[缓存] 命中 {stats['hits']} 次，未命中 {stats['misses']} 次")
+
+
 def show_help():
     """显示帮助"""
     print("=" * 50)
     print("使用方法:")
     print("  search <关键词> 或 -s    - 搜索关键词生成文章（推荐）")
     print("  gen 或 -g             - 快速生成文章（热点+AI写作+复制）")
+    print("  batch [篇数] 或 -b     - 批量为前N个没写过的热点生成文章")
     print("  hot 或 -h              - 获取今日热点")
     print("  write <编号> 或 -w     - 选择话题写文章")
     print("  list 或 -l             - 查看历史文章")
     print("  copy <编号> 或 -c      - 复制历史文章")
     print("  image <编号> 或 -i     - 为文章生成配图")
     print("  publish <编号> 或 -p    - 发布到公众号草稿箱")
+    print("  cache [clear]          - 查看/清空大模型响应缓存")
     print("  help 或 -h             - 查看帮助")
+    print("  search/write/gen 加 --stream  - 流式输出，边生成边显示并写入文件")
+    print("  加 --no-cache                 - 不读也不写缓存，每次重新调用API")
+    print("  加 --refresh-cache            - 忽略已有缓存，重新生成后更新缓存")
     print()
     print("示例:")
     print("  python main.py search 春节      # 搜索春节相关生成文章")
     print("  python main.py -s AI           # 搜索AI相关生成文章")
     print("  python main.py gen              # 快速生成文章")
+    print("  python main.py gen 1 --stream   # 流式生成第1个热点的文章")
+    print("  python main.py search AI --refresh-cache  # 不用缓存，重新生成")
+    print("  python main.py batch 30         # 为前30个没写过的热点批量生成")
     print("  python main.py hot              # 获取今日热点")
     print("  python main.py image 1          # 为第1篇文章生成配图")
     print("=" * 50)
@@ -431,6 +540,12 @@ def main():
 
     # 解析命令行参数
     args = sys.argv[1:]
+    stream = "--stream" in args
+    if "--no-cache" in args:
+        get_llm_cache().mode = MODE_OFF
+    elif "--refresh-cache" in args:
+        get_llm_cache().mode = MODE_REFRESH
+    args = [arg for arg in args if arg not in ("--stream", "--no-cache", "--refresh-cache")]
 
     if not args:
         show_help()
@@ -453,13 +568,13 @@ def main():
 
     elif cmd_type == "search":
         keyword = args[1] if len(args) > 1 else None
-        cmd_search(keyword)
+        cmd_search(keyword, stream)
 
     elif cmd_type == "write":
         if len(args) > 1:
             try:
                 index = int(args[1])
-                cmd_write(index)
+                cmd_write(index, stream)
             except ValueError:
                 print("请输入有效的编号")
         else:
@@ -482,11 +597,21 @@ def main():
         if len(args) > 1:
             try:
                 index = int(args[1])
-                cmd_gen(index)
+                cmd_gen(index, stream)
             except ValueError:
                 print("请输入有效的编号")
         else:
-            cmd_gen()
+            cmd_gen(stream=stream)
+
+    elif cmd_type == "batch":
+        if len(args) > 1:
+            try:
+                count = int(args[1])
+                cmd_batch(count)
+            except ValueError:
+                print("请输入有效的篇数")
+        else:
+            cmd_batch()
 
     elif cmd_type == "publish":
         if len(args) > 1:
@@ -508,9 +633,15 @@ def main():
         else:
             cmd_image()
 
+    elif cmd_type == "cache":
+        cmd_cache(args[1] if len(args) > 1 else None)
+
     elif cmd_type == "help":
         show_help()
 
+    if cmd_type in ("search", "write", "gen"):
+        print_cache_summary()
+
 
 if __name__ == "__main__":
     main()
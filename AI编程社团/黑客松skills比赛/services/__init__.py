@@ -6,5 +6,6 @@
 from .hot_topic_service import HotTopicService
 from .ai_writer import AIWriter
 from .article_service import ArticleService
+from .batch_writer import BatchWriter
 
-__all__ = ["HotTopicService", "AIWriter", "ArticleService"]
+__all__ = ["HotTopicService", "AIWriter", "ArticleService", "BatchWriter"]
@@ -5,30 +5,313 @@ AI写作服务
 """
 
 import os
+import json
+import time
+import threading
 import requests
-from typing import Optional
-from config import AI_PROVIDER, OPENAI_API_KEY, CLAUDE_API_KEY, MINIMAX_API_KEY, MINIMAX_API_BASE, ARTICLE_WORD_COUNT, WRITING_STYLE
+from concurrent.futures import ThreadPoolExecutor, as_completed, TimeoutError as FuturesTimeout
+from typing import Callable, Dict, Iterable, Iterator, Optional, Tuple
+from requests.adapters import HTTPAdapter
+from config import AI_PROVIDER, OPENAI_API_KEY, CLAUDE_API_KEY, MINIMAX_API_KEY, MINIMAX_API_BASE, ARTICLE_WORD_COUNT, WRITING_STYLE, AI_SECTION_DEADLINE, AI_STREAM_TIMEOUT, AI_RATE_LIMITS, AI_RATE_BURST
+from storage.llm_cache import get_llm_cache
+
+OPENAI_MODEL = "gpt-3.5-turbo"
+CLAUDE_MODEL = "claude-3-haiku-20240307"
+MINIMAX_MODEL = "abab6.5s-chat"
+STREAM_READ_TIMEOUT = 30  # 流式输出两段文本之间的最长等待（秒）
+
+
+class RateLimiter:
+    """令牌桶限速：每分钟最多 rate 次，允许 burst 次突发，多线程共用"""
+
+    def __init__(self, rate: float, burst: int = 1):
+        self.interval = 60.0 / rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """取一个令牌，没有令牌时等到轮到自己"""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) / self.interval)
+            self._updated = now
+            # 先预约再等待：令牌为负时，排在前面的请求各占一个间隔
+            self._tokens -= 1
+            wait = -self._tokens * self.interval if self._tokens < 0 else 0
+        if wait > 0:
+            time.sleep(wait)
+
+
+RATE_LIMITERS = {provider: RateLimiter(rate, AI_RATE_BURST) for provider, rate in AI_RATE_LIMITS.items()}
+
+
+def _throttle(provider: str):
+    """按服务商限速（未配置的不限）"""
+    limiter = RATE_LIMITERS.get(provider)
+    if limiter is not None:
+        limiter.acquire()
+
+
+def _provider_name(provider: str) -> str:
+    """规范化服务商名称（未知的按OpenAI处理）"""
+    if provider == "claude":
+        return "claude"
+    if provider in ["minimax", "minimax2.5"]:
+        return "minimax"
+    return "openai"
+
+
+def chat_request(provider: str, prompt: str, system: str = None, max_tokens: int = 2000) -> dict:
+    """
+    构建对话请求参数
+
+    同一个字典既是发给API的参数，也是缓存键的内容
+
+    Args:
+        provider: 服务商（openai / claude / minimax）
+        prompt: 用户提示词
+        system: 系统提示词
+        max_tokens: 最大生成长度
+    """
+    user = {"role": "user", "content": prompt}
+    if provider == "claude":
+        request = {"model": CLAUDE_MODEL, "max_tokens": max_tokens, "messages": [user]}
+        if system:
+            request["system"] = system
+        return request
+
+    messages = [{"role": "system", "content": system}] if system else []
+    messages.append(user)
+    if provider == "openai":
+        return {"model": OPENAI_MODEL, "messages": messages, "temperature": 0.8, "max_tokens": max_tokens}
+    return {"model": MINIMAX_MODEL, "messages": messages, "max_tokens": max_tokens}
+
+
+def cached_completion(provider: str, request: dict, call: Callable[[dict], str]) -> str:
+    """
+    带缓存地调用大模型
+
+    Args:
+        provider: 服务商（openai / claude / minimax）
+        request: 请求参数（见 chat_request）
+        call: 未命中时执行的调用，参数为 request，返回生成的文本
+
+    Returns:
+        生成的文本（命中时为缓存的文本）
+    """
+    cache = get_llm_cache()
+    key = cache.make_key(provider, request)
+    text = cache.lookup(key)
+    if text is None:
+        _throttle(provider)
+        text = call(request)
+        cache.store(key, provider, request["model"], text)
+    return text
+
+
+def minimax_post(request: dict, session: requests.Session = None, timeout: float = 60) -> str:
+    """调用MiniMax对话接口，返回生成的文本（无结果时为空字符串）"""
+    url = f"{MINIMAX_API_BASE}/text/chatcompletion_v2"
+    headers = {
+        "Authorization": f"Bearer {MINIMAX_API_KEY}",
+        "Content-Type": "application/json"
+    }
+    response = (session or requests).post(url, headers=headers, json=request, timeout=timeout)
+    data = response.json()
+    if "choices" in data and len(data["choices"]) > 0:
+        return data["choices"][0]["message"]["content"]
+    return ""
+
+
+def stream_completion(prompt: str, system: str = None, max_tokens: int = 2000,
+                      provider: str = AI_PROVIDER, timeout: float = AI_STREAM_TIMEOUT,
+                      session: requests.Session = None) -> Iterator[str]:
+    """
+    流式调用大模型，生成的文本一段一段返回
+
+    OpenAI、Claude、MiniMax 使用同一个接口（其他provider按OpenAI处理）。
+    与非流式请求共用缓存：命中时整篇一次返回；完整生成的结果写入缓存，
+    超时或中断的部分结果不写入
+
+    Args:
+        prompt: 用户提示词
+        system: 系统提示词
+        max_tokens: 最大生成长度
+        provider: AI服务，默认为 AI_PROVIDER
+        timeout: 总超时（秒），超时抛出 TimeoutError，已返回的文本由调用方保留
+        session: MiniMax请求复用的连接池
+
+    Returns:
+        文本片段的迭代器
+    """
+    provider = _provider_name(provider)
+    request = chat_request(provider, prompt, system, max_tokens)
+    cache = get_llm_cache()
+    key = cache.make_key(provider, request)
+
+    cached = cache.lookup(key)
+    if cached is not None:
+        yield cached
+        return
+
+    _throttle(provider)
+    deadline = time.monotonic() + timeout
+    read_timeout = min(STREAM_READ_TIMEOUT, timeout)
+
+    if provider == "claude":
+        chunks = _stream_claude(request, read_timeout)
+    elif provider == "minimax":
+        chunks = _stream_minimax(request, read_timeout, session)
+    else:
+        chunks = _stream_openai(request, read_timeout)
+
+    parts = []
+    try:
+        for chunk in chunks:
+            if chunk:
+                parts.append(chunk)
+                yield chunk
+            if time.monotonic() > deadline:
+                raise TimeoutError(f"生成超过{timeout}秒")
+    finally:
+        chunks.close()
+
+    if not parts:
+        raise RuntimeError("AI未返回内容")
+    cache.store(key, provider, request["model"], "".join(parts))
+
+
+def _stream_openai(request, read_timeout):
+    from openai import OpenAI
+
+    client = OpenAI(api_key=OPENAI_API_KEY, timeout=read_timeout)
+    for chunk in client.chat.completions.create(stream=True, **request):
+        if chunk.choices:
+            yield chunk.choices[0].delta.content or ""
+
+
+def _stream_claude(request, read_timeout):
+    import anthropic
+
+    client = anthropic.Anthropic(api_key=CLAUDE_API_KEY, timeout=read_timeout)
+    with client.messages.stream(**request) as stream:
+        yield from stream.text_stream
+
+
+def _stream_minimax(request, read_timeout, session=None):
+    url = f"{MINIMAX_API_BASE}/text/chatcompletion_v2"
+    headers = {
+        "Authorization": f"Bearer {MINIMAX_API_KEY}",
+        "Content-Type": "application/json"
+    }
+
+    # 服务端事件流：每行 "data: {...}"，以 "data: [DONE]" 结束
+    with (session or requests).post(url, headers=headers, json=dict(request, stream=True), stream=True,
+                                    timeout=(10, read_timeout)) as response:
+        response.raise_for_status()
+
+        # 鉴权失败、额度不足等错误以 HTTP 200 + 普通JSON返回，没有事件
+        if "text/event-stream" not in response.headers.get("Content-Type", ""):
+            raise RuntimeError(_minimax_error(response.json()))
+
+        events = 0
+        for line in response.iter_lines():
+            line = line.decode("utf-8").strip()
+            if not line.startswith("data:"):
+                continue
+            data = line[len("data:"):].strip()
+            if data == "[DONE]":
+                break
+            events += 1
+            event = json.loads(data)
+            choices = event.get("choices") or []
+            if choices:
+                # 最后一个事件的 message 是完整内容，只取增量 delta
+                yield (choices[0].get("delta") or {}).get("content") or ""
+            elif (event.get("base_resp") or {}).get("status_code"):
+                raise RuntimeError(_minimax_error(event))
+
+        if not events:
+            raise RuntimeError("MiniMax未返回任何内容")
+
+
+def _minimax_error(data: dict) -> str:
+    """MiniMax错误响应的说明（base_resp.status_code / status_msg）"""
+    base_resp = data.get("base_resp") or {}
+    if base_resp:
+        return f"MiniMax错误 {base_resp.get('status_code')}: {base_resp.get('status_msg')}"
+    return f"MiniMax返回了无法识别的响应: {str(data)[:200]}"
+
+
+def collect_stream(chunks: Iterable[str], on_text: Callable[[str], None]) -> Tuple[str, Optional[Exception]]:
+    """
+    消费流式输出，每段文本到达时交给 on_text
+
+    Returns:
+        (已生成的文本, 中断原因)，正常结束时中断原因为 None
+    """
+    parts = []
+    try:
+        for chunk in chunks:
+            parts.append(chunk)
+            on_text(chunk)
+    except Exception as e:
+        return "".join(parts), e
+    return "".join(parts), None
 
 
 class AIWriter:
     """AI写作服务"""
 
-    def __init__(self):
+    def __init__(self, pool_size: int = 4):
+        """
+        Args:
+            pool_size: 连接池大小，多篇文章同时生成时按 篇数 × 4 个段落设置
+        """
         self.article_word_count = ARTICLE_WORD_COUNT
         self.writing_style = WRITING_STYLE
+        self.section_deadline = AI_SECTION_DEADLINE
+        self._local = threading.local()  # 每个线程最近一次生成的段落耗时、是否用了模板文章
 
-    def generate_article(self, topic: str, platform: str) -> str:
+        # 分段请求共用的连接池
+        self.session = requests.Session()
+        self.session.mount("https://", HTTPAdapter(pool_maxsize=pool_size))
+        self.session.mount("http://", HTTPAdapter(pool_maxsize=pool_size))
+
+    @property
+    def section_latency(self) -> Dict[str, float]:
+        """
+        当前线程最近一次分段生成各段落的耗时（秒），批量生成时各线程互不覆盖
+
+        失败的段落记为失败时的耗时，超时的段落记为截止时的耗时；命中缓存的段落不记录
+        """
+        return getattr(self._local, "section_latency", {})
+
+    @property
+    def used_fallback(self) -> bool:
+        """当前线程最近一次生成是否因调用失败或内容太短而返回了整篇模板文章"""
+        return getattr(self._local, "used_fallback", False)
+
+    def generate_article(self, topic: str, platform: str,
+                         on_text: Callable[[str], None] = None) -> str:
         """
         根据话题生成公众号文章
 
         Args:
             topic: 话题标题
             platform: 来源平台
+            on_text: 流式模式：生成的文本每到达一段就回调一次
 
         Returns:
             生成的完整文章内容
         """
         print(f"正在使用AI生成文章，关于: {topic}...")
+        self._local.used_fallback = False
+
+        if on_text is not None:
+            return self._generate_streaming(topic, platform, on_text)
 
         if AI_PROVIDER == "openai":
             return self._generate_with_openai(topic, platform)
@@ -48,26 +331,20 @@ class AIWriter:
 
             prompt = self._build_prompt(topic, platform)
 
-            response = client.chat.completions.create(
-                model="gpt-3.5-turbo",
-                messages=[
-                    {"role": "system", "content": "你是一个资深的自媒体博主，擅长写爆款文章。"},
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=0.8,
-                max_tokens=2000
+            request = chat_request("openai", prompt, system="你是一个资深的自媒体博主，擅长写爆款文章。")
+            article = cached_completion(
+                "openai", request,
+                lambda request: client.chat.completions.create(**request).choices[0].message.content
             )
-
-            article = response.choices[0].message.content
             print("文章生成完成！")
             return article
 
         except ImportError:
             print("请先安装 openai 库: pip install openai")
-            return self._get_sample_article(topic, platform)
+            return self._fallback_article(topic, platform)
         except Exception as e:
             print(f"OpenAI API 调用失败: {e}")
-            return self._get_sample_article(topic, platform)
+            return self._fallback_article(topic, platform)
 
     def _generate_with_claude(self, topic: str, platform: str) -> str:
         """使用Claude API生成文章"""
@@ -78,128 +355,138 @@ class AIWriter:
 
             prompt = self._build_prompt(topic, platform)
 
-            message = client.messages.create(
-                model="claude-3-haiku-20240307",
-                max_tokens=2000,
-                system="你是一个资深的自媒体博主，擅长写爆款公众号文章。",
-                messages=[
-                    {"role": "user", "content": prompt}
-                ]
+            request = chat_request("claude", prompt, system="你是一个资深的自媒体博主，擅长写爆款公众号文章。")
+            article = cached_completion(
+                "claude", request,
+                lambda request: client.messages.create(**request).content[0].text
             )
-
-            article = message.content[0].text
             print("文章生成完成！")
             return article
 
         except ImportError:
             print("请先安装 anthropic 库: pip install anthropic")
-            return self._get_sample_article(topic, platform)
+            return self._fallback_article(topic, platform)
         except Exception as e:
             print(f"Claude API 调用失败: {e}")
-            return self._get_sample_article(topic, platform)
+            return self._fallback_article(topic, platform)
 
     def _generate_with_minimax(self, topic: str, platform: str) -> str:
-        """使用MiniMax API生成文章（分段生成，避免截断）"""
-        try:
-            url = f"{MINIMAX_API_BASE}/text/chatcompletion_v2"
-            headers = {
-                "Authorization": f"Bearer {MINIMAX_API_KEY}",
-                "Content-Type": "application/json"
-            }
+        """
+        使用MiniMax API生成文章（分段生成，避免截断）
 
-            print("  正在生成标题...")
-            # 第一步：生成标题（精简prompt）
-            title_prompt = f'给"{topic}"写3个公众号标题，简洁有力'
-            title_payload = {
-                "model": "abab6.5s-chat",
-                "messages": [
-                    {"role": "user", "content": title_prompt}
-                ],
-                "max_tokens": 150
-            }
-            response = requests.post(url, headers=headers, json=title_payload, timeout=60)
-            data = response.json()
-            titles = ""
-            if "choices" in data and len(data["choices"]) > 0:
-                titles = data["choices"][0]["message"]["content"]
-
-            print("  正在生成开头...")
-            # 第二步：生成开头（精简prompt）
-            intro_prompt = f'写一个公众号开头，主题是"{topic}"，50字，亲切有趣'
-            intro_payload = {
-                "model": "abab6.5s-chat",
-                "messages": [
-                    {"role": "user", "content": intro_prompt}
-                ],
-                "max_tokens": 300
-            }
-            response = requests.post(url, headers=headers, json=intro_payload, timeout=60)
-            data = response.json()
-            intro = ""
-            if "choices" in data and len(data["choices"]) > 0:
-                intro = data["choices"][0]["message"]["content"]
-
-            print("  正在生成中间内容...")
-            # 第三步：生成中间内容（精简prompt）
-            content_prompt = f'给公众号写中间内容，主题"{topic}"，3个观点，各50字'
-            content_payload = {
-                "model": "abab6.5s-chat",
-                "messages": [
-                    {"role": "user", "content": content_prompt}
-                ],
-                "max_tokens": 500
-            }
-            response = requests.post(url, headers=headers, json=content_payload, timeout=60)
-            data = response.json()
-            content = ""
-            if "choices" in data and len(data["choices"]) > 0:
-                content = data["choices"][0]["message"]["content"]
-
-            print("  正在生成结尾...")
-            # 第四步：生成结尾（精简prompt）
-            ending_prompt = f'写公众号结尾，主题"{topic}"，30字，引导评论'
-            ending_payload = {
-                "model": "abab6.5s-chat",
-                "messages": [
-                    {"role": "user", "content": ending_prompt}
-                ],
-                "max_tokens": 200
+        标题、开头、正文、结尾互不依赖，通过同一个连接池并发请求，
+        总耗时受 AI_SECTION_DEADLINE 限制；失败或超时的段落使用模板对应部分。
+        新生成的段落在文章通过长度检查后才写入缓存。
+        限速等待不计入总耗时：未命中缓存的段落先取齐令牌，再开始计时并提交
+        """
+        sections = [
+            ("titles", "标题", f'给"{topic}"写3个公众号标题，简洁有力', 150),
+            ("intro", "开头", f'写一个公众号开头，主题是"{topic}"，50字，亲切有趣', 300),
+            ("content", "中间内容", f'给公众号写中间内容，主题"{topic}"，3个观点，各50字', 500),
+            ("ending", "结尾", f'写公众号结尾，主题"{topic}"，30字，引导评论', 200),
+        ]
+
+        cache = get_llm_cache()
+        results = {}
+        pending = []
+        for key, label, prompt, max_tokens in sections:
+            request = chat_request("minimax", prompt, max_tokens=max_tokens)
+            cache_key = cache.make_key("minimax", request)
+            text = cache.lookup(cache_key)
+            if text is not None:
+                results[key] = text
+            else:
+                pending.append((key, label, request, cache_key))
+
+        for _ in pending:
+            _throttle("minimax")
+
+        latency = {}
+        self._local.section_latency = latency
+        start = time.monotonic()
+        if pending:
+            print(f"  正在并行生成{'、'.join(label for _, label, _, _ in pending)}...")
+            executor = ThreadPoolExecutor(max_workers=len(pending))
+            futures = {
+                executor.submit(minimax_post, request, self.session, self.section_deadline): (key, label)
+                for key, label, request, _ in pending
             }
-            response = requests.post(url, headers=headers, json=ending_payload, timeout=60)
-            data = response.json()
-            ending = ""
-            if "choices" in data and len(data["choices"]) > 0:
-                ending = data["choices"][0]["message"]["content"]
-
-            # 检查内容是否被截断（太短）
-            total_length = len(titles) + len(intro) + len(content) + len(ending)
-            print(f"  生成内容长度: {total_length}")
-            if total_length < 600:
-                # 内容太短，使用高质量模板
-                print("  API返回内容较短，使用优化模板...")
-                return self._get_sample_article(topic, platform)
-
-            # 合并所有内容
-            article = f"""标题：{titles}
+            try:
+                for future in as_completed(futures, timeout=self.section_deadline):
+                    key, label = futures[future]
+                    latency[key] = round(time.monotonic() - start, 2)
+                    try:
+                        results[key] = future.result()
+                        print(f"  {label}完成 ({latency[key]:.1f}s)")
+                    except Exception as e:
+                        print(f"  {label}生成失败: {e}")
+            except FuturesTimeout:
+                # 超时的段落记为截止时的耗时
+                elapsed = round(time.monotonic() - start, 2)
+                for key, _ in futures.values():
+                    latency.setdefault(key, elapsed)
+                print(f"  超过{self.section_deadline}秒未完成的段落使用模板内容")
+            finally:
+                executor.shutdown(wait=False, cancel_futures=True)
+
+        if not any(results.values()):
+            print("MiniMax API 调用失败，使用模板文章")
+            return self._fallback_article(topic, platform)
+
+        # 合并所有内容，缺失的段落用模板补齐
+        fallback = self._get_sample_sections(topic, platform)
+        parts = {key: results.get(key) or fallback[key] for key, _, _, _ in sections}
+
+        # 检查合并后的内容是否被截断（太短）
+        total_length = sum(len(text) for text in parts.values())
+        print(f"  生成内容长度: {total_length}（总耗时 {time.monotonic() - start:.1f}s）")
+        if total_length < 600:
+            # 内容太短，使用高质量模板
+            print("  API返回内容较短，使用优化模板...")
+            return self._fallback_article(topic, platform)
+
+        # 文章通过检查后才写入缓存，被丢弃的响应下次会重新请求
+        for key, _, request, cache_key in pending:
+            if results.get(key):
+                cache.store(cache_key, "minimax", request["model"], results[key])
+
+        article = f"""标题：{parts["titles"]}
 
 ---
 
-{intro}
+{parts["intro"]}
 
 ---
 
-{content}
+{parts["content"]}
 
 ---
 
-{ending}"""
+{parts["ending"]}"""
 
-            print("文章生成完成！")
-            return article
+        print("文章生成完成！")
+        return article
 
-        except Exception as e:
-            print(f"MiniMax API 调用失败: {e}")
-            return self._get_sample_article(topic, platform)
+    def _generate_streaming(self, topic: str, platform: str, on_text: Callable[[str], None]) -> str:
+        """
+        流式生成整篇文章（MiniMax也用完整提示词一次生成）
+
+        超时或连接中断时返回已生成的部分；一个字都没有生成时输出模板文章
+        """
+        chunks = stream_completion(self._build_prompt(topic, platform),
+                                   system="你是一个资深的自媒体博主，擅长写爆款公众号文章。",
+                                   max_tokens=2000, session=self.session)
+        article, error = collect_stream(chunks, on_text)
+
+        if error is None:
+            print("\n文章生成完成！")
+        elif article:
+            print(f"\n生成中断（{error}），已保留生成的{len(article)}字")
+        else:
+            print(f"流式生成失败: {error}，使用模板文章")
+            article = self._fallback_article(topic, platform)
+            on_text(article)
+        return article
 
     def _build_prompt(self, topic: str, platform: str) -> str:
         """构建生成文章的提示词"""
@@ -220,19 +507,27 @@ class AIWriter:
 请直接输出文章内容，不需要其他说明。"""
         return prompt
 
+    def _fallback_article(self, topic: str, platform: str) -> str:
+        """生成失败时返回模板文章，并记下本线程用了模板（见 used_fallback）"""
+        self._local.used_fallback = True
+        return self._get_sample_article(topic, platform)
+
     def _get_sample_article(self, topic: str, platform: str) -> str:
         """当API不可用时，返回示例文章（拟人化风格）"""
-        article = f"""
-救命！{topic}也太火了吧！！
-
-姐妹们！今天刷微博的时候，我发现{topic}彻底刷屏了！！
+        sections = self._get_sample_sections(topic, platform)
+        return f"\n{sections['titles']}\n\n{sections['intro']}\n\n{sections['content']}\n\n{sections['ending']}\n"
+
+    def _get_sample_sections(self, topic: str, platform: str) -> Dict[str, str]:
+        """示例文章的各段落（标题、开头、正文、结尾），用于整篇或单段兜底"""
+        return {
+            "titles": f"救命！{topic}也太火了吧！！",
+            "intro": f"""姐妹们！今天刷微博的时候，我发现{topic}彻底刷屏了！！
 刚开始我还想不就是个话题吗，至于这么夸张吗？
 结果好家伙，点进去一看，好多人在讨论，我也忍不住加入了混战...
 
 说实话，我刚开始真的不理解，为啥这个话题能这么火？
-直到我翻了差不多100条评论，才搞明白是咋回事。
-
-首先吧，我觉得是因为这件事真的戳到大家痛点了。
+直到我翻了差不多100条评论，才搞明白是咋回事。""",
+            "content": f"""首先吧，我觉得是因为这件事真的戳到大家痛点了。
 你想想，现在大家压力都挺大的，突然出来一个话题，说出了大家心里想说但不敢说的话，能不火吗？
 而且这个话题真的门槛超低！不需要你多专业，也不需要你了解啥背景，是个人就能说两句。
 再加上网上那些看热闹不嫌事大的网友，一顿操作下来，热度直接就上去了。
@@ -255,9 +550,8 @@ class AIWriter:
 别被人带了节奏还不知道是咋回事。
 
 还有就是，别光顾着网上逼逼赖赖，现实生活中该干嘛还得干嘛。
-网上说得再热闹，挂了电话还是得上班不是？
-
-{topic}这个话题吧，我觉得还能火一阵子。
+网上说得再热闹，挂了电话还是得上班不是？""",
+            "ending": f"""{topic}这个话题吧，我觉得还能火一阵子。
 毕竟这种话题最容易引发讨论了，而且大家都有表达欲。
 
 姐妹们有啥想法没？你们身边有人聊这个吗？
@@ -267,9 +561,8 @@ class AIWriter:
 
 点个赞再走呗~咱们评论区见！
 
-#{topic}
-"""
-        return article
+#{topic}""",
+        }
 
 
 class AISearcher:
@@ -281,15 +574,29 @@ class AISearcher:
         self.api_base = MINIMAX_API_BASE
         import requests
 
-    def search_and_extract(self, keyword: str) -> dict:
-        """搜索关键词并提取观点"""
-        import requests
+    def _complete(self, prompt: str, on_text: Callable[[str], None] = None) -> str:
+        """调用MiniMax返回生成的文本；传入 on_text 时流式输出"""
+        if on_text is not None:
+            text, error = collect_stream(
+                stream_completion(prompt, max_tokens=500, provider="minimax", timeout=60), on_text
+            )
+            if error is not None and not text:
+                raise error
+            return text
 
-        url = f"{self.api_base}/text/chatcompletion_v2"
-        headers = {
-            "Authorization": f"Bearer {self.api_key}",
-            "Content-Type": "application/json"
-        }
+        return cached_completion(
+            "minimax", chat_request("minimax", prompt, max_tokens=500),
+            lambda request: minimax_post(request, timeout=60)
+        )
+
+    def search_and_extract(self, keyword: str, on_text: Callable[[str], None] = None) -> dict:
+        """
+        搜索关键词并提取观点
+
+        Args:
+            keyword: 关键词
+            on_text: 流式模式：生成的文本每到达一段就回调一次
+        """
 
         # 搜索热点信息
         prompt = f"""关于「{keyword}」这个话题，请帮我：
@@ -301,23 +608,14 @@ class AISearcher:
 热点2: xxx
 热点3: xxx"""
 
-        payload = {
-            "model": "abab6.5s-chat",
-            "messages": [{"role": "user", "content": prompt}],
-            "max_tokens": 500
-        }
-
         try:
-            response = requests.post(url, headers=headers, json=payload, timeout=60)
-            data = response.json()
+            content = self._complete(prompt, on_text)
 
             highlights = []
-            if "choices" in data and len(data["choices"]) > 0:
-                content = data["choices"][0]["message"]["content"]
-                # 解析热点
-                for line in content.split('\n'):
-                    if ':' in line or '、' in line:
-                        highlights.append(line.strip())
+            # 解析热点
+            for line in content.split('\n'):
+                if ':' in line or '、' in line:
+                    highlights.append(line.strip())
 
             # 提取观点
             prompt2 = f"""关于「{keyword}」这个话题，请提取3个有价值的观点，用于公众号文章。
@@ -329,22 +627,15 @@ class AISearcher:
 
 直接输出观点，用换行分隔"""
 
-            payload2 = {
-                "model": "abab6.5s-chat",
-                "messages": [{"role": "user", "content": prompt2}],
-                "max_tokens": 500
-            }
-
-            response2 = requests.post(url, headers=headers, json=payload2, timeout=60)
-            data2 = response2.json()
+            if on_text is not None:
+                on_text("\n\n")
+            content2 = self._complete(prompt2, on_text)
 
             points = []
-            if "choices" in data2 and len(data2["choices"]) > 0:
-                content2 = data2["choices"][0]["message"]["content"]
-                for line in content2.split('\n'):
-                    line = line.strip()
-                    if line and len(line) > 5:
-                        points.append(line)
+            for line in content2.split('\n'):
+                line = line.strip()
+                if line and len(line) > 5:
+                    points.append(line)
 
             return {
                 "highlights": highlights[:5],
@@ -359,17 +650,20 @@ class AISearcher:
             }
 
 
-def generate_from_search(keyword: str, search_result: dict) -> str:
-    """根据搜索结果生成风格化文章"""
-    import requests
-    from config import MINIMAX_API_KEY, MINIMAX_API_BASE
+def generate_from_search(keyword: str, search_result: dict,
+                         on_text: Callable[[str], None] = None) -> str:
+    """
+    根据搜索结果生成风格化文章
 
-    url = f"{MINIMAX_API_BASE}/text/chatcompletion_v2"
-    headers = {
-        "Authorization": f"Bearer {MINIMAX_API_KEY}",
-        "Content-Type": "application/json"
-    }
+    Args:
+        keyword: 关键词
+        search_result: search_and_extract 的结果
+        on_text: 流式模式：生成的文本每到达一段就回调一次；超时或中断时
+            返回已生成的部分
 
+    Returns:
+        文章内容
+    """
     highlights = search_result.get('highlights', [])
     points = search_result.get('points', [])
 
@@ -394,22 +688,36 @@ def generate_from_search(keyword: str, search_result: dict) -> str:
 5. 字数：800-1200字
 6. 直接输出文章内容"""
 
-    payload = {
-        "model": "abab6.5s-chat",
-        "messages": [{"role": "user", "content": prompt}],
-        "max_tokens": 2000
-    }
+    if on_text is not None:
+        article, error = collect_stream(
+            stream_completion(prompt, max_tokens=2000, provider="minimax"), on_text
+        )
+        if error is None:
+            return article
+        if article:
+            print(f"\n生成中断（{error}），已保留生成的{len(article)}字")
+            return article
+        print(f"生成失败: {error}")
+        article = _search_fallback_article(keyword, highlights_text, points_text)
+        on_text(article)
+        return article
 
     try:
-        response = requests.post(url, headers=headers, json=payload, timeout=120)
-        data = response.json()
-
-        if "choices" in data and len(data["choices"]) > 0:
-            return data["choices"][0]["message"]["content"]
+        article = cached_completion(
+            "minimax", chat_request("minimax", prompt, max_tokens=2000),
+            lambda request: minimax_post(request, timeout=120)
+        )
+        if article:
+            return article
     except Exception as e:
         print(f"生成失败: {e}")
 
     # 如果失败，使用模板
+    return _search_fallback_article(keyword, highlights_text, points_text)
+
+
+def _search_fallback_article(keyword: str, highlights_text: str, points_text: str) -> str:
+    """搜索生成失败时的模板文章"""
     return f"""救命！{keyword}也太火了吧！！
 
 姐妹们！最近{keyword}这个话题你们看到了吗？
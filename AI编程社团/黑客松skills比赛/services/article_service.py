@@ -40,18 +40,11 @@ class ArticleService:
         Returns:
             保存的文件路径
         """
-        # 生成文件名
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        safe_topic = "".join(c for c in topic if c.isalnum() or c in (" ", "-", "_")).strip()[:20]
-        filename = f"{timestamp}_{safe_topic}.md"
-        filepath = os.path.join(self.output_dir, filename)
+        filepath = self._new_filepath(topic)
 
         # 写入文件
         with open(filepath, "w", encoding="utf-8") as f:
-            f.write(f"# {topic}\n\n")
-            f.write(f"> 来源平台: {platform}\n\n")
-            f.write(f"> 生成时间: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n")
-            f.write("---\n\n")
+            self._write_header(f, topic, platform)
             f.write(content)
 
         print(f"文章已保存到: {filepath}")
@@ -61,6 +54,40 @@ class ArticleService:
 
         return filepath
 
+    def stream_article(self, topic: str, platform: str) -> "ArticleStream":
+        """
+        创建边生成边写入的文章文件
+
+        用法：
+            with service.stream_article(topic, platform) as out:
+                out.write(text)
+
+        每段文本写入后立即落盘，生成中断时文件里保留已生成的部分；
+        正常结束后自动生成配图
+
+        Args:
+            topic: 话题标题
+            platform: 来源平台
+
+        Returns:
+            ArticleStream，filepath 属性为文件路径
+        """
+        return ArticleStream(self, topic, platform)
+
+    def _new_filepath(self, topic: str) -> str:
+        """生成文章文件路径"""
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        safe_topic = "".join(c for c in topic if c.isalnum() or c in (" ", "-", "_")).strip()[:20]
+        filename = f"{timestamp}_{safe_topic}.md"
+        return os.path.join(self.output_dir, filename)
+
+    def _write_header(self, f, topic: str, platform: str):
+        """写入文章头部信息"""
+        f.write(f"# {topic}\n\n")
+        f.write(f"> 来源平台: {platform}\n\n")
+        f.write(f"> 生成时间: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n")
+        f.write("---\n\n")
+
     def _generate_cover(self, topic: str, content: str, article_path: str):
         """为文章生成配图"""
         if ImageService is None:
@@ -153,6 +180,39 @@ class ArticleService:
             return False
 
 
+class ArticleStream:
+    """边生成边写入的文章文件"""
+
+    def __init__(self, service: ArticleService, topic: str, platform: str):
+        self.service = service
+        self.topic = topic
+        self.filepath = service._new_filepath(topic)
+        self.length = 0
+        self._file = open(self.filepath, "w", encoding="utf-8")
+        service._write_header(self._file, topic, platform)
+        self._file.flush()
+
+    def write(self, text: str):
+        """追加一段文本并立即落盘"""
+        self._file.write(text)
+        self._file.flush()
+        self.length += len(text)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self._file.close()
+        if exc_type is not None:
+            print(f"\n生成被中断，已保存{self.length}字到: {self.filepath}")
+            return False
+
+        print(f"文章已保存到: {self.filepath}")
+        if self.length:
+            self.service._generate_cover(self.topic, "", self.filepath)
+        return False
+
+
 if __name__ == "__main__":
     # 测试
     service = ArticleService()
@@ -0,0 +1,137 @@
+# -*- coding: utf-8 -*-
+"""
+批量写作服务
+为排名靠前的热点话题并发生成文章
+"""
+
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import List, Dict, Tuple
+
+from config import BATCH_WORKERS
+from services.ai_writer import AIWriter
+from services.article_service import ArticleService
+from storage import Database, get_llm_cache
+
+
+class BatchWriter:
+    """批量写作服务"""
+
+    def __init__(self, workers: int = BATCH_WORKERS, db: Database = None,
+                 article_service: ArticleService = None):
+        """
+        Args:
+            workers: 同时生成的文章数
+            db: 数据库，默认 data/articles.db
+            article_service: 文章文件服务，默认 output/articles
+        """
+        self.workers = workers
+        self.db = db or Database()
+        self.article_service = article_service or ArticleService()
+        # MiniMax 每篇文章并发请求4个段落，连接池按同时生成的段落数设置
+        self.writer = AIWriter(pool_size=workers * 4)
+
+    def select_topics(self, topics: List[Dict], count: int) -> Tuple[List[Dict], int]:
+        """
+        选出前 count 个没写过的话题
+
+        数据库 topics 表中已有的标题和列表中重复的标题都跳过
+
+        Args:
+            topics: 按热度排序的话题列表
+            count: 最多选出的话题数
+
+        Returns:
+            (选出的话题, 跳过的话题数)
+        """
+        seen = self.db.get_topic_titles()
+        selected = []
+        skipped = 0
+
+        for topic in topics:
+            if len(selected) >= count:
+                break
+            if topic["title"] in seen:
+                skipped += 1
+                continue
+            seen.add(topic["title"])
+            selected.append(topic)
+
+        return selected, skipped
+
+    def run(self, topics: List[Dict]) -> Dict:
+        """
+        并发为话题生成文章
+
+        每篇完成后立即保存到文件；全部完成后在一个事务中写入数据库。
+        生成失败（只得到模板文章）的话题不保存，它的响应也不写入缓存，
+        下次运行会重新调用AI生成
+
+        Args:
+            topics: 要写的话题
+
+        Returns:
+            统计信息：written, failed, article_ids, chars, seconds, latency
+        """
+        cache = get_llm_cache()
+        hits, misses = cache.hits, cache.misses
+        start = time.monotonic()
+        written = {}   # 话题序号 -> (话题, 文章内容, 耗时)
+        failed = []
+
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            futures = {executor.submit(self._write, topic): i for i, topic in enumerate(topics)}
+            for done, future in enumerate(as_completed(futures), 1):
+                i = futures[future]
+                topic = topics[i]
+                try:
+                    content, seconds = future.result()
+                except Exception as e:
+                    print(f"[{done}/{len(topics)}] 失败: {topic['title']}（{e}）")
+                    failed.append(topic)
+                    continue
+
+                if content is None:
+                    print(f"[{done}/{len(topics)}] 失败: {topic['title']}（AI未返回内容）")
+                    failed.append(topic)
+                    continue
+
+                written[i] = (topic, content, seconds)
+                print(f"[{done}/{len(topics)}] 完成: {topic['title']}（{len(content)}字，{seconds:.1f}s）")
+
+        # 按热度顺序写入数据库
+        rows = [
+            {
+                "title": topic["title"],
+                "platform": topic["platform"],
+                "hot_score": topic.get("hot_score", 0),
+                "content": content,
+            }
+            for topic, content, _ in (written[i] for i in sorted(written))
+        ]
+        article_ids = self.db.save_batch(rows) if rows else []
+
+        latencies = [seconds for _, _, seconds in written.values()]
+        return {
+            "written": len(rows),
+            "failed": len(failed),
+            "article_ids": article_ids,
+            "chars": sum(len(row["content"]) for row in rows),
+            "seconds": time.monotonic() - start,
+            "latency": sum(latencies) / len(latencies) if latencies else 0,
+            "cache_hits": cache.hits - hits,
+            "cache_misses": cache.misses - misses,
+        }
+
+    def _write(self, topic: Dict) -> Tuple[str, float]:
+        """生成一篇文章并保存到文件，返回 (文章内容, 耗时)；只得到模板文章时内容为 None"""
+        start = time.monotonic()
+        title, platform = topic["title"], topic["platform"]
+        content = self.writer.generate_article(title, platform)
+        seconds = time.monotonic() - start
+
+        if self.writer.used_fallback:
+            return None, seconds
+
+        self.article_service.save_article(title, platform, content)
+        return content, seconds
@@ -4,6 +4,7 @@
 整合所有平台的热点数据
 """
 
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Dict
 from spiders import WeiboSpider, ZhihuSpider, DouyinSpider
 from config import HOT_TOPIC_LIMIT
@@ -28,22 +29,21 @@ class HotTopicService:
         Returns:
             整合后的热点话题列表，按热度排序
         """
-        all_topics = []
-
-        # 微博
-        if not platforms or "微博" in platforms:
-            weibo_topics = self.weibo_spider.get_hot_search(HOT_TOPIC_LIMIT)
-            all_topics.extend(weibo_topics)
-
-        # 知乎
-        if not platforms or "知乎" in platforms:
-            zhihu_topics = self.zhihu_spider.get_hot_search(HOT_TOPIC_LIMIT)
-            all_topics.extend(zhihu_topics)
+        spiders = [
+            ("微博", self.weibo_spider),
+            ("知乎", self.zhihu_spider),
+            ("抖音", self.douyin_spider),
+        ]
+        spiders = [spider for platform, spider in spiders if not platforms or platform in platforms]
+        if not spiders:
+            return []
 
-        # 抖音
-        if not platforms or "抖音" in platforms:
-            douyin_topics = self.douyin_spider.get_hot_search(HOT_TOPIC_LIMIT)
-            all_topics.extend(douyin_topics)
+        # 各平台同时抓取（同一网站的请求间隔由 spiders.limiter 控制），
+        # 结果按 微博、知乎、抖音 的顺序合并，排序结果与逐个抓取时相同
+        all_topics = []
+        with ThreadPoolExecutor(max_workers=len(spiders)) as executor:
+            for topics in executor.map(lambda spider: spider.get_hot_search(HOT_TOPIC_LIMIT), spiders):
+                all_topics.extend(topics)
 
         # 按热度排序
         all_topics.sort(key=lambda x: x.get("hot_score", 0), reverse=True)
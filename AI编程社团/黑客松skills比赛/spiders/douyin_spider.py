@@ -5,10 +5,8 @@
 注意：抖音没有公开的网页版热搜，这里使用第三方数据源
 """
 
-import requests
-import time
 from typing import List, Dict
-from config import REQUEST_DELAY
+from spiders.limiter import create_session, polite_get
 
 
 class DouyinSpider:
@@ -18,6 +16,7 @@ class DouyinSpider:
         self.headers = {
             "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
         }
+        self.session = create_session(self.headers)
         # 使用一个公开的热搜API（如果失效需要更换）
         self.api_url = "https://www.iesdouyin.com/aweme/v1/web/hot/search/list/"
 
@@ -33,9 +32,7 @@ class DouyinSpider:
         """
         try:
             print("正在获取抖音热门...")
-            time.sleep(REQUEST_DELAY)
-
-            response = requests.get(self.api_url, headers=self.headers, timeout=10)
+            response = polite_get(self.session, self.api_url, timeout=10)
             data = response.json()
 
             word_list = data.get("data", {}).get("word_list", [])
@@ -0,0 +1,54 @@
+# -*- coding: utf-8 -*-
+"""
+请求限速
+同一网站的两次请求之间至少间隔 REQUEST_DELAY 秒，不同网站互不影响
+"""
+
+import time
+import threading
+from urllib.parse import urlparse
+
+import requests
+
+from config import REQUEST_DELAY
+
+
+class HostLimiter:
+    """按域名限制请求间隔，多个爬虫线程共用"""
+
+    def __init__(self, delay: float = REQUEST_DELAY):
+        """
+        Args:
+            delay: 同一域名两次请求的最小间隔（秒）
+        """
+        self.delay = delay
+        self._next = {}  # 域名 -> 下一次允许请求的时间
+        self._lock = threading.Lock()
+
+    def wait(self, url: str):
+        """等到可以请求该网址所在的域名；第一次请求不等待"""
+        host = urlparse(url).netloc
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next.get(host, now))
+            # 先占好时间段再等待，同一域名的并发请求依次排开
+            self._next[host] = start + self.delay
+        if start > now:
+            time.sleep(start - now)
+
+
+# 所有爬虫共用
+host_limiter = HostLimiter()
+
+
+def create_session(headers: dict) -> requests.Session:
+    """创建带连接池和默认请求头的会话（每个平台一个，复用连接）"""
+    session = requests.Session()
+    session.headers.update(headers)
+    return session
+
+
+def polite_get(session: requests.Session, url: str, **kwargs) -> requests.Response:
+    """按域名限速后发送 GET 请求"""
+    host_limiter.wait(url)
+    return session.get(url, **kwargs)
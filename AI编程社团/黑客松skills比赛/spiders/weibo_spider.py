@@ -4,10 +4,8 @@
 抓取微博热搜榜单上的热门话题
 """
 
-import requests
-import time
 from typing import List, Dict
-from config import REQUEST_DELAY
+from spiders.limiter import create_session, polite_get
 
 
 class WeiboSpider:
@@ -18,6 +16,7 @@ class WeiboSpider:
             "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
             "Referer": "https://weibo.com",
         }
+        self.session = create_session(self.headers)
         self.api_url = "https://weibo.com/ajax/side/hotSearch"
 
     def get_hot_search(self, limit: int = 10) -> List[Dict]:
@@ -32,9 +31,7 @@ class WeiboSpider:
         """
         try:
             print("正在获取微博热搜...")
-            time.sleep(REQUEST_DELAY)
-
-            response = requests.get(self.api_url, headers=self.headers, timeout=10)
+            response = polite_get(self.session, self.api_url, timeout=10)
             data = response.json()
 
             if data.get("ok") != 1:
@@ -4,10 +4,8 @@
 抓取知乎热榜上的热门问题
 """
 
-import requests
-import time
 from typing import List, Dict
-from config import REQUEST_DELAY
+from spiders.limiter import create_session, polite_get
 
 
 class ZhihuSpider:
@@ -18,6 +16,7 @@ class ZhihuSpider:
             "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
             "Referer": "https://www.zhihu.com",
         }
+        self.session = create_session(self.headers)
         self.api_url = "https://www.zhihu.com/api/v3/feed/topstory/hot-lists/total=50?limit&desktop=true"
 
     def get_hot_search(self, limit: int = 10) -> List[Dict]:
@@ -32,9 +31,7 @@ class ZhihuSpider:
         """
         try:
             print("正在获取知乎热榜...")
-            time.sleep(REQUEST_DELAY)
-
-            response = requests.get(self.api_url, headers=self.headers, timeout=10)
+            response = polite_get(self.session, self.api_url, timeout=10)
             data = response.json()
 
             items = data.get("data", [])
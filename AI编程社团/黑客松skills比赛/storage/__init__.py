@@ -4,5 +4,6 @@
 """
 
 from .db import Database
+from .llm_cache import LLMCache, get_llm_cache
 
-__all__ = ["Database"]
+__all__ = ["Database", "LLMCache", "get_llm_cache"]
@@ -7,7 +7,7 @@
 import sqlite3
 import os
 from datetime import datetime
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Set
 
 
 class Database:
@@ -65,17 +65,30 @@ class Database:
         conn.commit()
         conn.close()
 
-    def save_topic(self, topic: str, platform: str, hot_score: int = 0) -> int:
-        """保存话题"""
-        conn = self._get_connection()
-        cursor = conn.cursor()
-
-        cursor.execute(
+    @staticmethod
+    def _insert_topic(conn: sqlite3.Connection, topic: str, platform: str,
+                      hot_score: int, created_at: str) -> int:
+        """插入一条话题（不提交），返回话题ID"""
+        cursor = conn.execute(
             "INSERT INTO topics (title, platform, hot_score, created_at) VALUES (?, ?, ?, ?)",
-            (topic, platform, hot_score, datetime.now().isoformat())
+            (topic, platform, hot_score, created_at)
         )
+        return cursor.lastrowid
 
-        topic_id = cursor.lastrowid
+    @staticmethod
+    def _insert_article(conn: sqlite3.Connection, topic_id: int, title: str, content: str,
+                        platform: str, created_at: str) -> int:
+        """插入一篇文章（不提交），返回文章ID"""
+        cursor = conn.execute(
+            "INSERT INTO articles (topic_id, title, content, platform, created_at) VALUES (?, ?, ?, ?, ?)",
+            (topic_id, title, content, platform, created_at)
+        )
+        return cursor.lastrowid
+
+    def save_topic(self, topic: str, platform: str, hot_score: int = 0) -> int:
+        """保存话题"""
+        conn = self._get_connection()
+        topic_id = self._insert_topic(conn, topic, platform, hot_score, datetime.now().isoformat())
         conn.commit()
         conn.close()
         return topic_id
@@ -83,18 +96,45 @@ class Database:
     def save_article(self, topic_id: int, title: str, content: str, platform: str) -> int:
         """保存文章"""
         conn = self._get_connection()
-        cursor = conn.cursor()
-
-        cursor.execute(
-            "INSERT INTO articles (topic_id, title, content, platform, created_at) VALUES (?, ?, ?, ?, ?)",
-            (topic_id, title, content, platform, datetime.now().isoformat())
-        )
-
-        article_id = cursor.lastrowid
+        article_id = self._insert_article(conn, topic_id, title, content, platform,
+                                          datetime.now().isoformat())
         conn.commit()
         conn.close()
         return article_id
 
+    def save_batch(self, items: List[Dict]) -> List[int]:
+        """
+        在一个事务中保存多篇文章及其话题，任何一条失败则全部回滚
+
+        Args:
+            items: 每条包含 title, platform, hot_score, content
+
+        Returns:
+            文章ID列表，与 items 顺序一致
+        """
+        conn = self._get_connection()
+        now = datetime.now().isoformat()
+        article_ids = []
+
+        try:
+            with conn:
+                for item in items:
+                    topic_id = self._insert_topic(conn, item["title"], item["platform"],
+                                                  item.get("hot_score", 0), now)
+                    article_ids.append(self._insert_article(conn, topic_id, item["title"],
+                                                            item["content"], item["platform"], now))
+        finally:
+            conn.close()
+
+        return article_ids
+
+    def get_topic_titles(self) -> Set[str]:
+        """获取所有已保存话题的标题"""
+        conn = self._get_connection()
+        rows = conn.execute("SELECT DISTINCT title FROM topics").fetchall()
+        conn.close()
+        return {row["title"] for row in rows}
+
     def get_topics(self, limit: int = 50, status: str = None) -> List[Dict]:
         """获取话题列表"""
         conn = self._get_connection()
@@ -0,0 +1,195 @@
+# -*- coding: utf-8 -*-
+"""
+大模型响应缓存
+按请求内容（服务商、模型、消息和参数）寻址，保存在本地SQLite
+"""
+
+import os
+import json
+import time
+import sqlite3
+import hashlib
+import threading
+from typing import Dict, Optional
+
+from config import LLM_CACHE_ENABLED, LLM_CACHE_TTL, LLM_CACHE_MAX_MB
+
+# 缓存模式
+MODE_NORMAL = "normal"    # 先查缓存，未命中再调用并写入
+MODE_REFRESH = "refresh"  # 不读缓存，调用后覆盖写入（--refresh-cache）
+MODE_OFF = "off"          # 不读也不写（--no-cache）
+
+# 不影响生成结果的请求字段，不参与缓存键
+IGNORED_FIELDS = ("stream",)
+
+
+class LLMCache:
+    """大模型响应缓存"""
+
+    def __init__(self, db_path: str = "data/llm_cache.db", ttl: float = LLM_CACHE_TTL,
+                 max_bytes: int = LLM_CACHE_MAX_MB * 1024 * 1024, mode: str = MODE_NORMAL):
+        """
+        Args:
+            db_path: 缓存数据库路径
+            ttl: 缓存有效期（秒），0 表示不过期
+            max_bytes: 缓存总大小上限，超出后淘汰最久未使用的条目
+            mode: 缓存模式，见 MODE_*
+        """
+        self.db_path = db_path
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.mode = mode
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._ensure_db_dir()
+        self._init_db()
+
+    def _ensure_db_dir(self):
+        """确保数据库目录存在"""
+        db_dir = os.path.dirname(self.db_path)
+        if db_dir and not os.path.exists(db_dir):
+            os.makedirs(db_dir)
+
+    def _get_connection(self) -> sqlite3.Connection:
+        """获取数据库连接"""
+        return sqlite3.connect(self.db_path, timeout=30)
+
+    def _init_db(self):
+        """初始化缓存表"""
+        conn = self._get_connection()
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                provider TEXT,
+                model TEXT,
+                response TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                created_at REAL NOT NULL,
+                last_used REAL NOT NULL
+            )
+        """)
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_responses_last_used ON responses(last_used)")
+        conn.commit()
+        conn.close()
+
+    @staticmethod
+    def make_key(provider: str, request: dict) -> str:
+        """
+        计算请求的缓存键
+
+        Args:
+            provider: 服务商（openai / claude / minimax）
+            request: 请求参数（model、messages、max_tokens 等）
+
+        Returns:
+            SHA-256 十六进制字符串
+        """
+        fields = {k: v for k, v in request.items() if k not in IGNORED_FIELDS}
+        text = json.dumps({"provider": provider, "request": fields},
+                          ensure_ascii=False, sort_keys=True)
+        return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+    def lookup(self, key: str) -> Optional[str]:
+        """
+        读取缓存的响应（计入命中/未命中）
+
+        Returns:
+            缓存的文本；未命中、已过期或非 normal 模式时返回 None
+        """
+        text = self.get(key) if self.mode == MODE_NORMAL else None
+        with self._lock:
+            if text is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return text
+
+    def store(self, key: str, provider: str, model: str, text: str):
+        """保存响应（off 模式或空响应不保存）"""
+        if self.mode == MODE_OFF or not text:
+            return
+        self.put(key, provider, model, text)
+
+    def get(self, key: str) -> Optional[str]:
+        """按键读取，过期条目删除后视为未命中"""
+        now = time.time()
+        conn = self._get_connection()
+        try:
+            row = conn.execute(
+                "SELECT response, created_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+
+            if self.ttl and now - row[1] > self.ttl:
+                conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                conn.commit()
+                return None
+
+            conn.execute("UPDATE responses SET last_used = ? WHERE key = ?", (now, key))
+            conn.commit()
+            return row[0]
+        finally:
+            conn.close()
+
+    def put(self, key: str, provider: str, model: str, text: str):
+        """写入一条响应，并按大小上限淘汰最久未使用的条目"""
+        now = time.time()
+        conn = self._get_connection()
+        try:
+            conn.execute(
+                "INSERT OR REPLACE INTO responses (key, provider, model, response, size, created_at, last_used) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (key, provider, model, text, len(text.encode("utf-8")), now, now)
+            )
+            self._evict(conn)
+            conn.commit()
+        finally:
+            conn.close()
+
+    def _evict(self, conn: sqlite3.Connection):
+        """删除过期条目，再从最久未使用的开始删除直到总大小不超过上限"""
+        if self.ttl:
+            conn.execute("DELETE FROM responses WHERE created_at < ?", (time.time() - self.ttl,))
+
+        total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+
+        evicted = []
+        for key, size in conn.execute("SELECT key, size FROM responses ORDER BY last_used"):
+            if total <= self.max_bytes:
+                break
+            evicted.append((key,))
+            total -= size
+        conn.executemany("DELETE FROM responses WHERE key = ?", evicted)
+
+    def stats(self) -> Dict:
+        """缓存统计：本次运行的命中/未命中，以及条目数和总大小"""
+        conn = self._get_connection()
+        entries, size = conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses"
+        ).fetchone()
+        conn.close()
+        return {"hits": self.hits, "misses": self.misses, "entries": entries, "bytes": size}
+
+    def clear(self) -> int:
+        """清空缓存，返回删除的条目数"""
+        conn = self._get_connection()
+        deleted = conn.execute("DELETE FROM responses").rowcount
+        conn.commit()
+        conn.execute("VACUUM")
+        conn.close()
+        return deleted
+
+
+_cache = None
+
+
+def get_llm_cache() -> LLMCache:
+    """进程内共享的缓存实例（按 config.py 配置创建）"""
+    global _cache
+    if _cache is None:
+        _cache = LLMCache(mode=MODE_NORMAL if LLM_CACHE_ENABLED else MODE_OFF)
+    return _cache
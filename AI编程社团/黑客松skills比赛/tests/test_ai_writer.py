@@ -0,0 +1,214 @@
+# -*- coding: utf-8 -*-
+"""
+MiniMax分段生成测试
+用本地桩服务器代替MiniMax接口，检查并发请求、总超时和模板补齐
+
+运行（在项目根目录）：
+    python -m pytest tests
+"""
+
+import os
+import sys
+import json
+import time
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import services.ai_writer as ai_writer
+import storage.llm_cache as llm_cache
+from services.ai_writer import AIWriter
+
+TOPIC = "测试话题"
+
+# 段落提示词中的关键字（见 AIWriter._generate_with_minimax）
+SECTION_MARKERS = {
+    "titles": "标题",
+    "intro": "开头",
+    "content": "中间内容",
+    "ending": "结尾",
+}
+
+
+class StubMiniMax:
+    """MiniMax对话接口桩：按段落设置延迟或返回错误，并记录最大并发数"""
+
+    def __init__(self):
+        self.delays = {}      # 段落 -> 延迟（秒）
+        self.errors = set()   # 返回 500 的段落
+        self.texts = {}       # 段落 -> 替换默认内容的文本
+        self.requests = []    # 收到请求的段落
+        self.active = 0
+        self.max_active = 0
+        self._lock = threading.Lock()
+
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_POST(self):
+                body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+                prompt = body["messages"][-1]["content"]
+                section = stub.section_of(prompt)
+
+                with stub._lock:
+                    stub.requests.append(section)
+                    stub.active += 1
+                    stub.max_active = max(stub.max_active, stub.active)
+                try:
+                    time.sleep(stub.delays.get(section, 0.2))
+                finally:
+                    with stub._lock:
+                        stub.active -= 1
+
+                if section in stub.errors:
+                    out = "internal error".encode("utf-8")
+                    self.send_response(500)
+                    self.send_header("Content-Type", "text/plain")
+                else:
+                    text = stub.texts.get(section, stub.text(section))
+                    data = {"choices": [{"message": {"content": text}}]}
+                    out = json.dumps(data, ensure_ascii=False).encode("utf-8")
+                    self.send_response(200)
+                    self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(out)))
+                self.end_headers()
+                self.wfile.write(out)
+
+            def log_message(self, *args):
+                pass
+
+        self._httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._httpd.daemon_threads = True
+        threading.Thread(target=self._httpd.serve_forever, daemon=True).start()
+        self.url = f"http://127.0.0.1:{self._httpd.server_port}"
+
+    @staticmethod
+    def section_of(prompt: str) -> str:
+        # 每个段落的提示词只包含自己的关键字
+        for section, marker in SECTION_MARKERS.items():
+            if marker in prompt:
+                return section
+        return "unknown"
+
+    @staticmethod
+    def text(section: str) -> str:
+        return f"【{section}】" + "桩服务器生成的内容。" * 30
+
+    def close(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+
+@pytest.fixture
+def stub(monkeypatch):
+    stub = StubMiniMax()
+    monkeypatch.setattr(ai_writer, "MINIMAX_API_BASE", stub.url)
+    yield stub
+    stub.close()
+
+
+@pytest.fixture(autouse=True)
+def isolated(monkeypatch, tmp_path):
+    """每个测试用临时缓存，且不限速"""
+    monkeypatch.setattr(llm_cache, "_cache", llm_cache.LLMCache(str(tmp_path / "llm_cache.db")))
+    monkeypatch.setattr(ai_writer, "RATE_LIMITERS", {})
+
+
+@pytest.fixture
+def writer():
+    writer = AIWriter()
+    writer.section_deadline = 2
+    return writer
+
+
+def test_sections_are_requested_concurrently(stub, writer):
+    stub.delays = dict.fromkeys(SECTION_MARKERS, 0.5)
+
+    start = time.monotonic()
+    article = writer._generate_with_minimax(TOPIC, "微博")
+    elapsed = time.monotonic() - start
+
+    assert sorted(stub.requests) == sorted(SECTION_MARKERS)
+    assert stub.max_active == len(SECTION_MARKERS)
+    assert elapsed < 1.5  # 依次请求至少 2 秒
+    for section in SECTION_MARKERS:
+        assert stub.text(section) in article
+    assert set(writer.section_latency) == set(SECTION_MARKERS)
+
+
+def test_deadline_is_enforced(stub, writer):
+    stub.delays = {"content": 10}
+
+    start = time.monotonic()
+    writer._generate_with_minimax(TOPIC, "微博")
+    elapsed = time.monotonic() - start
+
+    assert elapsed < writer.section_deadline + 1
+    latency = writer.section_latency
+    assert latency["content"] == pytest.approx(writer.section_deadline, abs=0.5)
+    assert max(latency["titles"], latency["intro"], latency["ending"]) < 1
+
+
+def test_late_section_gets_template_piece(stub, writer):
+    stub.delays = {"content": 10}
+
+    article = writer.generate_article(TOPIC, "微博")
+
+    assert not writer.used_fallback
+    fallback = writer._get_sample_sections(TOPIC, "微博")
+    assert fallback["content"] in article
+    assert stub.text("content") not in article
+    for section in ("titles", "intro", "ending"):
+        assert stub.text(section) in article
+        assert fallback[section] not in article
+
+
+def test_failed_section_gets_template_piece(stub, writer):
+    stub.errors = {"intro"}
+
+    article = writer._generate_with_minimax(TOPIC, "微博")
+
+    fallback = writer._get_sample_sections(TOPIC, "微博")
+    assert fallback["intro"] in article
+    assert stub.text("content") in article
+    assert "intro" in writer.section_latency
+
+
+def test_all_sections_failing_returns_sample_article(stub, writer):
+    stub.errors = set(SECTION_MARKERS)
+
+    article = writer.generate_article(TOPIC, "微博")
+
+    assert writer.used_fallback
+    assert article == writer._get_sample_article(TOPIC, "微博")
+
+
+def test_cached_sections_are_not_requested_again(stub, writer):
+    writer._generate_with_minimax(TOPIC, "微博")
+    stub.requests.clear()
+
+    article = writer._generate_with_minimax(TOPIC, "微博")
+
+    assert stub.requests == []
+    assert stub.text("content") in article
+    assert writer.section_latency == {}
+
+
+def test_rejected_sections_are_not_cached(stub, writer):
+    stub.texts = {section: "太短" for section in SECTION_MARKERS}
+
+    writer.generate_article(TOPIC, "微博")
+    assert writer.used_fallback
+
+    stub.texts = {}
+    stub.requests.clear()
+    article = writer.generate_article(TOPIC, "微博")
+
+    assert not writer.used_fallback
+    assert sorted(stub.requests) == sorted(SECTION_MARKERS)
+    assert stub.text("content") in article